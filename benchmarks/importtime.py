@@ -0,0 +1,75 @@
+"""
+Measure the import time of the CLI with ``-X importtime``, like a pre-commit
+hook or Pyodide startup pays it. Shows the slowest modules by self time.
+
+    python benchmarks/importtime.py --runs 5 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+def import_times(module: str, pycache: str) -> dict[str, tuple[int, int]]:
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-X",
+            f"pycache_prefix={pycache}",
+            "-c",
+            f"import {module}",
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("module", nargs="?", default="repo_review.__main__")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pycache:
+        # Warm up the bytecode cache
+        import_times(args.module, pycache)
+        runs = [import_times(args.module, pycache) for _ in range(args.runs)]
+
+    total = statistics.median(run[args.module][1] for run in runs)
+    own = statistics.median(
+        sum(s for name, (s, _) in run.items() if name.startswith("repo_review"))
+        for run in runs
+    )
+    print(
+        f"{args.module}: {total / 1000:.1f} ms total, {own / 1000:.1f} ms in repo_review"
+    )
+
+    self_times = {
+        name: statistics.median(run[name][0] for run in runs if name in run)
+        for name in runs[0]
+    }
+    slowest = sorted(self_times.items(), key=lambda x: x[1], reverse=True)
+    for name, self_us in slowest[: args.top]:
+        print(f"{self_us / 1000:>8.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
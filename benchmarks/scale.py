@@ -0,0 +1,90 @@
+"""
+Measure the per-check overhead of the processor with many synthetic checks,
+like plugins that generate a check per workflow file or module, and the
+cost of matching check names against many glob selectors.
+
+    python benchmarks/scale.py --checks 1000 10000 100000 --globs 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+
+from repo_review.checks import Selectors
+from repo_review.families import Family
+from repo_review.fixtures import collect_fixtures, compute_fixtures
+from repo_review.processor import (
+    CollectionReturn,
+    ExecutionPlan,
+    as_simple_dict,
+    process,
+)
+
+
+class Generated:
+    """
+    Generated check for {name}
+    """
+
+    def __init__(self, family: str, requires: frozenset[str], *, fail: bool) -> None:
+        self.family = family
+        self.requires = requires
+        self.fail = fail
+
+    def check(self, pyproject: dict[str, Any]) -> bool:
+        """
+        The generated check {name} failed.
+        """
+        return not self.fail or bool(pyproject)
+
+
+def make_collection(count: int) -> CollectionReturn:
+    fixtures = compute_fixtures(Path(), Path(), collect_fixtures())
+    families = {f"fam{f}": Family(name=f"Family {f}") for f in range(10)}
+    checks: dict[str, Any] = {}
+    for i in range(count):
+        # Every tenth check requires the one before it
+        requires = frozenset({f"GEN{i - 1}"}) if i % 10 == 9 else frozenset()
+        checks[f"GEN{i}"] = Generated(f"fam{i % 10}", requires, fail=i % 7 == 0)
+    return CollectionReturn(fixtures, checks, families)
+
+
+def timed(label: str, count: int, func: Any, *args: Any, **kwargs: Any) -> Any:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<14} {elapsed:>8.3f}s  {elapsed / count * 1e6:>7.2f}µs/check")
+    return result
+
+
+def match_all(selectors: Selectors, names: list[str]) -> int:
+    return sum(bool(selectors.match(name)) for name in names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--globs", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    for count in args.checks:
+        print(f"{count} checks")
+        collected = timed("generate", count, make_collection, count)
+        timed("compile plan", count, ExecutionPlan.compile, collected)
+        _, results = timed("process", count, process, Path(), collected=collected)
+        timed("as_simple_dict", count, as_simple_dict, results)
+
+    # Matching should take about the same time for any number of globs
+    names = [f"GEN{i}" for i in range(max(args.checks))]
+    for count in args.globs:
+        print(f"{count} globs, {len(names)} names")
+        globs = [f"GEN{i}?*" for i in range(count)] + [f"X{i}*" for i in range(count)]
+        selectors = Selectors(globs)
+        timed("match", len(names), match_all, selectors, names)
+
+
+if __name__ == "__main__":
+    main()
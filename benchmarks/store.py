@@ -0,0 +1,66 @@
+"""
+Fill a result store with synthetic runs and time the query helpers. The
+default makes a million results (1000 repos, 10 runs each, 100 checks).
+
+    python benchmarks/store.py --repos 1000 --runs 10 --checks 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from repo_review.families import Family
+from repo_review.processor import Result
+from repo_review.store import ResultStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repos", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--checks", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    families = {"general": Family(name="General")}
+    names = [f"X{i:03}" for i in range(args.checks)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "results.db"
+        start = time.perf_counter()
+        with ResultStore(path) as store:
+            for _ in range(args.runs):
+                for repo in range(args.repos):
+                    results = [
+                        Result(
+                            family="general",
+                            name=name,
+                            description="",
+                            result=rng.random() < 0.9,
+                        )
+                        for name in names
+                    ]
+                    store.add(f"org/repo{repo}", families, results, status="errors")
+        rows = args.repos * args.runs * args.checks
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {rows:,} results in {elapsed:.1f} s ({rows / elapsed:,.0f}/s)")
+        print(f"Database size: {path.stat().st_size / 2**20:.0f} MiB")
+
+        with ResultStore(path) as store:
+            for name, query in [
+                ("pass_rates", store.pass_rates),
+                ("regressions", store.regressions),
+                ("regressions(repo)", lambda: store.regressions("org/repo0")),
+            ]:
+                start = time.perf_counter()
+                count = len(query())
+                elapsed = time.perf_counter() - start
+                print(f"{name}: {count} rows in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
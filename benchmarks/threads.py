@@ -0,0 +1,54 @@
+"""
+Measure how repo-review scales when reviewing many repos from threads in one
+process. On a free-threaded build (3.13t/3.14t), throughput should grow with
+the number of threads; with the GIL, it stays flat.
+
+    python benchmarks/threads.py [PATH] --reviews 64 --threads 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import sys
+import sysconfig
+import time
+from pathlib import Path
+
+from repo_review.processor import collect_all, process
+
+
+def run(path: Path, reviews: int, threads: int) -> float:
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        for _ in pool.map(lambda _: process(path), range(reviews)):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", nargs="?", type=Path, default=Path())
+    parser.add_argument("--reviews", type=int, default=64)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}")
+    print(f"GIL enabled: {gil}, checks: {len(collect_all(args.path).checks)}")
+
+    # Warm up imports and caches
+    run(args.path, 1, 1)
+
+    baseline = 0.0
+    print(f"{'threads':>7}  {'seconds':>8}  {'reviews/s':>9}  {'speedup':>7}")
+    for threads in args.threads:
+        elapsed = run(args.path, args.reviews, threads)
+        rate = args.reviews / elapsed
+        baseline = baseline or rate
+        print(f"{threads:>7}  {elapsed:>8.3f}  {rate:>9.1f}  {rate / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
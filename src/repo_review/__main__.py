@@ -2,6 +2,11 @@ from __future__ import annotations
 
 __lazy_modules__ = [
     "argparse",
+    "collections",
+    "concurrent.futures",
+    "contextlib",
+    "functools",
+    "heapq",
     "importlib",
     "importlib.metadata",
     "importlib.util",
@@ -16,46 +21,36 @@ __lazy_modules__ = [
     "repo_review.families",
     "repo_review.ghpath",
     "repo_review.html",
+    "repo_review.json_writer",
     "repo_review.processor",
-    "rich",
-    "rich.console",
-    "rich.logging",
-    "rich.markdown",
-    "rich.syntax",
-    "rich.terminal_theme",
-    "rich.text",
-    "rich.tree",
+    "shlex",
     "sys",
     "urllib",
     "urllib.error",
 ]
 
 import argparse
-import asyncio
+import collections
+import concurrent.futures
+import contextlib
 import functools
+import heapq
 import importlib.metadata
 import importlib.util
 import itertools
 import json
 import logging
 import os
+import shlex
 import sys
+import threading
 import urllib.error
 from pathlib import Path
-from typing import Any, Literal
-
-import rich
-import rich.console
-import rich.markdown
-import rich.syntax
-import rich.terminal_theme
-import rich.text
-import rich.tree
-from rich.logging import RichHandler
+from typing import Literal, NamedTuple, TextIO
 
 from repo_review import __version__
 from repo_review._compat.typing import assert_never
-from repo_review.checks import get_check_description, get_check_url
+from repo_review.checks import get_check_description, get_check_url, is_allowed
 from repo_review.families import (
     Family,
     get_family_description,
@@ -63,36 +58,47 @@ from repo_review.families import (
     sort_family_keys,
 )
 from repo_review.files import collect_prefetch_files, process_prefetch_files
-from repo_review.ghpath import GHPath
+from repo_review.ghpath import GHPath, _parse_remote
 from repo_review.html import to_html
+from repo_review.json_writer import JSONWriter
 from repo_review.processor import (
     Result,
-    as_simple_dict,
+    Status,
+    Timing,
+    _status,
     collect_all,
     process,
+    record_durations,
 )
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Generator, Iterable, Mapping
+    from collections.abc import Set as AbstractSet
 
     from ._compat.importlib.resources.abc import Traversable
+    from .checks import Check
+    from .summary import SummaryWriter
 
 __all__ = ["Formats", "Show", "Status", "main"]
 
 CODE_THEME = "ansi_light"
 
+#: The most packages read ahead of the one being reported
+IN_FLIGHT = 32
+
 
 def __dir__() -> list[str]:
     return __all__
 
 
-Status = Literal["empty", "passed", "skips", "errors"]
-Formats = Literal["rich", "json", "html", "svg"]
+Formats = Literal["rich", "json", "jsonl", "html", "svg"]
 Show = Literal["all", "err", "errskip"]
 
 
 def _list_all() -> None:
+    import rich  # noqa: PLC0415
+
     collected = collect_all()
     if len(collected.checks) == 0:
         msg = "No checks registered. Please install a repo-review plugin."
@@ -111,6 +117,27 @@ def _list_all() -> None:
             rich.print(f'  "{link}",{comment}')
 
 
+def _summary_checks(
+    select: str, ignore: str, extend_select: str, extend_ignore: str
+) -> dict[str, Check]:
+    """
+    The checks with a column in ``--summary``: all of them, without the ones
+    the command line leaves out. A repo's config can still leave its cells
+    empty.
+    """
+
+    def codes(value: str) -> set[str]:
+        return {x.strip() for x in value.split(",") if x.strip()}
+
+    selected = codes(select) | codes(extend_select) if codes(select) else set()
+    ignored = codes(ignore) | codes(extend_ignore)
+    return {
+        name: check
+        for name, check in collect_all().checks.items()
+        if is_allowed(selected, ignored, name)
+    }
+
+
 def _all_versions() -> None:
     groups = ["repo_review.checks", "repo_review.families", "repo_review.fixtures"]
     packages = {
@@ -119,6 +146,8 @@ def _all_versions() -> None:
         for ep in importlib.metadata.entry_points(group=group)
         if (dist := ep.dist) is not None
     }
+    import rich  # noqa: PLC0415
+
     deps = ["rich", "markdown-it-py", "pyyaml"]
     rich.print("Repo-review's dependencies:")
     for name in deps:
@@ -130,8 +159,21 @@ def _all_versions() -> None:
         rich.print(f"  [bold]{name}[/bold]: [green]{version}[/green]")
 
 
-@functools.cache
+_streams_lock = threading.Lock()
+_streams_checked = False
+
+
 def _ensure_unicode_streams() -> None:
+    global _streams_checked  # noqa: PLW0603
+    if _streams_checked:
+        return
+    with _streams_lock:
+        if not _streams_checked:
+            _reconfigure_streams()
+            _streams_checked = True
+
+
+def _reconfigure_streams() -> None:
     # Before Python 3.15, this isn't always unicode
     if (
         sys.version_info < (3, 15)
@@ -154,6 +196,14 @@ def rich_printer(
     status: Status,
     header: str = "",
 ) -> None:
+    # Rich is only imported for the formats that use it, to keep startup fast
+    import rich.console  # noqa: PLC0415
+    import rich.markdown  # noqa: PLC0415
+    import rich.syntax  # noqa: PLC0415
+    import rich.terminal_theme  # noqa: PLC0415
+    import rich.text  # noqa: PLC0415
+    import rich.tree  # noqa: PLC0415
+
     _ensure_unicode_streams()
 
     console = rich.console.Console(
@@ -243,6 +293,45 @@ def rich_printer(
             print(string, file=sys.stderr if stderr else sys.stdout)
 
 
+def print_durations(
+    timings: list[tuple[str, Timing]], count: int, *, show_package: bool
+) -> None:
+    """
+    Print the slowest ``count`` timings to stderr, like pytest's
+    ``--durations``. ``count`` of 0 prints all of them.
+    """
+    slowest = sorted(timings, key=lambda x: x[1].duration.wall, reverse=True)
+    if count:
+        slowest = slowest[:count]
+    title = f"slowest {count} durations" if count else "slowest durations"
+    print(f"{f' {title} ':=^60}", file=sys.stderr)
+    for package, (kind, name, duration) in slowest:
+        suffix = f" ({package})" if show_package else ""
+        print(
+            f"{duration.wall:.3f}s wall {duration.cpu:.3f}s cpu {kind:<8} {name}{suffix}",
+            file=sys.stderr,
+        )
+
+
+def _keep_slowest(
+    slowest: list[tuple[float, int, str, Timing]],
+    package: str,
+    timings: Iterable[Timing],
+    count: int,
+) -> None:
+    """
+    Add timings to the min-heap ``slowest``, keeping the ``count`` slowest (or
+    all of them for 0).
+    """
+    for timing in timings:
+        # The id breaks ties, as durations can't be compared
+        entry = (timing.duration.wall, id(timing), package, timing)
+        if not count or len(slowest) < count:
+            heapq.heappush(slowest, entry)
+        elif entry > slowest[0]:
+            heapq.heapreplace(slowest, entry)
+
+
 def display_output(
     families: Mapping[str, Family],
     processed: list[Result],
@@ -252,6 +341,8 @@ def display_output(
     color: bool,
     status: Status,
     header: str,
+    timings: list[Timing] | None = None,
+    json_writer: JSONWriter | None = None,
 ) -> None:
     output = sys.stderr if stderr else sys.stdout
     match format_opt:
@@ -265,17 +356,11 @@ def display_output(
                 status=status,
                 header=header,
             )
-        case "json":
-            sorted_families = {k: families[k] for k in sort_family_keys(families)}
-            d: dict[str, Any] = {
-                "status": status,
-                "families": sorted_families,
-                "checks": as_simple_dict(processed),
-            }
-            if header:
-                print(json.dumps({header: d}, indent=2)[2:-2], end="", file=output)
-            else:
-                print(json.dumps(d, indent=2), file=output)
+        case "json" | "jsonl":
+            writer = json_writer or JSONWriter(output, lines=format_opt == "jsonl")
+            writer.write_report(
+                families, processed, status=status, header=header, timings=timings
+            )
         case "html":
             html = to_html(families, processed, status)
             if header:
@@ -287,24 +372,226 @@ def display_output(
             assert_never(format_opt)
 
 
+def _json_writer(
+    stream: TextIO, fmt: Formats | None, *, compact: bool, multi: bool
+) -> JSONWriter | None:
+    """
+    Make a writer shared by all packages for the JSON formats.
+    """
+    if fmt == "json":
+        return JSONWriter(stream, compact=compact, multi=multi)
+    if fmt == "jsonl":
+        return JSONWriter(stream, lines=True)
+    return None
+
+
+def _load_costs(path: Path) -> dict[str, float]:
+    """
+    Read check costs (wall time in seconds) from a previous ``--format json``
+    or ``jsonl`` run. Multi-package output is supported; the slowest time for
+    each check is used.
+    """
+    with path.open(encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        reports = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        reports = [data] if "checks" in data else list(data.values())
+    costs: dict[str, float] = {}
+    for report in reports:
+        for name, check in report.get("checks", {}).items():
+            if duration := check.get("duration"):
+                costs[name] = max(costs.get(name, 0.0), duration["wall"])
+    return costs
+
+
 def _remote_path_processor(package: Path) -> Path | GHPath:
-    if not str(package).startswith("gh:"):
+    remote = _parse_remote(str(package))
+    if remote is None:
         return package
 
-    _, org_repo_branch, *p = str(package).split(":", maxsplit=2)
-    if "@" in org_repo_branch:
-        org_repo, branch = org_repo_branch.split("@", maxsplit=1)
-    else:
-        org_repo = org_repo_branch
-        branch = "HEAD"
+    org_repo, branch, path = remote
     try:
-        return GHPath(repo=org_repo, branch=branch, path=p[0] if p else "")
+        return GHPath(repo=org_repo, branch=branch, path=path)
     except urllib.error.HTTPError as e:
+        import rich  # noqa: PLC0415
+
         rich.print(f"[red][bold]Error[/bold] accessing {e.url}", file=sys.stderr)
         rich.print(f"[red]{e}", file=sys.stderr)
         raise SystemExit(1) from None
 
 
+async def _remote_path_processor_async(
+    package: Path, prefetch_files: Mapping[str, AbstractSet[str]], *, subdir: str
+) -> Path | GHPath:
+    remote = _parse_remote(str(package))
+    if remote is None:
+        return package
+
+    import httpx  # noqa: PLC0415
+
+    try:
+        gh = await GHPath.async_from_repo(*remote)
+    except httpx.HTTPStatusError as e:
+        import rich  # noqa: PLC0415
+
+        rich.print(
+            f"[red][bold]Error[/bold] accessing {e.request.url}", file=sys.stderr
+        )
+        rich.print(f"[red]{e}", file=sys.stderr)
+        raise SystemExit(1) from None
+    await process_prefetch_files(gh, prefetch_files, subdir=subdir)
+    return gh
+
+
+class _Target(NamedTuple):
+    path: Path
+    package_dir: str
+    select: str
+
+
+def _read_targets(
+    path: Path, *, package_dir: str, select: str
+) -> Generator[_Target, None, None]:
+    """
+    Lazily read one target per line from a file, or stdin for ``-``. Each
+    line may override ``--package-dir=DIR`` and ``--select=CODES`` for that
+    target. Blank lines and ``#`` comments are skipped.
+    """
+    with (
+        contextlib.nullcontext(sys.stdin)
+        if str(path) == "-"
+        else path.open(encoding="utf-8")
+    ) as f:
+        for lineno, line in enumerate(f, start=1):
+            target, *options = shlex.split(line, comments=True) or [""]
+            if not target:
+                continue
+            overrides = {"package_dir": package_dir, "select": select}
+            for option in options:
+                key, sep, value = option.partition("=")
+                name = key.removeprefix("--").replace("-", "_")
+                if not sep or not key.startswith("--") or name not in overrides:
+                    msg = f"{path}:{lineno}: expected --package-dir=DIR or --select=CODES, got {option!r}"
+                    print(f"Error: {msg}", file=sys.stderr)
+                    raise SystemExit(1)
+                overrides[name] = value
+            yield _Target(Path(target), **overrides)
+
+
+def _review_threaded(
+    targets: Iterable[_Target],
+    review: Callable[..., _Review],
+    *,
+    jobs: int,
+    in_flight: int,
+) -> Generator[_Review, None, None]:
+    """
+    Review targets on ``jobs`` threads, yielding in the order given. At most
+    ``in_flight`` targets are read ahead. Pending reviews are cancelled if
+    the generator is closed early.
+    """
+
+    def run(target: _Target) -> _Review:
+        package = _remote_path_processor(target.path)
+        return review(package, package_dir=target.package_dir, select=target.select)
+
+    if jobs == 1:
+        yield from map(run, targets)
+        return
+
+    remaining = iter(targets)
+    with concurrent.futures.ThreadPoolExecutor(jobs) as pool:
+        pending = collections.deque(
+            pool.submit(run, t) for t in itertools.islice(remaining, in_flight)
+        )
+        try:
+            while pending:
+                reviewed = pending.popleft().result()
+                pending.extend(
+                    pool.submit(run, t) for t in itertools.islice(remaining, 1)
+                )
+                yield reviewed
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+class _ExitError(Exception):
+    """
+    Carries a :class:`SystemExit` out of the event loop thread.
+    """
+
+
+def _review_pipelined(
+    targets: Iterable[_Target],
+    review: Callable[..., _Review],
+    *,
+    jobs: int,
+    in_flight: int,
+) -> Generator[_Review, None, None]:
+    """
+    Review local and remote targets, yielding in the order given. The trees
+    of up to ``in_flight`` remote repos are fetched at once on an event loop
+    running in its own thread, so downloads keep going while the caller is
+    busy with a result; each repo's files are prefetched as soon as its tree
+    arrives, and it is reviewed on one of ``jobs`` threads as soon as its
+    files are ready, while others are still downloading.
+    """
+    import asyncio  # noqa: PLC0415
+
+    prefetch_files = collect_prefetch_files()
+    loop = asyncio.new_event_loop()
+
+    async def fetch_and_review(target: _Target) -> _Review:
+        try:
+            package = await _remote_path_processor_async(
+                target.path, prefetch_files, subdir=target.package_dir
+            )
+            run = functools.partial(
+                review, package, package_dir=target.package_dir, select=target.select
+            )
+            return await loop.run_in_executor(pool, run)
+        except SystemExit as e:
+            # A SystemExit would stop the loop instead of reaching the caller
+            raise _ExitError(e) from None
+
+    def submit(target: _Target) -> concurrent.futures.Future[_Review]:
+        return asyncio.run_coroutine_threadsafe(fetch_and_review(target), loop)
+
+    async def cancel_all() -> None:
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    remaining = iter(targets)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(jobs) as pool:
+            pending = collections.deque(
+                submit(t) for t in itertools.islice(remaining, in_flight)
+            )
+            try:
+                while pending:
+                    try:
+                        reviewed = pending.popleft().result()
+                    except _ExitError as e:
+                        raise e.args[0] from None
+                    pending.extend(submit(t) for t in itertools.islice(remaining, 1))
+                    yield reviewed
+            finally:
+                pool.shutdown(cancel_futures=True)
+                if pending:
+                    asyncio.run_coroutine_threadsafe(cancel_all(), loop).result()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
 def main(args: list[str] | None = None) -> None:
     """
     Pass in a local Path or gh:org/repo[@branch][:path]. Will run on the current
@@ -327,6 +614,22 @@ def main(args: list[str] | None = None) -> None:
         help="Set logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).",
         metavar="LEVEL",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Load plugins and serve runs from repo-review-client on a Unix socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        metavar="PATH",
+        help="Socket for --daemon. Defaults to $REPO_REVIEW_SOCKET or a per-user socket.",
+    )
+    parser.add_argument(
+        "--fork",
+        action="store_true",
+        help="With --daemon, run each request in a forked process.",
+    )
     parser.add_argument(
         "--list-all",
         action="store_true",
@@ -338,19 +641,30 @@ def main(args: list[str] | None = None) -> None:
         nargs="*",
         help="Local path or gh:org/repo[@branch][:path]",
     )
+    parser.add_argument(
+        "--repos-from",
+        type=Path,
+        metavar="FILE",
+        help="Read more targets from FILE (- for stdin), one per line. Lines can add --package-dir=DIR and --select=CODES.",
+    )
     parser.add_argument(
         "--format",
         dest="format_opt",
-        choices=["rich", "json", "html", "svg"],
+        choices=["rich", "json", "jsonl", "html", "svg"],
         default="rich",
         help="Select output format.",
     )
     parser.add_argument(
         "--stderr",
         dest="stderr_fmt",
-        choices=["rich", "json", "html", "svg"],
+        choices=["rich", "json", "jsonl", "html", "svg"],
         help="Select additional output format for stderr. Will disable terminal escape codes for stdout for easy redirection.",
     )
+    parser.add_argument(
+        "--summary",
+        choices=["rich", "html", "csv"],
+        help="Print a repo x check matrix and pass rates to stdout instead of each report. Rows are written as each repo finishes.",
+    )
     parser.add_argument(
         "--show",
         choices=["all", "err", "errskip"],
@@ -383,13 +697,79 @@ def main(args: list[str] | None = None) -> None:
         default="",
         help="Path to python package.",
     )
+    parser.add_argument(
+        "--check-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Skip any check that takes longer than this. Overrides check-timeout in [tool.repo-review].",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Skip the remaining checks for a repo after this long. Overrides timeout in [tool.repo-review].",
+    )
+    failures = parser.add_mutually_exclusive_group()
+    failures.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop after the first failing check. Same as --max-failures=1.",
+    )
+    failures.add_argument(
+        "--max-failures",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Stop running checks after N failures, and skip any remaining packages.",
+    )
+    parser.add_argument(
+        "--costs",
+        type=Path,
+        metavar="FILE",
+        help="JSON output from a previous run with timings (--format json or jsonl). Cheap checks will be run first.",
+    )
+    parser.add_argument(
+        "--fixture-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Compute independent fixtures on N threads. Helps with remote (gh:) repos.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Review up to N packages at once. Output is still in the order given.",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON output without whitespace.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        metavar="FILE",
+        help="Also record all results in a SQLite database, created if missing, to track repos over time.",
+    )
+    parser.add_argument(
+        "--durations",
+        type=int,
+        metavar="N",
+        help="Show the N slowest fixtures, collection functions, and checks on stderr (0 for all). Also adds all timings to JSON output.",
+    )
 
     parsed = parser.parse_args(args)
+    max_failures = 1 if parsed.fail_fast else parsed.max_failures
 
     # Configure logging (Rich handler) for only our package if requested
     lvl = parsed.log_level or os.getenv("REPO_REVIEW_LOG_LEVEL")
     if lvl:
         level = getattr(logging, lvl.upper(), logging.INFO)
+        from rich.logging import RichHandler  # noqa: PLC0415
+
         handler = RichHandler()
         # Configure only the `repo_review` logger to avoid enabling global logging
         repo_logger = logging.getLogger("repo_review")
@@ -401,79 +781,173 @@ def main(args: list[str] | None = None) -> None:
         _all_versions()
         return
 
+    if parsed.daemon:
+        from repo_review.daemon import serve  # noqa: PLC0415
+
+        serve(parsed.socket, fork=parsed.fork)
+        return
+
     if parsed.list_all:
         _list_all()
         return
 
-    packages: list[Path | GHPath] = [_remote_path_processor(p) for p in parsed.packages]
-
-    if not packages:
-        packages = [Path()]
+    targets: Iterable[_Target] = [
+        _Target(p, parsed.package_dir, parsed.select)
+        for p in parsed.packages or ([] if parsed.repos_from else [Path()])
+    ]
+    if parsed.repos_from:
+        targets = itertools.chain(
+            targets,
+            _read_targets(
+                parsed.repos_from,
+                package_dir=parsed.package_dir,
+                select=parsed.select,
+            ),
+        )
 
     format_opt: Formats = parsed.format_opt
     stderr_fmt: Formats | None = parsed.stderr_fmt
 
-    if len(packages) > 1:
-        if format_opt == "json":
-            print("{")
-        if stderr_fmt == "json":
-            print("{", file=sys.stderr)
+    multi = bool(parsed.repos_from) or len(parsed.packages) > 1
+    json_writers = {
+        "stdout": None
+        if parsed.summary
+        else _json_writer(sys.stdout, format_opt, compact=parsed.compact, multi=multi),
+        "stderr": _json_writer(
+            sys.stderr, stderr_fmt, compact=parsed.compact, multi=multi
+        ),
+    }
+
+    costs = _load_costs(parsed.costs) if parsed.costs else None
 
+    review = functools.partial(
+        _review,
+        select=parsed.select,
+        ignore=parsed.ignore,
+        extend_select=parsed.extend_select,
+        extend_ignore=parsed.extend_ignore,
+        package_dir=parsed.package_dir,
+        check_timeout=parsed.check_timeout,
+        timeout=parsed.timeout,
+        max_failures=max_failures,
+        costs=costs,
+        fixture_workers=parsed.fixture_workers,
+        timings=parsed.durations is not None or bool(parsed.store),
+    )
+    jobs = max(1, parsed.jobs)
+    in_flight = max(IN_FLIGHT, 2 * jobs)
     supports_async = (
         sys.version_info >= (3, 11) and importlib.util.find_spec("httpx") is not None
     )
+    if supports_async and (
+        parsed.repos_from or any(_parse_remote(str(p)) for p in parsed.packages)
+    ):
+        reviews = _review_pipelined(targets, review, jobs=jobs, in_flight=in_flight)
+    else:
+        reviews = _review_threaded(targets, review, jobs=jobs, in_flight=in_flight)
+
     result = 0
-    for n, package in enumerate(packages):
-        if supports_async and isinstance(package, GHPath):
-            prefetch_files = collect_prefetch_files()
-            asyncio.run(
-                process_prefetch_files(
-                    package, prefetch_files, subdir=parsed.package_dir
+    # A min-heap of the slowest timings, so memory doesn't grow with the repos
+    slowest: list[tuple[float, int, str, Timing]] = []
+    with contextlib.ExitStack() as stack:
+        stack.callback(reviews.close)
+        store = None
+        if parsed.store:
+            from repo_review.store import ResultStore  # noqa: PLC0415
+
+            store = stack.enter_context(ResultStore(parsed.store))
+        summary = None
+        if parsed.summary:
+            from repo_review.summary import SummaryWriter  # noqa: PLC0415
+
+            checks = _summary_checks(
+                parsed.select,
+                parsed.ignore,
+                parsed.extend_select,
+                parsed.extend_ignore,
+            )
+            summary = stack.enter_context(
+                SummaryWriter(
+                    sys.stdout,
+                    parsed.summary,
+                    color=stderr_fmt is None,
+                    checks=checks,
                 )
             )
+        for reviewed in reviews:
+            if store is not None:
+                repo, ref, commit = _provenance(reviewed.package)
+                store.add(
+                    repo,
+                    reviewed.families,
+                    reviewed.processed,
+                    status=reviewed.status,
+                    ref=ref,
+                    commit=commit,
+                    timings=reviewed.timings,
+                )
+            code = _report(
+                reviewed,
+                format_opt,
+                stderr_fmt,
+                add_header=multi,
+                show=parsed.show,
+                durations=parsed.durations is not None,
+                json_writers=json_writers,
+                summary=summary,
+            )
+            result |= code
+            if parsed.durations is not None:
+                _keep_slowest(
+                    slowest, str(reviewed.package), reviewed.timings, parsed.durations
+                )
+            if max_failures and code == 3:
+                break
 
-        result |= on_each(
-            package,
-            format_opt,
-            stderr_fmt,
-            parsed.select,
-            parsed.ignore,
-            parsed.extend_select,
-            parsed.extend_ignore,
-            parsed.package_dir,
-            add_header=len(packages) > 1,
-            show=parsed.show,
+    for writer in json_writers.values():
+        if writer is not None:
+            writer.close()
+
+    if parsed.durations is not None:
+        print_durations(
+            [(package, timing) for _, _, package, timing in slowest],
+            parsed.durations,
+            show_package=multi,
         )
-        if len(packages) > 1:
-            is_before_end = n < len(packages) - 1
-            if format_opt == "json":
-                print("," if is_before_end else "")
-            if stderr_fmt == "json":
-                print("," if is_before_end else "", file=sys.stderr)
-
-    if len(packages) > 1:
-        if format_opt == "json":
-            print("}")
-        if stderr_fmt == "json":
-            print("}", file=sys.stderr)
 
     if result:
         raise SystemExit(result)
 
 
-def on_each(
+class _Review(NamedTuple):
+    package: Path | GHPath
+    header: str
+    families: Mapping[str, Family]
+    processed: list[Result]
+    status: Status
+    timings: list[Timing]
+
+
+def _review(
     package: Path | GHPath,
-    format_opt: Literal["rich", "json", "html", "svg"],
-    stderr_fmt: Literal["rich", "json", "html", "svg"] | None,
     select: str,
     ignore: str,
     extend_select: str,
     extend_ignore: str,
     package_dir: str,
     *,
-    add_header: bool,
-    show: Show,
-) -> int:
+    check_timeout: float | None = None,
+    timeout: float | None = None,
+    max_failures: int = 0,
+    costs: Mapping[str, float] | None = None,
+    fixture_workers: int = 1,
+    timings: bool = False,
+) -> _Review:
+    """
+    Review one package without printing anything, so several can run at once.
+    All results are kept; ``--show`` is applied when printing. Timings are
+    only recorded if ``timings`` is set.
+    """
     base_package: Traversable
 
     ignore_list = {x.strip() for x in ignore.split(",") if x.strip()}
@@ -484,58 +958,125 @@ def on_each(
     # Local paths support pointing at pyproject.toml as a special case
     match package:
         case GHPath(repo=header) as base_package:
-            if format_opt == "rich":
-                rich.print(f"[bold]Processing [blue]{package}[/blue] from GitHub\n")
+            pass
         case object(parent=base_package, name="pyproject.toml") if package.is_file():
             # Special case for passing a path to a pyproject.toml
             header = base_package.name
         case base_package:
             header = getattr(package, "name", str(package))
 
-    collected = collect_all(base_package, subdir=package_dir)
-    if len(collected.checks) == 0:
-        msg = "No checks registered. Please install a repo-review plugin."
-        print(f"Error: {msg}", file=sys.stderr)
-        raise SystemExit(1)
+    recorder = record_durations() if timings else contextlib.nullcontext(list[Timing]())
+    with recorder as recorded:
+        collected = collect_all(
+            base_package, subdir=package_dir, fixture_workers=fixture_workers
+        )
+        if len(collected.checks) == 0:
+            msg = "No checks registered. Please install a repo-review plugin."
+            print(f"Error: {msg}", file=sys.stderr)
+            raise SystemExit(1)
 
-    families, processed = process(
-        base_package,
-        select=select_list,
-        ignore=ignore_list,
-        extend_select=extend_select_list,
-        extend_ignore=extend_ignore_list,
-        subdir=package_dir,
-        collected=collected,
-    )
+        families, processed = process(
+            base_package,
+            select=select_list,
+            ignore=ignore_list,
+            extend_select=extend_select_list,
+            extend_ignore=extend_ignore_list,
+            subdir=package_dir,
+            collected=collected,
+            check_timeout=check_timeout,
+            timeout=timeout,
+            max_failures=max_failures,
+            costs=costs,
+        )
 
-    status: Status = "passed" if processed else "empty"
-    for result in processed:
-        if result.result is False:
-            status = "errors"
-            break
-        if result.result is None:
-            status = "skips"
-
-    if show != "all":
-        processed = [r for r in processed if not r.result]
-        if show == "err":
-            processed = [r for r in processed if r.result is not None]
-        known_families = {r.family for r in processed}
-        families = {
-            k: v
-            for k, v in families.items()
-            if k in known_families or v.get("description", "")
-        }
-
-    display_output(
-        families,
-        processed,
-        format_opt=format_opt,
-        stderr=False,
-        color=stderr_fmt is None,
-        status=status,
-        header=header if add_header else "",
-    )
+    return _Review(package, header, families, processed, _status(processed), recorded)
+
+
+def _shown(
+    families: Mapping[str, Family], processed: list[Result], show: Show
+) -> tuple[Mapping[str, Family], list[Result]]:
+    """
+    The families and results to print for ``--show``.
+    """
+    if show == "all":
+        return families, processed
+    processed = [r for r in processed if not r.result]
+    if show == "err":
+        processed = [r for r in processed if r.result is not None]
+    known_families = {r.family for r in processed}
+    families = {
+        k: v
+        for k, v in families.items()
+        if k in known_families or v.get("description", "")
+    }
+    return families, processed
+
+
+def _provenance(package: Path | GHPath) -> tuple[str, str | None, str | None]:
+    """
+    The repo, ref, and commit recorded by ``--store``. Local repos are
+    identified by their path, with the branch and commit if they are in git.
+    """
+    if isinstance(package, GHPath):
+        repo = f"{package.repo}:{package.path}" if package.path else package.repo
+        return repo, package.branch, None
+
+    import subprocess  # noqa: PLC0415
+
+    path = package.resolve()
+    if path.name == "pyproject.toml":
+        path = path.parent
+    try:
+        rev_parse = subprocess.run(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD", "HEAD"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return str(path), None, None
+    ref, commit = rev_parse.stdout.split()
+    # A detached HEAD has no branch
+    return str(path), None if ref == "HEAD" else ref, commit
+
+
+def _report(
+    review: _Review,
+    format_opt: Formats,
+    stderr_fmt: Formats | None,
+    *,
+    add_header: bool,
+    show: Show = "all",
+    durations: bool = False,
+    json_writers: Mapping[str, JSONWriter | None] | None = None,
+    summary: SummaryWriter | None = None,
+) -> int:
+    """
+    Print the report for one package and return its exit code. With a
+    ``summary``, the package is added to it instead of printed to stdout.
+    """
+    package, header, families, processed, status, timings = review
+    if summary is not None:
+        summary.write_repo(header, families, processed, status)
+    families, processed = _shown(families, processed, show)
+    if summary is None:
+        if isinstance(package, GHPath) and format_opt == "rich":
+            import rich  # noqa: PLC0415
+
+            rich.print(f"[bold]Processing [blue]{package}[/blue] from GitHub\n")
+
+        display_output(
+            families,
+            processed,
+            format_opt=format_opt,
+            stderr=False,
+            color=stderr_fmt is None,
+            status=status,
+            header=header if add_header or format_opt == "jsonl" else "",
+            timings=timings if durations else None,
+            json_writer=json_writers["stdout"] if json_writers else None,
+        )
     if stderr_fmt:
         display_output(
             families,
@@ -544,7 +1085,9 @@ def on_each(
             stderr=True,
             color=True,
             status=status,
-            header=header if add_header else "",
+            header=header if add_header or stderr_fmt == "jsonl" else "",
+            timings=timings if durations else None,
+            json_writer=json_writers["stderr"] if json_writers else None,
         )
 
     if status == "errors":
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 __lazy_modules__ = ["time"]
 
+import contextvars
+import dataclasses
 import time
+import typing
 from contextlib import contextmanager
 
 TYPE_CHECKING = False
@@ -10,8 +13,17 @@ if TYPE_CHECKING:
     import logging
     from collections.abc import Generator
 
+    from ._compat.typing import Self
 
-__all__ = ["log_timer"]
+
+__all__ = [
+    "Duration",
+    "Stopwatch",
+    "Timing",
+    "current_section",
+    "log_timer",
+    "record_durations",
+]
 
 
 def __dir__() -> list[str]:
@@ -41,3 +53,99 @@ def log_timer(
         end_time = time.perf_counter()
         elapsed_time = end_time - start_time
         logger.info(f"{msg} (%.3f seconds)", *args, elapsed_time)  # noqa: G004
+
+
+@dataclasses.dataclass(frozen=True)
+class Duration:
+    """
+    The time taken by a fixture, collection function, or check.
+
+    .. versionadded:: 1.3
+    """
+
+    wall: float  #: Wall-clock time in seconds
+    cpu: float  #: CPU time of the running thread in seconds
+
+
+class Timing(typing.NamedTuple):
+    """
+    A single recorded measurement, see :func:`record_durations`.
+
+    .. versionadded:: 1.3
+    """
+
+    #: What was timed: ``"fixture"``, ``"collect"`` (a check collection
+    #: function), ``"family"`` (a family function), or ``"check"``.
+    kind: str
+    name: str  #: The fixture name, check name, or ``module:function``
+    duration: Duration  #: The measured time
+
+
+_recorder: contextvars.ContextVar[list[Timing] | None] = contextvars.ContextVar(
+    "repo_review_durations", default=None
+)
+
+
+# The kind and name of the innermost Stopwatch running in this context
+_section: contextvars.ContextVar[tuple[str, str] | None] = contextvars.ContextVar(
+    "repo_review_section", default=None
+)
+
+
+def current_section() -> tuple[str, str] | None:
+    """
+    The ``(kind, name)`` of the fixture, collection function, family function,
+    or check running in this context, like :attr:`Timing.kind` and
+    :attr:`Timing.name`, or None outside of one.
+
+    .. versionadded:: 1.3
+    """
+    return _section.get()
+
+
+@contextmanager
+def record_durations() -> Generator[list[Timing], None, None]:
+    """
+    Context manager that collects a :class:`Timing` for every fixture,
+    collection function, family function, and check run inside the block.
+    Nesting is supported; the innermost block receives the timings. Work
+    submitted to other threads is only recorded if the context is copied, as
+    :func:`asyncio.to_thread` does.
+
+    .. versionadded:: 1.3
+    """
+    timings: list[Timing] = []
+    token = _recorder.set(timings)
+    try:
+        yield timings
+    finally:
+        _recorder.reset(token)
+
+
+class Stopwatch:
+    """
+    Measure the wall and CPU time of a block. The result is stored in
+    ``.duration`` and recorded if inside :func:`record_durations`.
+    """
+
+    __slots__ = ("_cpu", "_token", "_wall", "duration", "kind", "name")
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.duration = Duration(0.0, 0.0)
+
+    def __enter__(self) -> Self:
+        self._token = _section.set((self.kind, self.name))
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.duration = Duration(
+            time.perf_counter() - self._wall, time.thread_time() - self._cpu
+        )
+        _section.reset(self._token)
+        timings = _recorder.get()
+        if timings is not None:
+            timings.append(Timing(self.kind, self.name, self.duration))
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}.fixtures", "importlib", "importlib.metadata"]
-
+__lazy_modules__ = [
+    f"{__spec__.parent}._timer",
+    f"{__spec__.parent}.fixtures",
+    "fnmatch",
+    "functools",
+    "importlib",
+    "importlib.metadata",
+    "re",
+]
+
+import fnmatch
+import functools
 import importlib.metadata
+import re
 from typing import Any, Protocol
 
-from .fixtures import apply_fixtures
+from ._timer import Stopwatch
+from .fixtures import _func_name, apply_fixtures
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Mapping, Sequence
     from collections.abc import Set as AbstractSet
 
-__all__ = ["Check", "collect_checks", "get_check_url", "is_allowed", "name_matches"]
+__all__ = [
+    "BatchCheck",
+    "Check",
+    "PerFileCheck",
+    "Selectors",
+    "collect_checks",
+    "compile_selectors",
+    "get_check_url",
+    "is_allowed",
+    "name_matches",
+]
 
 
 def __dir__() -> list[str]:
@@ -47,6 +69,14 @@ class Check(Protocol):
         identical to omitting this member.
         """
 
+    @property
+    def cost(self) -> float:  # Optional
+        """
+        This is an (optional) relative cost hint. If any check has one, cheap
+        checks are scheduled first, which helps fail-fast runs report a
+        failure sooner. Omitting this is like returning `0`.
+        """
+
     def check(self) -> bool | None | str:
         """
         This is a check. The docstring is used as the failure message if
@@ -57,6 +87,86 @@ class Check(Protocol):
         ...
 
 
+class BatchCheck(Protocol):
+    """
+    This is the batch check Protocol, for checks that need to see many repos
+    at once, like comparing pinned tool versions across an organization. It
+    is collected like a :class:`Check`, and supports the same optional
+    members, but sets ``batch = True`` and its ``check`` is called once with
+    the fixtures of every repo in a
+    :func:`~repo_review.processor.process_many` run. When a single repo is
+    processed, it is called with just that repo.
+
+    .. versionadded:: 1.3
+    """
+
+    @property
+    def family(self) -> str:
+        """
+        The family is a string that the checks will be grouped by.
+        """
+
+    @property
+    def batch(self) -> bool:
+        """
+        Must be `True` to mark this as a batch check.
+        """
+
+    def check(self, repos: Sequence[Mapping[str, Any]]) -> Sequence[bool | None | str]:
+        """
+        This is a batch check. It gets one mapping of fixtures (including
+        ``name``) per repo, and returns one result per repo, in the same
+        order, with the same meaning as :meth:`Check.check`. The docstring is
+        used as the failure message if `False` is returned.
+        """
+        ...
+
+
+def _is_batch(check: object) -> bool:
+    return getattr(check, "batch", False) is True
+
+
+class PerFileCheck(Protocol):
+    """
+    This is the per-file check Protocol, for checks like "every workflow
+    file must do X". It is collected like a :class:`Check`, and supports the
+    same optional members, but also declares a ``glob``. The check is run
+    once for each matching file (in parallel), and the results are combined
+    into a single result, with a breakdown of the files that failed.
+
+    .. versionadded:: 1.3
+    """
+
+    @property
+    def family(self) -> str:
+        """
+        The family is a string that the checks will be grouped by.
+        """
+
+    @property
+    def glob(self) -> str:
+        """
+        A glob pattern relative to the package, like
+        ``".github/workflows/*.yml"`` or ``"**/__init__.py"``. Only files
+        are matched.
+        """
+
+    def check(self) -> bool | None | str:
+        """
+        This is the check for a single file, which is passed as the ``path``
+        fixture; other fixtures can be requested too. Returns the same values
+        as :meth:`Check.check`. The combined result fails if any file fails,
+        is skipped if every file is skipped, and passes otherwise (including
+        when no files match).
+        """
+        ...
+
+
+def _per_file_glob(check: object) -> str | None:
+    glob = getattr(check, "glob", None)
+    return glob if isinstance(glob, str) else None
+
+
 def collect_checks(fixtures: Mapping[str, Any]) -> dict[str, Check]:
     """
     Produces a list of checks based on installed entry points. You must provide
@@ -69,48 +179,129 @@ def collect_checks(fixtures: Mapping[str, Any]) -> dict[str, Check]:
         ep.load() for ep in importlib.metadata.entry_points(group="repo_review.checks")
     )
 
-    return {
-        k: v
-        for func in check_functions
-        for k, v in apply_fixtures(fixtures, func).items()
-    }
+    collected: dict[str, Any] = {}
+    for func in check_functions:
+        with Stopwatch("collect", _func_name(func)):
+            collected.update(apply_fixtures(fixtures, func))
+    return collected
+
 
+_GLOB_CHARS = frozenset("*?[")
 
-def name_matches(name: str, selectors: AbstractSet[str]) -> str:
+
+class Selectors:
+    """
+    A compiled set of selectors. A selector is an exact check name, a check
+    name without its number (``"PY"`` matches ``"PY001"``), or a glob
+    (``"PY0*"``, ``"GH1??"``, ``"*"``). Exact names and prefixes are found with
+    a set lookup. Globs are indexed by their literal prefix (the text before
+    the first wildcard), and only the globs whose prefix starts the name are
+    tried, so matching takes time in the length of the name, not the number of
+    selectors. Use :func:`compile_selectors` to get a cached instance.
+
+    .. versionadded:: 1.3
+    """
+
+    __slots__ = ("_globs", "_lengths", "_names")
+
+    def __init__(self, selectors: Iterable[str]) -> None:
+        selectors = set(selectors)
+        self._names = frozenset(s for s in selectors if _GLOB_CHARS.isdisjoint(s))
+        self._globs: dict[str, list[tuple[str, re.Pattern[str]]]] = {}
+        for glob in sorted(selectors - self._names):
+            prefix = re.split(r"[*?[]", glob, maxsplit=1)[0]
+            self._globs.setdefault(prefix, []).append(
+                (glob, re.compile(fnmatch.translate(glob)))
+            )
+        self._lengths = sorted({len(prefix) for prefix in self._globs})
+
+    def __bool__(self) -> bool:
+        return bool(self._names or self._globs)
+
+    def match(self, name: str) -> str:
+        """
+        Return the selector that matches ``name``, or an empty string. An
+        exact name wins over a prefix, which wins over a glob; of several
+        globs, the first in sorted order wins.
+        """
+        if name in self._names:
+            return name
+        short_name = name.rstrip("0123456789")
+        if short_name in self._names:
+            return short_name
+        return min(
+            (
+                glob
+                for length in self._lengths
+                if length <= len(name)
+                for glob, regex in self._globs.get(name[:length], ())
+                if regex.match(name)
+            ),
+            default="",
+        )
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_selectors(selectors: frozenset[str]) -> Selectors:
+    return Selectors(selectors)
+
+
+def compile_selectors(selectors: Iterable[str] | Selectors) -> Selectors:
+    """
+    Compile selectors (see :class:`Selectors`), reusing a cached instance for
+    a selection that has been seen before.
+
+    :param selectors: The selectors, or an already compiled instance.
+
+    .. versionadded:: 1.3
+    """
+    if isinstance(selectors, Selectors):
+        return selectors
+    return _compile_selectors(frozenset(selectors))
+
+
+def name_matches(name: str, selectors: AbstractSet[str] | Selectors) -> str:
     """
     Checks if the name is contained in the selectors. The selectors can be the
-    exact name or just the non-number prefix. Returns the selector that matched,
-    or an empty string if no match.
+    exact name, just the non-number prefix, or a glob. Returns the selector
+    that matched, or an empty string if no match.
 
     :param name: The name to check.
     :param selectors: The selectors to check against.
 
     :return: The matched selector if the name matches a selector, or an empty string if no match.
+
+    .. versionchanged:: 1.3
+       Globs are supported, and precompiled :class:`Selectors` can be passed.
     """
-    if name in selectors:
-        return name
-    short_name = name.rstrip("0123456789")
-    if short_name in selectors:
-        return short_name
-    return ""
+    return compile_selectors(selectors).match(name)
 
 
-def is_allowed(select: AbstractSet[str], ignore: AbstractSet[str], name: str) -> bool:
+def is_allowed(
+    select: AbstractSet[str] | Selectors,
+    ignore: AbstractSet[str] | Selectors,
+    name: str,
+) -> bool:
     """
     Skips the check if the name is in the ignore list or if the name without the
     number is in the ignore list. If the select list is not empty, only runs the
-    check if the name or name without the number is in the select list.
+    check if the name or name without the number is in the select list. Globs
+    are supported in both.
 
     :param select: A set of names or prefixes to include. "*" selects all checks.
     :param ignore: A set of names or prefixes to exclude.
     :param name: The check to test.
 
     :return: True if this check is allowed, False otherwise.
+
+    .. versionchanged:: 1.3
+       Globs are supported, and precompiled :class:`Selectors` can be passed.
     """
-    if select and not name_matches(name, select) and "*" not in select:
+    select = compile_selectors(select)
+    if select and not select.match(name):
         return False
 
-    return not name_matches(name, ignore)
+    return not compile_selectors(ignore).match(name)
 
 
 def get_check_url(name: str, check: Check) -> str:
@@ -0,0 +1,402 @@
+"""
+A warm server for repeated CLI runs, like pre-commit hooks and editors make,
+and a thin client for it.
+
+``repo-review --daemon`` loads the plugins once and listens on a Unix socket.
+``repo-review-client ARGS`` (or ``python -m repo_review.daemon ARGS``) sends
+its arguments, working directory, and color settings to the server, then
+prints the output and exits with the code of ``repo-review ARGS`` run in the
+server. Requests are run one at a time in the server; with ``--fork``, each
+runs in a forked child instead, so plugins can't leak state between runs and
+several can run at once.
+
+The socket is ``$REPO_REVIEW_SOCKET`` if set, otherwise
+``repo-review-<uid>.sock`` in ``$XDG_RUNTIME_DIR``, or ``daemon.sock`` in a
+``repo-review-<uid>`` directory only the user can access in the temporary
+directory. Only the user can connect to the socket, and the client refuses a
+socket owned by someone else. Plugins installed after the server starts are
+not seen until it is restarted.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "codecs",
+    "importlib",
+    "importlib.metadata",
+    "json",
+    "os",
+    "pathlib",
+    "socket",
+    "stat",
+    "tempfile",
+    "threading",
+    "traceback",
+]
+
+import codecs
+import contextlib
+import importlib.metadata
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from typing import Any, BinaryIO, TextIO
+
+__all__ = ["client_main", "default_socket_path", "request", "serve", "shutdown"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# Each response frame is a channel (stdout, stderr, or exit code) and a length
+_HEADER = struct.Struct(">cI")
+_STDOUT, _STDERR, _EXIT = b"o", b"e", b"x"
+
+#: Environment variables the client forwards, as they change the output
+FORWARDED_ENV = ("COLUMNS", "FORCE_COLOR", "NO_COLOR", "REPO_REVIEW_LOG_LEVEL", "TERM")
+
+logger = logging.getLogger(__name__)
+
+_GROUPS = (
+    "repo_review.checks",
+    "repo_review.families",
+    "repo_review.fixtures",
+    "repo_review.prefetch_files",
+)
+
+
+def default_socket_path() -> Path:
+    """
+    The socket used if none is given.
+    """
+    if path := os.environ.get("REPO_REVIEW_SOCKET"):
+        return Path(path)
+    if runtime := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(runtime) / f"repo-review-{os.getuid()}.sock"
+    return _temp_socket_dir() / "daemon.sock"
+
+
+def _temp_socket_dir() -> Path:
+    # The temporary directory is shared, so the socket goes in a private one
+    return Path(tempfile.gettempdir()) / f"repo-review-{os.getuid()}"
+
+
+def _private_dir(path: Path) -> None:
+    """
+    Create a directory only the user can access, or check an existing one.
+    """
+    path.mkdir(mode=0o700, exist_ok=True)
+    info = path.lstat()
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        msg = f"{path} must be a directory only the current user can access"
+        raise PermissionError(msg)
+
+
+class _ClientGoneError(Exception):
+    """
+    The client closed the connection. Not an :class:`OSError`, so the CLI
+    doesn't handle it like one of its own errors.
+    """
+
+
+class _Channel(io.RawIOBase):
+    def __init__(
+        self, conn: socket.socket, channel: bytes, lock: threading.Lock
+    ) -> None:
+        self.conn = conn
+        self.channel = channel
+        self.lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        with self.lock:
+            try:
+                self.conn.sendall(_HEADER.pack(self.channel, len(data)) + data)
+            except OSError as e:
+                raise _ClientGoneError from e
+        return len(data)
+
+
+def _text_stream(conn: socket.socket, channel: bytes, lock: threading.Lock) -> TextIO:
+    buffer = io.BufferedWriter(_Channel(conn, channel, lock))
+    return io.TextIOWrapper(buffer, encoding="utf-8", line_buffering=True)
+
+
+@contextlib.contextmanager
+def _cached_entry_points() -> Generator[None, None, None]:
+    """
+    Load all plugins once, and keep the entry points for the server's lifetime.
+    """
+    orig = importlib.metadata.entry_points
+    cache = {group: list(orig(group=group)) for group in _GROUPS}
+    for eps in cache.values():
+        for ep in eps:
+            ep.load()
+
+    def entry_points(**params: Any) -> Any:
+        if params.keys() == {"group"} and params["group"] in cache:
+            return cache[params["group"]]
+        return orig(**params)
+
+    importlib.metadata.entry_points = entry_points
+    try:
+        yield
+    finally:
+        importlib.metadata.entry_points = orig
+
+
+@contextlib.contextmanager
+def _redirected(
+    conn: socket.socket, cwd: str, env: dict[str, str]
+) -> Generator[None, None, None]:
+    """
+    Send output to the client, and run in its directory with its environment.
+    The logging setup is restored afterwards, as ``--log-level`` adds to it.
+    """
+    lock = threading.Lock()
+    saved_streams = sys.stdout, sys.stderr
+    saved_cwd = Path.cwd()
+    saved_env = {k: os.environ.get(k) for k in FORWARDED_ENV}
+    logger = logging.getLogger("repo_review")
+    saved_logger = logger.level, logger.handlers[:], logger.propagate
+    sys.stdout = _text_stream(conn, _STDOUT, lock)
+    sys.stderr = _text_stream(conn, _STDERR, lock)
+    try:
+        os.chdir(cwd)
+        for key in FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = env[key]
+            else:
+                os.environ.pop(key, None)
+        # Rich's global console keeps the color settings of its first use
+        if "rich" in sys.modules:
+            import rich  # noqa: PLC0415
+
+            rich.reconfigure()
+        yield
+    finally:
+        with contextlib.suppress(_ClientGoneError):
+            sys.stdout.flush()
+            sys.stderr.flush()
+        sys.stdout, sys.stderr = saved_streams
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        logger.level, logger.handlers[:], logger.propagate = saved_logger
+
+
+def _run(conn: socket.socket, message: dict[str, Any]) -> None:
+    from .__main__ import main  # noqa: PLC0415
+
+    with _redirected(conn, message["cwd"], message["env"]):
+        try:
+            main(message["argv"])
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except _ClientGoneError:
+            raise
+        except Exception:  # noqa: BLE001
+            traceback.print_exc()
+            code = 1
+        else:
+            code = 0
+    data = str(code).encode()
+    conn.sendall(_HEADER.pack(_EXIT, len(data)) + data)
+
+
+def _bind(path: Path) -> socket.socket:
+    if path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(path))
+            except ConnectionRefusedError:
+                # Left behind by a server that was killed
+                path.unlink()
+            else:
+                msg = f"A repo-review daemon is already listening on {path}"
+                raise RuntimeError(msg)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the socket without access for others, instead of changing the
+    # mode after it is already listening
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(umask)
+    server.listen()
+    return server
+
+
+def _handle(server: socket.socket, conn: socket.socket, *, fork: bool) -> bool:
+    """
+    Answer one connection. Returns True for a shutdown request.
+    """
+    with conn, conn.makefile("rb") as f:
+        line = f.readline()
+        if not line:
+            # A probe from another server, see _bind
+            return False
+        message = json.loads(line)
+        if message.get("shutdown"):
+            return True
+        if not fork:
+            _run(conn, message)
+        elif os.fork() == 0:
+            server.close()
+            try:
+                _run(conn, message)
+            finally:
+                os._exit(0)
+    return False
+
+
+def serve(path: str | os.PathLike[str] | None = None, *, fork: bool = False) -> None:
+    """
+    Load the plugins and serve CLI runs on a Unix socket until a client sends
+    a shutdown request (:func:`shutdown`) or the process is interrupted.
+
+    :param path: The socket, see :func:`default_socket_path` for the default.
+    :param fork: Run each request in a forked child.
+    """
+    path = default_socket_path() if path is None else Path(path)
+    if path.parent == _temp_socket_dir():
+        _private_dir(path.parent)
+    with _cached_entry_points(), _bind(path) as server:
+        try:
+            while True:
+                conn, _ = server.accept()
+                # A bad request or a client going away only ends that request
+                try:
+                    if _handle(server, conn, fork=fork):
+                        break
+                except (OSError, _ClientGoneError):
+                    logger.info("The client went away before its run finished")
+                except Exception:
+                    logger.exception("Could not handle a request")
+                if fork:
+                    with contextlib.suppress(ChildProcessError):
+                        while os.waitpid(-1, os.WNOHANG)[0]:
+                            pass
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _send(path: str | os.PathLike[str] | None, message: dict[str, Any]) -> BinaryIO:
+    path = default_socket_path() if path is None else Path(path)
+    # Don't send the arguments and environment to another user's server
+    if path.stat().st_uid != os.getuid():
+        msg = f"{path} is owned by another user"
+        raise PermissionError(msg)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        return sock.makefile("rb")
+    finally:
+        # The file keeps the connection open
+        sock.close()
+
+
+def request(
+    argv: Sequence[str],
+    *,
+    path: str | os.PathLike[str] | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int:
+    """
+    Run ``repo-review`` with ``argv`` in the server, in the current directory.
+
+    :param argv: The command line arguments.
+    :param path: The socket, see :func:`default_socket_path` for the default.
+    :param stdout: Where to write the output, ``sys.stdout`` by default.
+    :param stderr: Where to write errors, ``sys.stderr`` by default.
+
+    :return: The exit code.
+    """
+    streams = {_STDOUT: stdout or sys.stdout, _STDERR: stderr or sys.stderr}
+    env = {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ}
+    if streams[_STDOUT].isatty() and not env.keys() & {"FORCE_COLOR", "NO_COLOR"}:
+        env["FORCE_COLOR"] = "1"
+        env.setdefault("COLUMNS", str(os.get_terminal_size().columns))
+    message = {"argv": list(argv), "cwd": str(Path.cwd()), "env": env}
+
+    decoders = {k: codecs.getincrementaldecoder("utf-8")() for k in streams}
+    with _send(path, message) as f:
+        while header := f.read(_HEADER.size):
+            channel, size = _HEADER.unpack(header)
+            data = f.read(size)
+            if channel == _EXIT:
+                return int(data)
+            streams[channel].write(decoders[channel].decode(data))
+            streams[channel].flush()
+
+    msg = "The repo-review daemon closed the connection without an exit code"
+    raise ConnectionError(msg)
+
+
+def shutdown(path: str | os.PathLike[str] | None = None) -> None:
+    """
+    Ask the server to stop. Running forked requests are not interrupted.
+
+    :param path: The socket, see :func:`default_socket_path` for the default.
+    """
+    with _send(path, {"shutdown": True}) as f:
+        f.read()
+
+
+def client_main(args: Sequence[str] | None = None) -> None:
+    """
+    The ``repo-review-client`` command. Takes the same arguments as
+    ``repo-review``, or ``--shutdown`` to stop the server.
+    """
+    argv = sys.argv[1:] if args is None else list(args)
+    path = default_socket_path()
+    try:
+        if argv == ["--shutdown"]:
+            shutdown(path)
+            return
+        code = request(argv, path=path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        msg = f"No repo-review daemon at {path}, start one with `repo-review --daemon`"
+        print(f"Error: {msg}", file=sys.stderr)
+        raise SystemExit(1) from None
+    except PermissionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise SystemExit(1) from None
+    if code:
+        raise SystemExit(code)
+
+
+if __name__ == "__main__":
+    client_main()
@@ -0,0 +1,351 @@
+"""
+Compare two refs of a repo, running only the checks whose inputs changed.
+
+``repo-review-diff BASE..HEAD [REPO]`` (or ``python -m repo_review.diff``)
+compares two refs of a local git repo (the current directory by default), and
+``repo-review-diff gh:org/repo@BASE..HEAD[:path]`` compares two refs on
+GitHub. Both trees are
+listed without checking anything out (see :mod:`repo_review.gittree`), and
+files are read by blob SHA through one cache, so a file that is the same in
+both refs is only read once.
+
+The base is reviewed in full, recording the files (and directory listings)
+each fixture and check looks at. A check is only run again on the head if
+something it looked at, directly or through the fixtures it uses, differs
+between the trees; otherwise its base result is reused. The output lists the
+checks whose result flipped.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.checks",
+    f"{__spec__.parent}.fixtures",
+    f"{__spec__.parent}.gittree",
+    f"{__spec__.parent}.processor",
+    "argparse",
+    "functools",
+    "json",
+    "subprocess",
+    "sys",
+]
+
+import argparse
+import functools
+import json
+import subprocess
+import sys
+import urllib.error
+from typing import NamedTuple
+
+from ._timer import record_durations
+from .checks import _is_batch
+from .fixtures import _parameter_names, collect_fixtures
+from .gittree import git_tree, github_tree
+from .processor import (
+    ExecutionPlan,
+    _iter_run,
+    _prepare,
+    _result_dict,
+    collect_all,
+    process,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
+
+    from .checks import Check
+    from .families import Family
+    from .gittree import TreePath, _Tree
+    from .processor import Result, _CheckReturn
+
+__all__ = ["Change", "DiffReturn", "diff", "main"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+class Change(NamedTuple):
+    """
+    A check whose result differs between the two refs.
+
+    .. versionadded:: 1.3
+    """
+
+    name: str  #: The check name
+    base: Result | None  #: The result on the base, None if it wasn't reported
+    head: Result | None  #: The result on the head, None if it wasn't reported
+
+
+class DiffReturn(NamedTuple):
+    """
+    Return type for :func:`diff`.
+
+    .. versionadded:: 1.3
+    """
+
+    families: dict[str, Family]  #: The families of the head
+    changes: list[Change]  #: The checks that flipped, in family order
+    rerun: list[str]  #: The checks that were run on the head
+
+
+def _dirty_checks(base: _Tree, head: _Tree, checks: Mapping[str, Check]) -> set[str]:
+    """
+    The checks that might give a different result on the head: the ones that
+    looked at something that changed, or use a fixture that did.
+    """
+
+    def changed(section: tuple[str, str] | None) -> bool:
+        return any(
+            base.signature(access) != head.signature(access)
+            for access in base.accessed.get(section, ())
+        )
+
+    # Something was read outside of any fixture or check
+    if changed(None):
+        return set(checks)
+
+    fixtures = collect_fixtures()
+
+    @functools.cache
+    def fixture_changed(name: str) -> bool:
+        func = fixtures.get(name)
+        # root and package look at nothing until they are used
+        if func is None:
+            return False
+        return changed(("fixture", name)) or any(
+            fixture_changed(dep) for dep in _parameter_names(func)
+        )
+
+    return {
+        name
+        for name, check in checks.items()
+        # Batch checks get all the fixtures
+        if _is_batch(check)
+        or changed(("check", name))
+        or any(fixture_changed(f) for f in _parameter_names(check.check))
+    }
+
+
+def _check_return(result: Result) -> _CheckReturn | None:
+    if result.skip_reason or result.duration is None:
+        return None
+    if result.result is None:
+        return None, result.duration
+    return ("" if result.result else result.err_msg), result.duration
+
+
+def diff(
+    base: TreePath,
+    head: TreePath,
+    *,
+    subdir: str = "",
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+) -> DiffReturn:
+    """
+    Review the base in full, then only run the checks on the head whose inputs
+    changed, and return the checks whose result flipped. The trees should
+    share a cache (see :func:`~repo_review.gittree.git_tree`), and the
+    selection works like :func:`~repo_review.processor.process`.
+
+    :param base: The tree to compare against.
+    :param head: The tree with the changes.
+    :param subdir: The path to the package in both trees.
+    :param select: A list of checks to select. All checks selected if empty.
+    :param ignore: A list of checks to ignore.
+    :param extend_select: Checks to select in addition to the configured ones.
+    :param extend_ignore: Checks to ignore in addition to the configured ones.
+
+    .. versionadded:: 1.3
+    """
+    with record_durations() as base_timings:
+        _, base_results = process(
+            base,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+            subdir=subdir,
+        )
+    ran = {t.name for t in base_timings if t.kind == "check"}
+
+    collected = collect_all(head, subdir)
+    plan = ExecutionPlan.compile(
+        collected,
+        select=select,
+        ignore=ignore,
+        extend_select=extend_select,
+        extend_ignore=extend_ignore,
+    )
+    dirty = _dirty_checks(base._tree, head._tree, plan.checks)  # noqa: SLF001
+    reused = {
+        r.name: ret
+        for r in base_results
+        if r.name in ran
+        and r.name not in dirty
+        and (ret := _check_return(r)) is not None
+    }
+
+    run = _prepare(
+        head,
+        select=frozenset(),
+        ignore=frozenset(),
+        extend_select=frozenset(),
+        extend_ignore=frozenset(),
+        subdir=subdir,
+        collected=collected,
+        plan=plan,
+        check_timeout=None,
+        timeout=None,
+        max_failures=0,
+        costs=None,
+        fixture_workers=1,
+    )
+    with record_durations() as head_timings:
+        head_results = plan.sort(_iter_run(run._replace(batch=reused)))
+
+    base_by_name = {r.name: r for r in base_results}
+    changes = []
+    for result in head_results:
+        before = base_by_name.pop(result.name, None)
+        if before is None or before.result != result.result:
+            changes.append(Change(result.name, before, result))
+    changes += [Change(name, r, None) for name, r in base_by_name.items()]
+
+    rerun = [t.name for t in head_timings if t.kind == "check"]
+    return DiffReturn(plan.families, changes, rerun)
+
+
+def _parse(spec: str) -> tuple[str | None, str, str, str]:
+    """
+    Split ``[gh:org/repo@]BASE..HEAD[:path]`` into the GitHub repo (None for
+    local), the refs, and the path.
+    """
+    repo = None
+    path = ""
+    if spec.startswith("gh:"):
+        repo, _, spec = spec.removeprefix("gh:").partition("@")
+        spec, _, path = spec.partition(":")
+    base, sep, head = spec.partition("..")
+    if not sep or not base or not head or head.startswith("."):
+        msg = f"expected [gh:org/repo@]BASE..HEAD[:path], got {spec!r}"
+        raise ValueError(msg)
+    return repo, base, head, path
+
+
+def _describe(result: Result | None) -> str:
+    if result is None:
+        return "not reported"
+    return {True: "passed", False: "failed", None: "skipped"}[result.result]
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """
+    The ``repo-review-diff`` command. Exits with 3 if a check started failing.
+    """
+    parser = argparse.ArgumentParser(
+        prog="repo-review-diff",
+        description="Show the checks whose result differs between two refs, running only the checks whose inputs changed.",
+    )
+    parser.add_argument("refs", help="BASE..HEAD, or gh:org/repo@BASE..HEAD[:path]")
+    parser.add_argument(
+        "repo", nargs="?", default=".", help="The local git repo, for local refs"
+    )
+    parser.add_argument(
+        "--format", dest="format_opt", choices=["rich", "json"], default="rich"
+    )
+    parser.add_argument("--select", default="", help="Checks to run, comma separated.")
+    parser.add_argument("--ignore", default="", help="Checks to ignore.")
+    parser.add_argument("--extend-select", default="", help="Checks to add.")
+    parser.add_argument("--extend-ignore", default="", help="More checks to ignore.")
+    parser.add_argument("--package-dir", "-p", default="", help="Path to package.")
+    parsed = parser.parse_args(args)
+
+    try:
+        repo, base_ref, head_ref, path = _parse(parsed.refs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    cache: dict[str, bytes] = {}
+    try:
+        if repo is None:
+            base = git_tree(base_ref, parsed.repo, cache=cache)
+            head = git_tree(head_ref, parsed.repo, cache=cache)
+        else:
+            base = github_tree(repo, base_ref, cache=cache).joinpath(path)
+            head = github_tree(repo, head_ref, cache=cache).joinpath(path)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: {e.stderr.decode().strip()}", file=sys.stderr)
+        raise SystemExit(1) from None
+    except urllib.error.HTTPError as e:
+        print(f"Error: accessing {e.url}: {e}", file=sys.stderr)
+        raise SystemExit(1) from None
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise SystemExit(1) from None
+
+    def codes(value: str) -> frozenset[str]:
+        return frozenset(x.strip() for x in value.split(",") if x.strip())
+
+    families, changes, rerun = diff(
+        base,
+        head,
+        subdir=parsed.package_dir,
+        select=codes(parsed.select),
+        ignore=codes(parsed.ignore),
+        extend_select=codes(parsed.extend_select),
+        extend_ignore=codes(parsed.extend_ignore),
+    )
+
+    if parsed.format_opt == "json":
+        output = {
+            "base": str(base),
+            "head": str(head),
+            "rerun": rerun,
+            "changes": {
+                c.name: {
+                    "base": c.base and _result_dict(c.base),
+                    "head": c.head and _result_dict(c.head),
+                }
+                for c in changes
+            },
+        }
+        print(json.dumps(output, indent=2))
+    else:
+        import rich  # noqa: PLC0415
+        import rich.markup  # noqa: PLC0415
+
+        for change in changes:
+            result = change.head or change.base
+            assert result is not None
+            family = families.get(result.family, {}).get("name", result.family)
+            rich.print(
+                f"[bold]{change.name}[/bold] ({rich.markup.escape(family)}): "
+                f"{rich.markup.escape(result.description)}: "
+                f"{_describe(change.base)} → [bold]{_describe(change.head)}[/bold]"
+            )
+            if change.head is not None and change.head.err_msg:
+                rich.print(rich.markup.escape(change.head.err_msg.strip()))
+        rich.print(
+            f"[dim]{len(changes)} changed, {len(rerun)} checks run again on {head}"
+        )
+
+    if any(
+        c.head is not None
+        and c.head.result is False
+        and (c.base is None or c.base.result is not False)
+        for c in changes
+    ):
+        raise SystemExit(3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Executors for reviewing many repos in parallel in one process.
+
+On Python 3.14+, each review can run in a subinterpreter from
+:class:`concurrent.futures.InterpreterPoolExecutor`, so plugins that hold the
+GIL or keep global state don't interfere with each other. Otherwise, a
+:class:`~concurrent.futures.ThreadPoolExecutor` is used. Reviews are
+submitted as :func:`review` with a string target, and return plain
+:class:`~repo_review.processor.ResultDict` data, which can be passed between
+interpreters.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.ghpath",
+    f"{__spec__.parent}.processor",
+    "concurrent.futures",
+    "pathlib",
+    "sys",
+]
+
+import concurrent.futures
+import sys
+from pathlib import Path
+from typing import Literal
+
+from .ghpath import GHPath, _parse_remote
+from .processor import as_simple_dict, process
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ._compat.importlib.resources.abc import Traversable
+    from .processor import ResultDict
+
+__all__ = ["Backend", "get_executor", "interpreters_available", "review"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+Backend = Literal["auto", "interpreters", "threads"]
+
+
+def interpreters_available() -> bool:
+    """
+    True if :class:`concurrent.futures.InterpreterPoolExecutor` can be used
+    (Python 3.14+, and not WebAssembly).
+    """
+    return sys.platform not in {"emscripten", "wasi"} and hasattr(
+        concurrent.futures, "InterpreterPoolExecutor"
+    )
+
+
+def get_executor(
+    max_workers: int | None = None, *, backend: Backend = "auto"
+) -> concurrent.futures.Executor:
+    """
+    Make an executor to submit :func:`review` to.
+
+    :param max_workers: The number of interpreters or threads.
+    :param backend: ``"interpreters"`` requires subinterpreter support,
+                    ``"threads"`` always uses threads, and ``"auto"`` uses
+                    subinterpreters if they are available, otherwise threads.
+
+    :return: The executor; use it as a context manager.
+    """
+    if backend == "interpreters" and not interpreters_available():
+        msg = "subinterpreters require Python 3.14+ (concurrent.interpreters)"
+        raise RuntimeError(msg)
+    if backend != "threads" and interpreters_available():
+        return concurrent.futures.InterpreterPoolExecutor(max_workers)  # type: ignore[attr-defined,no-any-return]
+    return concurrent.futures.ThreadPoolExecutor(max_workers)
+
+
+def _open_target(target: str) -> Traversable:
+    remote = _parse_remote(target)
+    if remote is None:
+        return Path(target)
+    repo, branch, path = remote
+    return GHPath(repo=repo, branch=branch, path=path)
+
+
+def review(
+    target: str,
+    *,
+    subdir: str = "",
+    select: Iterable[str] = (),
+    ignore: Iterable[str] = (),
+    extend_select: Iterable[str] = (),
+    extend_ignore: Iterable[str] = (),
+) -> dict[str, ResultDict]:
+    """
+    Review one repo and return the results as plain data. Only strings go in
+    and plain data comes out, so this can run in a subinterpreter, thread,
+    or process.
+
+    :param target: A local path or ``gh:org/repo[@branch][:path]``.
+    :param subdir: The path to the package inside the repo.
+    :param select: Checks to select, see :func:`~repo_review.processor.process`.
+    :param ignore: Checks to ignore.
+    :param extend_select: Checks to select in addition to the configured ones.
+    :param extend_ignore: Checks to ignore in addition to the configured ones.
+
+    :return: The results, keyed by check name, in family order.
+    """
+    _, results = process(
+        _open_target(target),
+        subdir=subdir,
+        select=frozenset(select),
+        ignore=frozenset(ignore),
+        extend_select=frozenset(extend_select),
+        extend_ignore=frozenset(extend_ignore),
+    )
+    return as_simple_dict(results)
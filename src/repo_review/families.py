@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}.fixtures", "importlib", "importlib.metadata"]
+__lazy_modules__ = [
+    f"{__spec__.parent}._timer",
+    f"{__spec__.parent}.fixtures",
+    "importlib",
+    "importlib.metadata",
+]
 
 import importlib.metadata
 import typing
 from typing import Any
 
-from .fixtures import apply_fixtures
+from ._timer import Stopwatch
+from .fixtures import _func_name, apply_fixtures
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
@@ -56,11 +62,11 @@ def collect_families(fixtures: Mapping[str, Any]) -> dict[str, Family]:
         for ep in importlib.metadata.entry_points(group="repo_review.families")
     )
 
-    return {
-        k: v
-        for func in family_functions
-        for k, v in apply_fixtures(fixtures, func).items()
-    }
+    collected: dict[str, Any] = {}
+    for func in family_functions:
+        with Stopwatch("family", _func_name(func)):
+            collected.update(apply_fixtures(fixtures, func))
+    return collected
 
 
 def get_family_name(families: Mapping[str, Family], family: str) -> str:
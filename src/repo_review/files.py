@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import importlib.metadata
 import logging
 import sys
@@ -75,6 +74,8 @@ async def process_prefetch_files(
     empty).
     """
     if sys.version_info >= (3, 11):
+        import asyncio  # noqa: PLC0415
+
         with log_timer(logger, "Prefetching files for %s", start):
             async with asyncio.TaskGroup() as tg:
                 for key, patterns in files.items():
@@ -2,20 +2,33 @@ from __future__ import annotations
 
 __lazy_modules__ = [
     f"{__spec__.parent}._compat",
+    f"{__spec__.parent}._timer",
     f"{__spec__.parent}.ghpath",
+    "concurrent.futures",
+    "contextlib",
+    "contextvars",
+    "copy",
     "graphlib",
     "importlib",
     "importlib.metadata",
     "inspect",
 ]
 
+import concurrent.futures
+import contextlib
+import contextvars
+import copy
 import graphlib
 import importlib.metadata
 import inspect
+import sys
+import threading
 import typing
+import weakref
 from typing import Any
 
 from ._compat import tomllib
+from ._timer import Stopwatch
 from .ghpath import EmptyTraversable
 
 TYPE_CHECKING = False
@@ -27,6 +40,7 @@ if TYPE_CHECKING:
 
 __all__ = [
     "apply_fixtures",
+    "clear_session_fixtures",
     "collect_fixtures",
     "compute_fixtures",
     "list_all",
@@ -67,10 +81,130 @@ def list_all(root: Traversable) -> bool:
     return isinstance(root, EmptyTraversable)
 
 
+#: Values of session-scoped fixtures, keyed by the fixture function.
+_session_values: dict[Callable[..., Any], Any] = {}
+#: A private copy of each session value, keyed by the id of the shared value,
+#: to catch checks that modify it.
+_session_originals: dict[int, Any] = {}
+#: One lock per session fixture, so unrelated ones are computed concurrently.
+_session_locks: dict[Callable[..., Any], threading.Lock] = {}
+_session_locks_lock = threading.Lock()
+
+
+def _scope(func: Callable[..., Any]) -> str:
+    scope: str = getattr(func, "scope", "repo")
+    if scope not in {"repo", "session"}:
+        msg = f"fixture scope must be 'repo' or 'session', not {scope!r}"
+        raise ValueError(msg)
+    return scope
+
+
+def _session_value(func: Callable[..., Any], kwargs: Mapping[str, Any]) -> Any:
+    if func in _session_values:
+        return _session_values[func]
+    with _session_locks_lock:
+        lock = _session_locks.setdefault(func, threading.Lock())
+    with lock:
+        if func not in _session_values:
+            value = func(**kwargs)
+            _session_originals[id(value)] = copy.deepcopy(value)
+            _session_values[func] = value
+        return _session_values[func]
+
+
+def _pristine(value: Any) -> Any:
+    """
+    The value as it was computed: the private copy for a session value, or the
+    value itself otherwise.
+    """
+    return _session_originals.get(id(value), value)
+
+
+def _is_session_value(value: Any) -> bool:
+    return id(value) in _session_originals
+
+
+def clear_session_fixtures() -> None:
+    """
+    Forget the values of session-scoped fixtures, so they are computed again
+    for the next repository. Useful in tests, or after changing a file a
+    session fixture reads.
+
+    .. versionadded:: 1.3
+    """
+    with _session_locks_lock:
+        _session_values.clear()
+        _session_originals.clear()
+        _session_locks.clear()
+
+
+def _evaluate(
+    name: str, func: Callable[..., Any], kwargs: Mapping[str, Any], *, session: bool
+) -> Any:
+    with Stopwatch("fixture", name):
+        return _session_value(func, kwargs) if session else func(**kwargs)
+
+
+def _compute_concurrently(
+    graph: Mapping[str, AbstractSet[str]],
+    fixtures: dict[str, Any],
+    unevaluated_fixtures: Mapping[str, Callable[..., Any]],
+    session: AbstractSet[str],
+    workers: int,
+) -> None:
+    order = {
+        name: i
+        for i, name in enumerate(graphlib.TopologicalSorter(graph).static_order())
+    }
+    ts = graphlib.TopologicalSorter(graph)
+    ts.prepare()
+    errors: dict[str, Exception] = {}
+    running: dict[concurrent.futures.Future[Any], str] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        ready = ts.get_ready()
+        while ready or running:
+            for name in ready:
+                if name in fixtures:
+                    ts.done(name)
+                    continue
+                kwargs = {dep: fixtures[dep] for dep in graph[name]}
+                future = pool.submit(
+                    contextvars.copy_context().run,
+                    _evaluate,
+                    name,
+                    unevaluated_fixtures[name],
+                    kwargs,
+                    session=name in session,
+                )
+                running[future] = name
+            ready = ts.get_ready()
+            if ready or not running:
+                continue
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                name = running.pop(future)
+                try:
+                    fixtures[name] = future.result()
+                except Exception as err:  # noqa: BLE001
+                    # Dependents are never marked ready, everything else runs
+                    errors[name] = err
+                else:
+                    ts.done(name)
+            ready = ts.get_ready()
+
+    # Raise the error a serial evaluation would have hit first
+    if errors:
+        raise errors[min(errors, key=order.__getitem__)]
+
+
 def compute_fixtures(
     root: Traversable,
     package: Traversable,
     unevaluated_fixtures: Mapping[str, Callable[..., Any]],
+    *,
+    workers: int = 1,
 ) -> dict[str, Any]:
     """
     Given the repo ``root`` Traversable, the ``package`` Traversable, and the dict
@@ -80,8 +214,19 @@ def compute_fixtures(
     :param package: The path to the package (``root / subdir``)
     :param unevaluated_fixtures: The unevaluated mapping of fixture names to
                                  callables.
+    :param workers: If more than one, fixtures whose inputs are ready are
+                    computed concurrently on this many threads, which helps
+                    when they read files from a remote repo. If fixtures
+                    fail, the error is the one serial evaluation would raise.
 
     :return: The fully evaluated dict of fixtures.
+
+    Fixtures with a ``scope`` attribute of ``"session"`` are only computed once
+    per process and then shared between repositories; they may only request
+    other session fixtures.
+
+    .. versionchanged:: 1.3
+       Added session-scoped fixtures and ``workers``.
     """
     fixtures: dict[str, Any] = {"root": root, "package": package}
     signatures = {
@@ -96,19 +241,57 @@ def compute_fixtures(
             if name not in graph:
                 msg = f"unknown fixture {name!r} requested by fixture {fixture_name!r}"
                 raise KeyError(msg)
+    session = {
+        name for name, fix in unevaluated_fixtures.items() if _scope(fix) == "session"
+    }
+    for fixture_name in session:
+        for name in signatures[fixture_name].parameters:
+            if name not in session:
+                msg = f"session fixture {fixture_name!r} can't request repo fixture {name!r}"
+                raise ValueError(msg)
+    # Threads are not available in WebAssembly
+    if workers > 1 and sys.platform != "emscripten":
+        _compute_concurrently(graph, fixtures, unevaluated_fixtures, session, workers)
+        return fixtures
+
     ts = graphlib.TopologicalSorter(graph)
     for fixture_name in ts.static_order():
         if fixture_name in {"package", "root"}:
             continue
         func = unevaluated_fixtures[fixture_name]
         kwargs = {name: fixtures[name] for name in signatures[fixture_name].parameters}
-        fixtures[fixture_name] = func(**kwargs)
+        fixtures[fixture_name] = _evaluate(
+            fixture_name, func, kwargs, session=fixture_name in session
+        )
     return fixtures
 
 
 T = typing.TypeVar("T")
 
 
+def _func_name(func: Callable[..., Any]) -> str:
+    return f"{getattr(func, '__module__', '')}:{getattr(func, '__qualname__', func)}"
+
+
+# Parameter names, keyed by the underlying function, so bound methods of
+# newly collected checks don't need a new signature each time.
+_parameters: weakref.WeakKeyDictionary[Any, tuple[str, ...]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _parameter_names(func: Callable[..., Any]) -> tuple[str, ...]:
+    bound = inspect.ismethod(func)
+    target = func.__func__ if inspect.ismethod(func) else func
+    try:
+        names = _parameters[target]
+    except (KeyError, TypeError):
+        names = tuple(inspect.signature(target).parameters)
+        with contextlib.suppress(TypeError):
+            _parameters[target] = names
+    return names[1:] if bound else names
+
+
 def apply_fixtures(fixtures: Mapping[str, Any], func: Callable[..., T]) -> T:
     """
     Given the pre-computed dict of fixtures and a function, fill in any
@@ -117,9 +300,8 @@ def apply_fixtures(fixtures: Mapping[str, Any], func: Callable[..., T]) -> T:
     :param fixtures: Fully evaluated dict of fixtures.
     :param func: Some callable that can take fixtures.
     """
-    signature = inspect.signature(func)
     kwargs = {
-        name: value for name, value in fixtures.items() if name in signature.parameters
+        name: fixtures[name] for name in _parameter_names(func) if name in fixtures
     }
     return func(**kwargs)
 
@@ -19,7 +19,9 @@ import io
 import json
 import logging
 import sys
+import threading
 import typing
+import weakref
 from typing import Literal
 
 from ._compat.importlib.resources.abc import Traversable
@@ -41,6 +43,22 @@ def __dir__() -> list[str]:
 logger = logging.getLogger(__name__)
 
 
+# One lock per URL being fetched, so concurrent reads of the same file share a
+# single download without serializing unrelated downloads.
+_url_locks: weakref.WeakValueDictionary[str, threading.Lock] = (
+    weakref.WeakValueDictionary()
+)
+_url_locks_lock = threading.Lock()
+
+
+def _url_lock(url: str) -> threading.Lock:
+    with _url_locks_lock:
+        lock = _url_locks.get(url)
+        if lock is None:
+            lock = _url_locks[url] = threading.Lock()
+        return lock
+
+
 def _glob_match(pattern_parts: list[str], path_parts: list[str]) -> bool:
     """
     Match path components against glob pattern components, like
@@ -61,6 +79,19 @@ def _glob_match(pattern_parts: list[str], path_parts: list[str]) -> bool:
     )
 
 
+def _parse_remote(target: str) -> tuple[str, str, str] | None:
+    """
+    Split ``gh:org/repo[@branch][:path]`` into the repo, branch, and path.
+    Returns None for local paths.
+    """
+    if not target.startswith("gh:"):
+        return None
+
+    _, org_repo_branch, *path = target.split(":", maxsplit=2)
+    org_repo, _, branch = org_repo_branch.partition("@")
+    return org_repo, branch or "HEAD", path[0] if path else ""
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class GHPath(Traversable):
     """
@@ -75,7 +106,8 @@ class GHPath(Traversable):
     :param _info: Some internal info stored to keep accesses fast.
 
     Making new paths from this path will propagate the `_fetched`
-    dict.
+    dict. Paths can be read from multiple threads; a file is only downloaded
+    once even if several threads request it at the same time.
     """
 
     #: The repository name, in `"org/repo"` style.
@@ -123,6 +155,19 @@ class GHPath(Traversable):
             with log_timer(logger, "Fetching %s", url):
                 return pyodide.http.open_url(url).read()
 
+        return GHPath.open_url_bytes(url).decode("utf-8")
+
+    @staticmethod
+    def open_url_bytes(url: str) -> bytes:
+        """
+        Like :meth:`open_url`, without decoding the response. On WebAssembly,
+        this is the text from :meth:`open_url`, encoded as UTF-8.
+
+        .. versionadded:: 1.3
+        """
+        if sys.platform == "emscripten":
+            return GHPath.open_url(url).encode("utf-8")
+
         import urllib.request  # noqa: PLC0415
 
         with (
@@ -131,7 +176,7 @@ class GHPath(Traversable):
         ):
             ret: bytes = response.read()
 
-        return ret.decode("utf-8")
+        return ret
 
     def __post_init__(self) -> None:
         if not self._info:
@@ -189,18 +234,27 @@ class GHPath(Traversable):
         :param encoding: The encoding, only ``"utf-8"`` or ``None`` supported.
         """
         assert encoding is None or encoding == "utf-8", "Only utf-8 is supported"
-        url = f"https://raw.githubusercontent.com/{self.repo}/{self.branch}/{self.path}"
-        if url not in self._fetched:
-            logger.debug("Cache miss for %r; fetching.", url)
-            self._fetched[url] = self.open_url(url)
+        text = self._fetch()
 
         if mode == "r":
-            return io.StringIO(self._fetched[url])
+            return io.StringIO(text)
         if mode == "rb":
-            return io.BytesIO(self._fetched[url].encode("utf-8"))
+            return io.BytesIO(text.encode("utf-8"))
 
         assert_never(mode)
 
+    def _fetch(self) -> str:
+        url = self._url
+        text = self._fetched.get(url)
+        if text is not None:
+            return text
+        with _url_lock(url):
+            text = self._fetched.get(url)
+            if text is None:
+                logger.debug("Cache miss for %r; fetching.", url)
+                text = self._fetched[url] = self.open_url(url)
+        return text
+
     def _with_path(self, path: str) -> GHPath:
         return GHPath(
             repo=self.repo,
@@ -0,0 +1,272 @@
+# pylint: disable=arguments-differ
+
+"""
+Traversables for a git tree at some ref, listed up front (like ``git ls-tree``)
+without checking anything out. Files are read by blob SHA through a cache that
+several trees can share, so a file that is the same in two refs is only read
+once. Every read is recorded under the fixture or check doing it (see
+:func:`~repo_review._timer.current_section`), which :mod:`repo_review.diff`
+uses to find the checks whose inputs changed.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.ghpath",
+    "io",
+    "json",
+    "pathlib",
+    "subprocess",
+]
+
+import dataclasses
+import io
+import json
+import subprocess
+import threading
+import typing
+from pathlib import Path
+from typing import Literal, NamedTuple
+
+from ._compat.importlib.resources.abc import Traversable
+from ._compat.typing import Self, assert_never
+from ._timer import current_section
+from .ghpath import GHPath
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterator, Mapping
+    from typing import Any
+
+__all__ = ["TreePath", "git_tree", "github_tree"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+class _Entry(NamedTuple):
+    kind: str  # "blob", "tree", or "commit" for a submodule
+    sha: str
+
+
+#: What a fixture or check looked at: ``"read"`` a file, ``"stat"`` a path
+#: (is_file or is_dir), or ``"list"`` a directory, and the path.
+_Access = tuple[Literal["read", "stat", "list"], str]
+
+
+class _Tree:
+    """
+    The entries of one tree, how to read its blobs, and what was accessed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        entries: Mapping[str, _Entry],
+        fetch: Callable[[str, str], bytes],
+        cache: dict[str, bytes],
+    ) -> None:
+        self.name = name
+        self.label = label
+        self.entries = dict(entries)
+        self.children: dict[str, dict[str, str]] = {"": {}}
+        for path, entry in entries.items():
+            parent, _, child = path.rpartition("/")
+            self.children.setdefault(parent, {})[child] = entry.kind
+        self.fetch = fetch
+        self.cache = cache
+        self.accessed: dict[tuple[str, str] | None, set[_Access]] = {}
+        self._lock = threading.Lock()
+
+    def entry(self, path: str) -> _Entry | None:
+        return _Entry("tree", "") if not path else self.entries.get(path)
+
+    def record(self, access: _Access) -> None:
+        section = current_section()
+        with self._lock:
+            self.accessed.setdefault(section, set()).add(access)
+
+    def signature(self, access: _Access) -> object:
+        """
+        Equal in two trees if the access sees the same thing in both.
+        """
+        op, path = access
+        entry = self.entry(path)
+        if op == "read":
+            return entry
+        if op == "stat":
+            return entry and entry.kind
+        return entry and entry.kind, self.children.get(path, {})
+
+    def read(self, path: str) -> bytes:
+        entry = self.entry(path)
+        if entry is None or entry.kind != "blob":
+            msg = f"{self.label}:{path}"
+            raise FileNotFoundError(msg)
+        # Fetching the same blob twice at once is harmless, so there's no lock
+        data = self.cache.get(entry.sha)
+        if data is None:
+            data = self.cache[entry.sha] = self.fetch(entry.sha, path)
+        return data
+
+
+@dataclasses.dataclass(frozen=True)
+class TreePath(Traversable):
+    """
+    A path in a git tree, made by :func:`git_tree` or :func:`github_tree`.
+    Trees are immutable, so copies are the same object.
+    """
+
+    _tree: _Tree = dataclasses.field(repr=False)
+
+    #: A path inside the tree
+    path: str = ""
+
+    def __str__(self) -> str:
+        return f"{self._tree.label}:{self.path or '.'}"
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        return self
+
+    @property
+    def name(self) -> str:
+        """
+        The final element of the path or the repo name.
+        """
+        return self.path.rpartition("/")[2] if self.path else self._tree.name
+
+    def joinpath(self, *descendants: str) -> TreePath:
+        parts = [
+            part
+            for path in (self.path, *descendants)
+            for part in str(path).split("/")
+            if part not in {"", "."}
+        ]
+        return TreePath(self._tree, "/".join(parts))
+
+    def __truediv__(self, child: str) -> TreePath:
+        return self.joinpath(child)
+
+    def iterdir(self) -> Iterator[TreePath]:
+        self._tree.record(("list", self.path))
+        if not self._kind("tree"):
+            raise NotADirectoryError(str(self))
+        for child in sorted(self._tree.children.get(self.path, {})):
+            yield self.joinpath(child)
+
+    def _kind(self, kind: str) -> bool:
+        entry = self._tree.entry(self.path)
+        return entry is not None and entry.kind == kind
+
+    def is_dir(self) -> bool:
+        self._tree.record(("stat", self.path))
+        return self._kind("tree")
+
+    def is_file(self) -> bool:
+        self._tree.record(("stat", self.path))
+        return self._kind("blob")
+
+    @typing.overload  # type: ignore[override]
+    def open(self, mode: Literal["r"], encoding: str | None = ...) -> io.StringIO: ...
+
+    @typing.overload
+    def open(self, mode: Literal["rb"]) -> io.BytesIO: ...
+
+    def open(
+        self, mode: Literal["r", "rb"] = "r", encoding: str | None = "utf-8"
+    ) -> io.IOBase:
+        """
+        Open a file, only ``"r"`` and ``"rb"`` are supported.
+        """
+        if mode == "r":
+            return io.StringIO(self.read_text(encoding))
+        if mode == "rb":
+            return io.BytesIO(self.read_bytes())
+        assert_never(mode)
+
+    def read_bytes(self) -> bytes:
+        self._tree.record(("read", self.path))
+        return self._tree.read(self.path)
+
+    def read_text(self, encoding: str | None = "utf-8") -> str:
+        return self.read_bytes().decode(encoding or "utf-8")
+
+
+def _git(repo: Path, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, check=True
+    ).stdout
+
+
+def git_tree(
+    ref: str,
+    repo: str | os.PathLike[str] = ".",
+    *,
+    cache: dict[str, bytes] | None = None,
+) -> TreePath:
+    """
+    The tree of a ref in a local git repo.
+
+    :param ref: A branch, tag, commit, or anything else ``git`` takes.
+    :param repo: A path in the repo.
+    :param cache: Blob contents by SHA, shared with other trees.
+
+    :raises subprocess.CalledProcessError: If ``git`` fails, like for a bad ref.
+    """
+    repo_path = Path(repo)
+    listing = _git(repo_path, "ls-tree", "-r", "-t", "-z", "--full-tree", ref)
+    entries = {}
+    for item in listing.split(b"\0"):
+        if item:
+            meta, _, path = item.partition(b"\t")
+            _, kind, sha = meta.decode().split()
+            entries[path.decode()] = _Entry(kind, sha)
+
+    def fetch(sha: str, _path: str) -> bytes:
+        return _git(repo_path, "cat-file", "blob", sha)
+
+    tree = _Tree(
+        repo_path.resolve().name, ref, entries, fetch, {} if cache is None else cache
+    )
+    return TreePath(tree)
+
+
+def github_tree(
+    repo: str, ref: str, *, cache: dict[str, bytes] | None = None
+) -> TreePath:
+    """
+    The tree of a ref of a GitHub repo, listed with :meth:`GHPath.open_url
+    <repo_review.ghpath.GHPath.open_url>`, with the files fetched by
+    :meth:`GHPath.open_url_bytes <repo_review.ghpath.GHPath.open_url_bytes>`.
+
+    :param repo: The repo, in ``"org/repo"`` form.
+    :param ref: A branch, tag, or commit.
+    :param cache: Blob contents by SHA, shared with other trees.
+
+    :raises RuntimeError: If the tree is too large for GitHub to list in full.
+    """
+    url = f"https://api.github.com/repos/{repo}/git/trees/{ref}?recursive=1"
+    info = json.loads(GHPath.open_url(url))
+    # A partial listing would make missing files look unchanged
+    if info.get("truncated"):
+        msg = f"GitHub truncated the tree of {repo}@{ref}, it is too large to list"
+        raise RuntimeError(msg)
+    entries = {d["path"]: _Entry(d["type"], d["sha"]) for d in info["tree"]}
+
+    def fetch(_sha: str, path: str) -> bytes:
+        raw = f"https://raw.githubusercontent.com/{repo}/{ref}/{path}"
+        return GHPath.open_url_bytes(raw)
+
+    tree = _Tree(
+        repo.rpartition("/")[2],
+        f"gh:{repo}@{ref}",
+        entries,
+        fetch,
+        {} if cache is None else cache,
+    )
+    return TreePath(tree)
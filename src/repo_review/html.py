@@ -45,10 +45,14 @@ def to_html(
     out = io.StringIO()
     print = functools.partial(builtins.print, file=out)
 
+    by_family: dict[str, list[Result]] = {}
+    for r in processed:
+        by_family.setdefault(r.family, []).append(r)
+
     for family in sort_family_keys(families):
         family_name = get_family_name(families, family)
         family_description = get_family_description(families, family)
-        family_results = [r.md_as_html() for r in processed if r.family == family]
+        family_results = [r.md_as_html() for r in by_family.get(family, [])]
         if family_results or family_description:
             print(f"<h3>{family_name}</h3>")
         if family_description:
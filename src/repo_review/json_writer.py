@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.families",
+    f"{__spec__.parent}.processor",
+    "json",
+]
+
+import json
+
+from .families import Family, sort_family_keys
+from .processor import Result, Timing, _result_dict
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from typing import Any, TextIO
+
+    from .__main__ import Status
+    from ._compat.typing import Self
+
+__all__ = ["JSONWriter"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+class JSONWriter:
+    """
+    Write reports as JSON to a stream, one check at a time, so memory use
+    doesn't grow with the number of checks or repos. The output is the same
+    as ``json.dumps(report, indent=2)``, or has no whitespace if ``compact``.
+    With ``multi``, reports are written as an object keyed by their header,
+    which is closed by :meth:`close` (or leaving the ``with`` block). With
+    ``lines``, each report is written as one compact line (JSON Lines), with
+    the header under a ``"package"`` key.
+
+    :param stream: The text stream to write to.
+    :param compact: Write without newlines or indentation.
+    :param multi: Write several reports keyed by header.
+    :param lines: Write each report as a line, ignores ``compact`` and ``multi``.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        *,
+        compact: bool = False,
+        multi: bool = False,
+        lines: bool = False,
+    ) -> None:
+        self.stream = stream
+        self.compact = compact or lines
+        self.multi = multi and not lines
+        self.lines = lines
+        self._count = 0
+        if self.multi:
+            stream.write("{")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _newline(self, level: int) -> str:
+        return "" if self.compact else "\n" + "  " * level
+
+    def _key(self, key: str) -> str:
+        return json.dumps(key) + (":" if self.compact else ": ")
+
+    def _value(self, obj: Any, level: int) -> str:
+        if self.compact:
+            return json.dumps(obj, separators=(",", ":"))
+        return json.dumps(obj, indent=2).replace("\n", self._newline(level))
+
+    def write_report(
+        self,
+        families: Mapping[str, Family],
+        results: Iterable[Result],
+        *,
+        status: Status,
+        header: str = "",
+        timings: Iterable[Timing] | None = None,
+    ) -> None:
+        """
+        Write one report: the status, the families (in order), the checks, and
+        optionally the timings. The stream is flushed after each report.
+
+        :param families: The family mapping.
+        :param results: The results, written in the order given.
+        :param status: The overall status of the repo.
+        :param header: The key for this report, required with ``multi``, or the
+                       ``"package"`` value with ``lines``.
+        :param timings: Timings to add under ``"durations"``.
+        """
+        write = self.stream.write
+        level = 1 if self.multi else 0
+        if self.multi:
+            write(("," if self._count else "") + self._newline(1) + self._key(header))
+
+        inner = self._newline(level + 1)
+        sorted_families = {k: families[k] for k in sort_family_keys(families)}
+        write("{" + inner)
+        if self.lines:
+            write(self._key("package") + self._value(header, level + 1) + ",")
+        write(self._key("status") + self._value(status, level + 1))
+        write("," + inner + self._key("families"))
+        write(self._value(sorted_families, level + 1))
+        write("," + inner + self._key("checks") + "{")
+        separator = ""
+        for result in results:
+            write(separator + self._newline(level + 2) + self._key(result.name))
+            write(self._value(_result_dict(result), level + 2))
+            separator = ","
+        write((inner if separator else "") + "}")
+        if timings is not None:
+            durations = [
+                {"kind": kind, "name": name, "wall": d.wall, "cpu": d.cpu}
+                for kind, name, d in timings
+            ]
+            write("," + inner + self._key("durations"))
+            write(self._value(durations, level + 1))
+        write(self._newline(level) + "}")
+        if not self.multi:
+            write("\n")
+        self._count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        """
+        Finish the output of a ``multi`` writer. Does nothing otherwise.
+        """
+        if self.multi:
+            self.stream.write(self._newline(0) + "}\n")
+            self.stream.flush()
+            self.multi = False
@@ -4,44 +4,67 @@ import logging
 
 __lazy_modules__ = [
     "collections",
+    "concurrent",
+    "concurrent.futures",
     "collections.abc",
     "copy",
     f"{__spec__.parent}.checks",
     f"{__spec__.parent}.families",
     f"{__spec__.parent}.fixtures",
     "graphlib",
+    "heapq",
+    "pathlib",
+    "sys",
     "textwrap",
+    "time",
     "warnings",
 ]
 
+import collections
+import concurrent.futures
+import contextvars
 import copy
 import dataclasses
+import functools
 import graphlib
+import heapq
+import pathlib
+import sys
 import textwrap
+import threading
+import time
 import typing
 import warnings
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping, Sequence
 from collections.abc import Set as AbstractSet
 from typing import Any, TypeVar
 
-import markdown_it
-
-from ._timer import log_timer
+from ._timer import Duration, Stopwatch, Timing, log_timer, record_durations
 from .checks import (
+    BatchCheck,
     Check,
+    _is_batch,
+    _per_file_glob,
     collect_checks,
+    compile_selectors,
     get_check_url,
     is_allowed,
-    name_matches,
     process_result_bool,
 )
 from .families import Family, collect_families
-from .fixtures import apply_fixtures, collect_fixtures, compute_fixtures
-from .ghpath import EmptyTraversable
+from .fixtures import (
+    _is_session_value,
+    _parameter_names,
+    _pristine,
+    apply_fixtures,
+    collect_fixtures,
+    compute_fixtures,
+)
+from .ghpath import EmptyTraversable, GHPath, _glob_match
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    import sys
+    import markdown_it
 
     from ._compat.importlib.resources.abc import Traversable
 
@@ -52,13 +75,21 @@ if TYPE_CHECKING:
 
 __all__ = [
     "CollectionReturn",
+    "Duration",
+    "ExecutionPlan",
     "ProcessReturn",
     "Result",
     "ResultDict",
+    "Timing",
     "as_simple_dict",
+    "async_iter_process",
     "collect_all",
+    "iter_process",
     "md_as_html",
     "process",
+    "process_many",
+    "record_durations",
+    "sort_results",
 ]
 
 
@@ -67,17 +98,52 @@ def __dir__() -> list[str]:
 
 
 logger = logging.getLogger(__name__)
-md = markdown_it.MarkdownIt()
+
+
+_local = threading.local()
+
+
+def _markdown() -> markdown_it.MarkdownIt:
+    # Constructed on first use, so importing this module stays cheap. The
+    # parser keeps state while rendering, so each thread gets its own.
+    parser: markdown_it.MarkdownIt | None = getattr(_local, "md", None)
+    if parser is None:
+        import markdown_it  # noqa: PLC0415
+
+        parser = _local.md = markdown_it.MarkdownIt()
+    return parser
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility: the parser used to be created at import time
+    if name == "md":
+        return _markdown()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_markdown(md_text: str) -> str:
+    result: str = _markdown().render(md_text).strip()
+    return result.removeprefix("<p>").removesuffix("</p>").strip()
 
 
 def md_as_html(md_text: str) -> str:
     """
     Helper function that converts markdown text to HTML. Strips paragraph tags from the result.
+    Renders are cached, since the same messages show up for many repos.
 
     :param md_text: The markdown text to convert.
+
+    .. versionchanged:: 1.3
+       Results are cached, and empty strings are not rendered.
     """
-    result: str = md.render(md_text).strip()
-    return result.removeprefix("<p>").removesuffix("</p>").strip()
+    if not md_text:
+        return ""
+    return _render_markdown(md_text)
+
+
+Status = typing.Literal["empty", "passed", "skips", "errors"]
 
 
 class ResultDict(typing.TypedDict):
@@ -92,9 +158,11 @@ class ResultDict(typing.TypedDict):
     err_msg: str  #: The error message if the result is false, in markdown format
     url: str  #: An optional URL (empty string if missing)
     skip_reason: str  #: The reason for the skip, if given (empty string if not)
+    #: The ``wall`` and ``cpu`` time of the check in seconds, None if it did not run
+    duration: dict[str, float] | None
 
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class Result:
     """
     This is the returned value from a processed check.
@@ -107,6 +175,8 @@ class Result:
     skip_reason: str = ""  #: The reason for the skip, if given
     err_msg: str = ""  #: The error message if the result is false, in markdown format
     url: str = ""  #: An optional URL (empty string if missing)
+    #: The time the check took, None if it did not run (not used in comparisons)
+    duration: Duration | None = dataclasses.field(default=None, compare=False)
 
     def err_as_html(self) -> str:
         """
@@ -121,6 +191,8 @@ class Result:
 
         .. versionadded:: 0.12.1
         """
+        if not self.err_msg and not self.skip_reason:
+            return self
         return dataclasses.replace(
             self,
             err_msg=md_as_html(self.err_msg),
@@ -168,10 +240,11 @@ T = TypeVar("T", bound=HasFamily)
 def _sort_by_family(
     families: Mapping[str, Family], dict_has_family: Mapping[str, T]
 ) -> dict[str, T]:
+    order = {name: family.get("order", 0) for name, family in families.items()}
     return dict(
         sorted(
             dict_has_family.items(),
-            key=lambda x: (families[x[1].family].get("order", 0), x[1].family, x[0]),
+            key=lambda x: (order[x[1].family], x[1].family, x[0]),
         )
     )
 
@@ -180,6 +253,8 @@ def _sort_by_family(
 def collect_all(
     root: Traversable | None = None,
     subdir: str = "",
+    *,
+    fixture_workers: int = 1,
 ) -> CollectionReturn:
     """
     Collect all checks. If ``root`` is not passed or ``None``, then checks are
@@ -190,6 +265,9 @@ def collect_all(
     :param root: If passed, this is the root of the repo (for fixture computation).
                  ``None`` will use :class:`~repo_review.ghpath.EmptyTraversable`.
     :param subdir: The subdirectory (for fixture computation).
+    :param fixture_workers: Threads used to compute independent fixtures
+                            concurrently, see
+                            :func:`~repo_review.fixtures.compute_fixtures`.
 
     :return: The collected fixtures, checks, and families. Families is
              guaranteed to include all families and be in order.
@@ -197,6 +275,8 @@ def collect_all(
     .. versionadded:: 0.8
     .. versionchanged:: 1.0
        Now None is supported.
+    .. versionchanged:: 1.3
+       Added ``fixture_workers``.
     """
     if root is None:
         root = EmptyTraversable()
@@ -204,7 +284,9 @@ def collect_all(
 
     # Collect the fixtures
     fixture_functions = collect_fixtures()
-    fixtures = compute_fixtures(root, package, fixture_functions)
+    fixtures = compute_fixtures(
+        root, package, fixture_functions, workers=fixture_workers
+    )
 
     # Collect the checks
     checks = collect_checks(fixtures)
@@ -223,7 +305,741 @@ def collect_all(
     return CollectionReturn(fixtures, checks, families)
 
 
-@log_timer(logger, "Processing checks")
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ExecutionPlan:
+    """
+    Everything about running a set of checks that doesn't depend on the repo
+    being checked: the execution order, the requirements between checks, which
+    checks are reported, and their descriptions and URLs. Compile it once with
+    :meth:`compile` and pass it to :func:`process` (or the iterators) to review
+    many repos that use the same plugins. Checks are referred to by their index
+    in :attr:`names`, and sets of checks are stored as integer bitsets. A plan
+    can be pickled for worker processes if its checks can be.
+
+    .. versionadded:: 1.3
+    """
+
+    checks: dict[str, Check]  #: The checks, in family order
+    families: dict[str, Family]  #: The families, including any missing ones
+    names: tuple[str, ...]  #: The check names, in family (result) order
+    index: dict[str, int]  #: The position of each name in :attr:`names`
+    order: tuple[int, ...]  #: Execution order, respecting ``requires``
+    requires: tuple[int, ...]  #: Bitset of the collected requirements per check
+    dependents: tuple[tuple[int, ...], ...]  #: The checks requiring each check
+    #: The formatted check descriptions, empty for checks that aren't reported
+    descriptions: tuple[str, ...]
+    urls: tuple[str, ...]  #: The formatted check URLs, like :attr:`descriptions`
+    reported: int  #: Bitset of checks that show up in the results
+    skip_reasons: dict[int, str]  #: Ignored checks reported with a reason
+
+    @classmethod
+    def compile(
+        cls,
+        collected: CollectionReturn,
+        *,
+        select: AbstractSet[str] = frozenset(),
+        ignore: AbstractSet[str] = frozenset(),
+        extend_select: AbstractSet[str] = frozenset(),
+        extend_ignore: AbstractSet[str] = frozenset(),
+    ) -> Self:
+        """
+        Compile a plan from a collection run. The selection is combined with
+        ``[tool.repo-review]`` from the collected ``pyproject`` fixture exactly
+        like :func:`process` does.
+
+        :param collected: The return from :func:`collect_all`.
+        :param select: A list of checks to select. All checks selected if empty.
+        :param ignore: A list of checks to ignore.
+        :param extend_select: Checks to select in addition to the config.
+        :param extend_ignore: Checks to ignore in addition to the config.
+        """
+        fixtures, checks, families = collected
+
+        # Collect our own config
+        config = fixtures.get("pyproject", {}).get("tool", {}).get("repo-review", {})
+        ignore_pyproject: list[str] | dict[str, str] = config.get("ignore", [])
+        select_checks = (select or frozenset(config.get("select", ()))) | extend_select
+        skip_checks = (ignore or frozenset(ignore_pyproject)) | extend_ignore
+        reasons = ignore_pyproject if isinstance(ignore_pyproject, dict) else {}
+
+        checks = _sort_by_family(families, checks)
+        names = tuple(checks)
+        index = {name: i for i, name in enumerate(names)}
+
+        # Make a graph of the check's interdependencies
+        graph: dict[str, AbstractSet[str]] = {}
+        for name, check in checks.items():
+            req: object = getattr(check, "requires", frozenset())
+            if not isinstance(req, AbstractSet):
+                msg = f"requires must be a set, got {req!r} for {name!r}"
+                raise TypeError(msg)
+            graph[name] = req
+
+        # A requirement that was not collected is treated as passed, so it's
+        # dropped here.
+        required = [
+            sorted({index[r] for r in graph[name] if r in index}) for name in names
+        ]
+        requires = tuple(sum(1 << r for r in reqs) for reqs in required)
+        dependents: list[list[int]] = [[] for _ in names]
+        for i, reqs in enumerate(required):
+            for r in reqs:
+                dependents[r].append(i)
+
+        # Kahn's algorithm, like graphlib's static_order but on indices
+        waiting = [len(reqs) for reqs in required]
+        ready = collections.deque(i for i, w in enumerate(waiting) if not w)
+        order_list: list[int] = []
+        while ready:
+            i = ready.popleft()
+            order_list.append(i)
+            for d in dependents[i]:
+                waiting[d] -= 1
+                if not waiting[d]:
+                    ready.append(d)
+        if len(order_list) != len(names):
+            cycle = [names[i] for i, w in enumerate(waiting) if w]
+            msg = "nodes are in a cycle"
+            raise graphlib.CycleError(msg, cycle)
+        order = tuple(order_list)
+
+        # Built as a string of bits, setting bits one by one is quadratic
+        reported_bits = bytearray(b"0" * len(names))
+        skip_reasons: dict[int, str] = {}
+        selected = compile_selectors(select_checks)
+        skipped = compile_selectors(skip_checks)
+        with_reasons = compile_selectors(reasons.keys())
+        for i, name in enumerate(names):
+            if is_allowed(selected, skipped, name):
+                reported_bits[i] = ord("1")
+            elif (key := with_reasons.match(name)) and reasons[key]:
+                reported_bits[i] = ord("1")
+                skip_reasons[i] = reasons[key]
+        reported = int(reported_bits[::-1] or b"0", 2)
+
+        # Only the reported checks are formatted, so a check that can't be
+        # formatted (such as a docstring with braces) can still be ignored
+        shown = [bit == ord("1") for bit in reported_bits]
+
+        return cls(
+            checks=checks,
+            families=families,
+            names=names,
+            index=index,
+            order=order,
+            requires=requires,
+            dependents=tuple(tuple(d) for d in dependents),
+            descriptions=tuple(
+                (check.__doc__ or "").format(self=check, name=name).strip()
+                if show
+                else ""
+                for show, (name, check) in zip(shown, checks.items(), strict=True)
+            ),
+            urls=tuple(
+                get_check_url(name, check) if show else ""
+                for show, (name, check) in zip(shown, checks.items(), strict=True)
+            ),
+            reported=reported,
+            skip_reasons=skip_reasons,
+        )
+
+    @functools.cached_property
+    def _reported(self) -> tuple[bool, ...]:
+        bits = f"{self.reported:0{len(self.names)}b}"[::-1]
+        return tuple(b == "1" for b in bits)
+
+    @functools.cached_property
+    def _requires_count(self) -> tuple[int, ...]:
+        return tuple(req.bit_count() for req in self.requires)
+
+    def sort(self, results: Iterable[Result]) -> list[Result]:
+        """
+        Sort results from this plan into family order.
+        """
+        return sorted(results, key=lambda r: self.index[r.name])
+
+
+class _Run(typing.NamedTuple):
+    """
+    A plan plus the per-repo state and settings needed to run it.
+    """
+
+    plan: ExecutionPlan
+    fixtures: dict[str, Any]
+    check_timeout: float | None
+    timeout: float | None
+    max_failures: int
+    costs: Mapping[str, float] | None
+    #: Results of checks that were already run for this repo (batch checks, or
+    #: unchanged checks reused by :func:`repo_review.diff.diff`)
+    batch: Mapping[str, _CheckReturn] | None = None
+
+    def cost(self, i: int) -> float:
+        """
+        The estimated cost of a check: a recorded timing if given, otherwise
+        the check's ``cost`` hint, otherwise 0.
+        """
+        name = self.plan.names[i]
+        if self.costs is not None and name in self.costs:
+            return self.costs[name]
+        return float(getattr(self.plan.checks[name], "cost", 0.0))
+
+    def cost_ordered(self) -> bool:
+        return self.costs is not None or any(
+            hasattr(t, "cost") for t in self.plan.checks.values()
+        )
+
+
+def _prepare(
+    root: Traversable,
+    *,
+    select: AbstractSet[str],
+    ignore: AbstractSet[str],
+    extend_select: AbstractSet[str],
+    extend_ignore: AbstractSet[str],
+    subdir: str,
+    collected: CollectionReturn | None,
+    plan: ExecutionPlan | None,
+    check_timeout: float | None,
+    timeout: float | None,
+    max_failures: int,
+    costs: Mapping[str, float] | None,
+    fixture_workers: int,
+) -> _Run:
+    if plan is None:
+        collected = collected or collect_all(
+            root, subdir, fixture_workers=fixture_workers
+        )
+        plan = ExecutionPlan.compile(
+            collected,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+        )
+        fixtures = collected.fixtures
+    elif select or ignore or extend_select or extend_ignore:
+        msg = "select and ignore settings are part of the plan, don't pass them too"
+        raise ValueError(msg)
+    elif collected is not None:
+        fixtures = collected.fixtures
+    else:
+        package = root.joinpath(subdir) if subdir else root
+        fixtures = compute_fixtures(
+            root, package, collect_fixtures(), workers=fixture_workers
+        )
+
+    config = fixtures["pyproject"].get("tool", {}).get("repo-review", {})
+    if check_timeout is None:
+        check_timeout = config.get("check-timeout")
+    if timeout is None:
+        timeout = config.get("timeout")
+
+    return _Run(plan, fixtures, check_timeout, timeout, max_failures, costs)
+
+
+def _make_result(
+    run: _Run,
+    i: int,
+    completed: str | None,
+    duration: Duration | None = None,
+    skip_reason: str = "",
+) -> Result | None:
+    """
+    Build the :class:`Result` for a completed check, or ``None`` if the check
+    is filtered out by select/ignore and has no skip reason to report.
+    """
+    plan = run.plan
+    if not plan._reported[i]:  # noqa: SLF001
+        return None
+    result = None if completed is None else not completed
+    if i in plan.skip_reasons:
+        result = None
+        skip_reason = plan.skip_reasons[i]
+
+    name = plan.names[i]
+    return Result(
+        family=plan.checks[name].family,
+        name=name,
+        description=plan.descriptions[i],
+        result=result,
+        err_msg=textwrap.dedent(completed) if completed else "",
+        url=plan.urls[i],
+        skip_reason=skip_reason,
+        duration=duration,
+    )
+
+
+_CheckReturn: typing.TypeAlias = "tuple[str | None, Duration]"
+
+
+def _run_batch(
+    name: str, check: Check, repos: Sequence[Mapping[str, Any]]
+) -> list[_CheckReturn]:
+    with Stopwatch("check", name) as timer:
+        batch_check = typing.cast("BatchCheck", check)
+        results = batch_check.check([{"name": name, **f} for f in repos])
+    if len(results) != len(repos):
+        msg = (
+            f"batch check {name} returned {len(results)} results for {len(repos)} repos"
+        )
+        raise ValueError(msg)
+    # The time is split evenly, so per-repo durations add up to the batch time
+    duration = Duration(
+        timer.duration.wall / len(repos), timer.duration.cpu / len(repos)
+    )
+    return [(process_result_bool(r, check, name), duration) for r in results]
+
+
+def _copy_fixtures(fixtures: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Deep copy the fixtures, so a check can't change them for the next one.
+    Session fixture values are shared rather than copied for every repo; a
+    fresh copy is only made if a check has modified the shared value.
+    """
+    memo: dict[int, Any] = {}
+    for value in fixtures.values():
+        if _is_session_value(value):
+            original = _pristine(value)
+            memo[id(value)] = value if value == original else copy.deepcopy(original)
+    return copy.deepcopy(dict(fixtures), memo)
+
+
+def _fixtures_changed(
+    original: Mapping[str, Any], copied: Mapping[str, Any], check: Check
+) -> bool:
+    # A check can only modify the fixtures it requested. Session values are
+    # compared with the copy made when they were computed, as they are shared.
+    names = original if _is_batch(check) else _parameter_names(check.check)
+    return any(_pristine(original[n]) != copied[n] for n in names if n in original)
+
+
+def _matching_files(root: Traversable, pattern: str) -> list[tuple[str, Traversable]]:
+    """
+    The files matching a glob, with their paths relative to ``root``, sorted.
+    """
+    files: list[tuple[str, Traversable]]
+    if isinstance(root, pathlib.Path):
+        files = [(p.relative_to(root).as_posix(), p) for p in root.glob(pattern)]
+    elif isinstance(root, GHPath):
+        prefix = len(root.path.rstrip("/")) + 1 if root.path else 0
+        files = [(p.path[prefix:], p) for p in root.glob(pattern)]
+    else:
+        # Traversable doesn't have glob, so walk the tree
+        parts = pattern.split("/")
+        files = []
+        stack: list[tuple[str, Traversable]] = [("", root)]
+        while stack:
+            prefix_str, node = stack.pop()
+            for child in node.iterdir():
+                rel = f"{prefix_str}{child.name}"
+                if child.is_dir():
+                    stack.append((f"{rel}/", child))
+                elif _glob_match(parts, rel.split("/")):
+                    files.append((rel, child))
+    return sorted(((rel, p) for rel, p in files if p.is_file()), key=lambda f: f[0])
+
+
+def _run_per_file(
+    name: str, check: Check, fixtures: Mapping[str, Any], pattern: str
+) -> _CheckReturn:
+    def run_one(path: Traversable) -> str | None:
+        result = apply_fixtures({"name": name, **fixtures, "path": path}, check.check)
+        return process_result_bool(result, check, name)
+
+    with Stopwatch("check", name) as timer:
+        files = _matching_files(fixtures["package"], pattern)
+        # Threads are not available in WebAssembly
+        if len(files) > 1 and sys.platform != "emscripten":
+            # Each file runs in a copy of this context, so it is attributed
+            # to this check (see current_section)
+            context = contextvars.copy_context()
+            with concurrent.futures.ThreadPoolExecutor() as pool:
+                results = list(
+                    pool.map(
+                        lambda p: context.copy().run(run_one, p),
+                        [p for _, p in files],
+                    )
+                )
+        else:
+            results = [run_one(p) for _, p in files]
+
+    failed = [(rel, msg) for (rel, _), msg in zip(files, results, strict=True) if msg]
+    if failed:
+        breakdown = "\n\n".join(
+            f"`{rel}`: {textwrap.dedent(msg).strip()}" for rel, msg in failed
+        )
+        completed = f"{len(failed)} of {len(files)} files failed:\n\n{breakdown}"
+    elif files and all(msg is None for msg in results):
+        completed = None
+    else:
+        completed = ""
+    return completed, timer.duration
+
+
+def _run_check(name: str, check: Check, fixtures: Mapping[str, Any]) -> _CheckReturn:
+    if _is_batch(check):
+        (ret,) = _run_batch(name, check, [fixtures])
+        return ret
+    if (pattern := _per_file_glob(check)) is not None:
+        return _run_per_file(name, check, fixtures, pattern)
+    with Stopwatch("check", name) as timer:
+        result = apply_fixtures({"name": name, **fixtures}, check.check)
+    return process_result_bool(result, check, name), timer.duration
+
+
+def _start_check_thread(
+    name: str, check: Check, fixtures: Mapping[str, Any]
+) -> concurrent.futures.Future[_CheckReturn]:
+    """
+    Run a check in a daemon thread. Python threads can't be killed, so a check
+    that overruns its budget is abandoned rather than stopped; being a daemon
+    thread, it won't keep the interpreter alive.
+    """
+    future: concurrent.futures.Future[_CheckReturn] = concurrent.futures.Future()
+    context = contextvars.copy_context()
+
+    def target() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(_run_check, name, check, fixtures))
+        except BaseException as e:  # noqa: BLE001
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=f"repo-review-{name}", daemon=True).start()
+    return future
+
+
+class _Budget:
+    """
+    Tracks the per-check and per-repo time budgets.
+    """
+
+    def __init__(self, check_timeout: float | None, timeout: float | None) -> None:
+        self.check_timeout = check_timeout
+        self.timeout = timeout
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+    def limit(self) -> float | None:
+        """
+        The time the next check may take, or None if unlimited.
+        """
+        if self.deadline is None:
+            return self.check_timeout
+        remaining = max(self.deadline - time.monotonic(), 0.0)
+        if self.check_timeout is None:
+            return remaining
+        return min(self.check_timeout, remaining)
+
+    def exhausted(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def reason(self) -> str:
+        """
+        The skip reason for a check that ran out of time.
+        """
+        if self.exhausted():
+            return f"Repo time budget of {self.timeout:g}s exceeded"
+        return f"Timed out after {self.check_timeout:g}s"
+
+
+class _Scheduler:
+    """
+    Hands out checks whose requirements have finished, cheapest first.
+    """
+
+    def __init__(self, run: _Run) -> None:
+        self.run = run
+        self.waiting = list(run.plan._requires_count)  # noqa: SLF001
+        self.heap = [(run.cost(i), i) for i, w in enumerate(self.waiting) if not w]
+        heapq.heapify(self.heap)
+
+    def __bool__(self) -> bool:
+        return bool(self.heap)
+
+    def pop(self) -> int:
+        return heapq.heappop(self.heap)[1]
+
+    def done(self, i: int) -> None:
+        for d in self.run.plan.dependents[i]:
+            self.waiting[d] -= 1
+            if not self.waiting[d]:
+                heapq.heappush(self.heap, (self.run.cost(d), d))
+
+
+def _sequential_order(run: _Run) -> Iterator[int]:
+    """
+    Yield the checks in an order that respects their requirements. If any cost
+    information is available, the cheapest ready check is picked each time.
+    """
+    if not run.cost_ordered():
+        yield from run.plan.order
+        return
+
+    scheduler = _Scheduler(run)
+    while scheduler:
+        i = scheduler.pop()
+        yield i
+        scheduler.done(i)
+
+
+def _stopped_reason(failures: int) -> str:
+    return f"Not run, stopped after {failures} failure{'s' if failures > 1 else ''}"
+
+
+def iter_process(
+    root: Traversable,
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    collected: CollectionReturn | None = None,
+    plan: ExecutionPlan | None = None,
+    check_timeout: float | None = None,
+    timeout: float | None = None,
+    max_failures: int = 0,
+    costs: Mapping[str, float] | None = None,
+    fixture_workers: int = 1,
+) -> Iterator[Result]:
+    """
+    Process the package, yielding each :class:`Result` as soon as its check
+    finishes. Results come out in dependency order, not family order; use
+    :func:`sort_results` if you need the same order :func:`process` produces.
+    The parameters are the same as :func:`process`. Pass ``collected`` if you
+    need the families before the results arrive.
+
+    .. versionadded:: 1.3
+    """
+    run = _prepare(
+        root,
+        select=select,
+        ignore=ignore,
+        extend_select=extend_select,
+        extend_ignore=extend_ignore,
+        subdir=subdir,
+        collected=collected,
+        plan=plan,
+        check_timeout=check_timeout,
+        timeout=timeout,
+        max_failures=max_failures,
+        costs=costs,
+        fixture_workers=fixture_workers,
+    )
+    yield from _iter_run(run)
+
+
+def _iter_run(run: _Run) -> Iterator[Result]:
+    checks, names, dependents = run.plan.checks, run.plan.names, run.plan.dependents
+    budget = _Budget(run.check_timeout, run.timeout)
+    # Threads are not available in WebAssembly, so only the repo budget applies
+    use_threads = sys.platform != "emscripten" and (
+        run.check_timeout is not None or run.timeout is not None
+    )
+
+    with log_timer(logger, "Processing checks"):
+        # Number of requirements of each check that haven't passed yet
+        unmet = list(run.plan._requires_count)  # noqa: SLF001
+        failures = 0
+        fixtures_copy = _copy_fixtures(run.fixtures)
+
+        # Run all the checks in topological order based on their dependencies
+        for i in _sequential_order(run):
+            name = names[i]
+            completed: str | None = None
+            duration = None
+            skip_reason = ""
+            if run.max_failures and failures >= run.max_failures:
+                skip_reason = _stopped_reason(failures)
+            elif unmet[i]:
+                pass
+            elif budget.exhausted():
+                skip_reason = budget.reason()
+            elif run.batch and name in run.batch:
+                completed, duration = run.batch[name]
+            else:
+                if use_threads:
+                    future = _start_check_thread(name, checks[name], fixtures_copy)
+                    try:
+                        completed, duration = future.result(budget.limit())
+                    except concurrent.futures.TimeoutError:
+                        skip_reason = budget.reason()
+                        # The abandoned check keeps running with the old copy
+                        fixtures_copy = _copy_fixtures(run.fixtures)
+                else:
+                    completed, duration = _run_check(name, checks[name], fixtures_copy)
+                if _fixtures_changed(run.fixtures, fixtures_copy, checks[name]):
+                    fixtures_copy = _copy_fixtures(run.fixtures)
+                    msg = f"{name} modified the input fixtures! Making a deepcopy to fix and continue."
+                    warnings.warn(msg, stacklevel=1)
+            if completed == "":
+                for d in dependents[i]:
+                    unmet[d] -= 1
+
+            result = _make_result(run, i, completed, duration, skip_reason)
+            if result is not None:
+                failures += result.result is False
+                yield result
+
+
+async def async_iter_process(
+    root: Traversable,
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    collected: CollectionReturn | None = None,
+    plan: ExecutionPlan | None = None,
+    check_timeout: float | None = None,
+    timeout: float | None = None,
+    max_failures: int = 0,
+    costs: Mapping[str, float] | None = None,
+    fixture_workers: int = 1,
+) -> AsyncIterator[Result]:
+    """
+    Async version of :func:`iter_process`. Checks whose requirements are
+    satisfied run concurrently in worker threads (inline on WebAssembly, where
+    threads are not available), and each :class:`Result` is yielded as soon as
+    its check finishes, so the completion order is not deterministic. Use
+    :func:`sort_results` to get the same order :func:`process` produces. With
+    ``max_failures``, checks already running when the limit is reached still
+    finish and are reported.
+
+    .. versionadded:: 1.3
+    """
+    import asyncio  # noqa: PLC0415
+
+    run = _prepare(
+        root,
+        select=select,
+        ignore=ignore,
+        extend_select=extend_select,
+        extend_ignore=extend_ignore,
+        subdir=subdir,
+        collected=collected,
+        plan=plan,
+        check_timeout=check_timeout,
+        timeout=timeout,
+        max_failures=max_failures,
+        costs=costs,
+        fixture_workers=fixture_workers,
+    )
+    checks, names, dependents = run.plan.checks, run.plan.names, run.plan.dependents
+    budget = _Budget(run.check_timeout, run.timeout)
+
+    async def run_check(i: int, fixtures: Mapping[str, Any]) -> _CheckReturn | None:
+        name = names[i]
+        if run.batch and name in run.batch:
+            return run.batch[name]
+        if sys.platform == "emscripten":
+            return _run_check(name, checks[name], fixtures)
+        limit = budget.limit()
+        if limit is None:
+            return await asyncio.to_thread(_run_check, name, checks[name], fixtures)
+        future = asyncio.wrap_future(_start_check_thread(name, checks[name], fixtures))
+        try:
+            return await asyncio.wait_for(future, limit)
+        except asyncio.TimeoutError:
+            return None
+
+    with log_timer(logger, "Processing checks (async)"):
+        unmet = list(run.plan._requires_count)  # noqa: SLF001
+        failures = 0
+        fixtures_copy = _copy_fixtures(run.fixtures)
+
+        # The cheapest ready check is started first
+        scheduler = _Scheduler(run)
+        pending: dict[asyncio.Task[_CheckReturn | None], int] = {}
+        try:
+            while scheduler or pending:
+                while scheduler:
+                    i = scheduler.pop()
+                    stopped = run.max_failures and failures >= run.max_failures
+                    ready = not unmet[i]
+                    if not stopped and ready and not budget.exhausted():
+                        pending[asyncio.create_task(run_check(i, fixtures_copy))] = i
+                        continue
+                    skip_reason = (
+                        _stopped_reason(failures)
+                        if stopped
+                        else budget.reason()
+                        if ready
+                        else ""
+                    )
+                    scheduler.done(i)
+                    result = _make_result(run, i, None, None, skip_reason)
+                    if result is not None:
+                        yield result
+                if not pending:
+                    continue
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    i = pending.pop(task)
+                    ret = task.result()
+                    completed: str | None = None
+                    duration = None
+                    skip_reason = ""
+                    if ret is None:
+                        skip_reason = budget.reason()
+                        # The abandoned check keeps running with the old copy
+                        fixtures_copy = _copy_fixtures(run.fixtures)
+                    else:
+                        completed, duration = ret
+                    if completed == "":
+                        for d in dependents[i]:
+                            unmet[d] -= 1
+                    scheduler.done(i)
+                    if _fixtures_changed(run.fixtures, fixtures_copy, checks[names[i]]):
+                        fixtures_copy = _copy_fixtures(run.fixtures)
+                        msg = f"{names[i]} modified the input fixtures! Making a deepcopy to fix and continue."
+                        warnings.warn(msg, stacklevel=1)
+                    result = _make_result(run, i, completed, duration, skip_reason)
+                    if result is not None:
+                        failures += result.result is False
+                        yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def sort_results(
+    families: Mapping[str, Family], results: Iterable[Result]
+) -> list[Result]:
+    """
+    Sort results into family order (the order :func:`process` returns), as
+    needed for results from :func:`iter_process` or
+    :func:`async_iter_process`.
+
+    :param families: The family mapping, must include every result's family.
+    :param results: The results, in any order.
+
+    .. versionadded:: 1.3
+    """
+    return list(_sort_by_family(families, {r.name: r for r in results}).values())
+
+
+def _status(results: Iterable[Result]) -> Status:
+    """
+    The overall status of a repo from its results.
+    """
+    status: Status = "empty"
+    for result in results:
+        if result.result is False:
+            return "errors"
+        if result.result is None:
+            status = "skips"
+        elif status == "empty":
+            status = "passed"
+    return status
+
+
 def process(
     root: Traversable,
     *,
@@ -233,6 +1049,12 @@ def process(
     extend_ignore: AbstractSet[str] = frozenset(),
     subdir: str = "",
     collected: CollectionReturn | None = None,
+    plan: ExecutionPlan | None = None,
+    check_timeout: float | None = None,
+    timeout: float | None = None,
+    max_failures: int = 0,
+    costs: Mapping[str, float] | None = None,
+    fixture_workers: int = 1,
 ) -> ProcessReturn:
     """
     Process the package and return a dictionary of results.
@@ -244,80 +1066,157 @@ def process(
                    root of the repository.
     :param collected: The return from a collection run. Skips collecting checks
                       and rerunning fixtures if given.
-
+    :param plan: A compiled :class:`ExecutionPlan`. Only the fixtures are
+                 computed for this repo (unless ``collected`` is given), and
+                 the plan's checks and selection are used as-is, so
+                 ``[tool.repo-review]`` select/ignore are not read and the
+                 selection arguments can't be passed.
+    :param check_timeout: Seconds a single check may take before it is
+                          abandoned and reported as skipped. Defaults to
+                          ``check-timeout`` in ``[tool.repo-review]``.
+    :param timeout: Seconds all checks together may take; checks that would
+                    run after this are skipped. Defaults to ``timeout`` in
+                    ``[tool.repo-review]``.
+    :param max_failures: Stop running checks after this many (reported)
+                         failures; the rest are reported as skipped. 0 runs
+                         everything.
+    :param costs: Estimated cost (such as recorded seconds) of each check.
+                  When given, or when checks have a ``cost`` attribute, the
+                  cheapest check whose requirements are met runs next, so
+                  failures are found sooner with ``max_failures``.
+    :param fixture_workers: Threads used to compute independent fixtures
+                            concurrently, which helps for remote repos.
 
     :return: The families and a list of checks. Families is guaranteed to
              include all families and be in order.
+
+    .. versionchanged:: 1.3
+       Added ``plan``, ``check_timeout``, ``timeout``, ``max_failures``,
+       ``costs``, and ``fixture_workers``.
     """
-    fixtures, tasks, families = collected or collect_all(root, subdir)
+    if plan is None:
+        collected = collected or collect_all(
+            root, subdir, fixture_workers=fixture_workers
+        )
+        plan = ExecutionPlan.compile(
+            collected,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+        )
+    elif select or ignore or extend_select or extend_ignore:
+        msg = "select and ignore settings are part of the plan, don't pass them too"
+        raise ValueError(msg)
+
+    results = iter_process(
+        root,
+        subdir=subdir,
+        collected=collected,
+        plan=plan,
+        check_timeout=check_timeout,
+        timeout=timeout,
+        max_failures=max_failures,
+        costs=costs,
+        fixture_workers=fixture_workers,
+    )
+    return ProcessReturn(plan.families, plan.sort(results))
 
-    # Collect our own config
-    config = fixtures["pyproject"].get("tool", {}).get("repo-review", {})
-    ignore_pyproject: list[str] | dict[str, str] = config.get("ignore", [])
-    select_checks = (select or frozenset(config.get("select", ()))) | extend_select
-    skip_checks = (ignore or frozenset(ignore_pyproject)) | extend_ignore
-    skip_reasons = ignore_pyproject if isinstance(ignore_pyproject, dict) else {}
-
-    # Make a graph of the check's interdependencies
-    graph: dict[str, AbstractSet[str]] = {
-        n: getattr(t, "requires", frozenset()) for n, t in tasks.items()
-    }
-    for name, s in graph.items():
-        if not isinstance(s, AbstractSet):
-            msg = f"requires must be a set, got {s!r} for {name!r}"  # type: ignore[unreachable]
-            raise TypeError(msg)
-
-    # Keep track of which checks have been completed
-    completed: dict[str, str | None] = {}
-    fixtures_copy = copy.deepcopy(fixtures)
-
-    # Run all the checks in topological order based on their dependencies
-    ts = graphlib.TopologicalSorter(graph)
-    for name in ts.static_order():
-        if name not in tasks:
-            # A check listed a dependency in `requires` that was not
-            # collected; it shows up in the topological order but has no
-            # task to run. Treat it as passed (matching `completed.get`
-            # below).
-            continue
-        if all(completed.get(n, "") == "" for n in graph[name]):
-            result = apply_fixtures({"name": name, **fixtures_copy}, tasks[name].check)
-            completed[name] = process_result_bool(result, tasks[name], name)
-            if fixtures != fixtures_copy:
-                fixtures_copy = copy.deepcopy(fixtures)
-                msg = f"{name} modified the input fixtures! Making a deepcopy to fix and continue."
+
+def _run_batches(runs: Sequence[_Run]) -> list[dict[str, _CheckReturn]]:
+    """
+    Run each batch check once over every repo that reports it, returning the
+    results for each repo.
+    """
+    members: dict[str, list[int]] = {}
+    for n, run in enumerate(runs):
+        plan = run.plan
+        for i, (name, check) in enumerate(plan.checks.items()):
+            if _is_batch(check) and plan._reported[i]:  # noqa: SLF001
+                members.setdefault(name, []).append(n)
+
+    batches: list[dict[str, _CheckReturn]] = [{} for _ in runs]
+    for name, indices in members.items():
+        check = runs[indices[0]].plan.checks[name]
+        copies = [_copy_fixtures(runs[n].fixtures) for n in indices]
+        results = _run_batch(name, check, copies)
+        for n, fixtures_copy in zip(indices, copies, strict=True):
+            if _fixtures_changed(runs[n].fixtures, fixtures_copy, check):
+                msg = f"{name} modified the input fixtures! The checks after it use the original fixtures."
                 warnings.warn(msg, stacklevel=1)
-        else:
-            completed[name] = None
-
-    # Collect the results
-    result_list = []
-    for task_name, check in _sort_by_family(families, tasks).items():
-        result = None if completed[task_name] is None else not completed[task_name]
-        doc = check.__doc__ or ""
-        err_msg = completed[task_name] or ""
-        skip_reason = ""
-
-        if not is_allowed(select_checks, skip_checks, task_name):
-            key = name_matches(task_name, skip_reasons.keys())
-            if not key or not skip_reasons.get(key, ""):
-                continue
-            result = None
-            skip_reason = skip_reasons[key]
-
-        result_list.append(
-            Result(
-                family=check.family,
-                name=task_name,
-                description=doc.format(self=check, name=task_name).strip(),
-                result=result,
-                err_msg=textwrap.dedent(err_msg),
-                url=get_check_url(task_name, check),
-                skip_reason=skip_reason,
-            )
+                break
+        for n, ret in zip(indices, results, strict=True):
+            batches[n][name] = ret
+    return batches
+
+
+def process_many(
+    roots: Iterable[Traversable],
+    *,
+    select: AbstractSet[str] = frozenset(),
+    ignore: AbstractSet[str] = frozenset(),
+    extend_select: AbstractSet[str] = frozenset(),
+    extend_ignore: AbstractSet[str] = frozenset(),
+    subdir: str = "",
+    check_timeout: float | None = None,
+    timeout: float | None = None,
+    max_failures: int = 0,
+    costs: Mapping[str, float] | None = None,
+    fixture_workers: int = 1,
+) -> list[ProcessReturn]:
+    """
+    Process several repos, running each :class:`~repo_review.checks.BatchCheck`
+    once with the fixtures of every repo it is selected for, instead of once
+    per repo. The check object collected for the first of those repos is
+    used. A batch result is discarded for a repo where the check's
+    ``requires`` don't pass, and timeouts don't apply to batch checks. The
+    other parameters are the same as :func:`process`.
+
+    :param roots: The repositories to process.
+
+    :return: One :func:`process` return per repo, in the same order.
+
+    .. versionadded:: 1.3
+    """
+    runs = [
+        _prepare(
+            root,
+            select=select,
+            ignore=ignore,
+            extend_select=extend_select,
+            extend_ignore=extend_ignore,
+            subdir=subdir,
+            collected=None,
+            plan=None,
+            check_timeout=check_timeout,
+            timeout=timeout,
+            max_failures=max_failures,
+            costs=costs,
+            fixture_workers=fixture_workers,
+        )
+        for root in roots
+    ]
+    batches = _run_batches(runs)
+    return [
+        ProcessReturn(
+            run.plan.families, run.plan.sort(_iter_run(run._replace(batch=b)))
         )
+        for run, b in zip(runs, batches, strict=True)
+    ]
 
-    return ProcessReturn(families, result_list)
+
+def _result_dict(r: Result) -> ResultDict:
+    return {
+        "family": r.family,
+        "description": r.description,
+        "result": r.result,
+        "skip_reason": r.skip_reason,
+        "err_msg": r.err_msg,
+        "url": r.url,
+        "duration": None
+        if r.duration is None
+        else {"wall": r.duration.wall, "cpu": r.duration.cpu},
+    }
 
 
 def as_simple_dict(results: list[Result]) -> dict[str, ResultDict]:
@@ -327,10 +1226,4 @@ def as_simple_dict(results: list[Result]) -> dict[str, ResultDict]:
 
     :param results: The list of results.
     """
-    return {
-        result.name: typing.cast(
-            "ResultDict",
-            {k: v for k, v in dataclasses.asdict(result).items() if k != "name"},
-        )
-        for result in results
-    }
+    return {r.name: _result_dict(r) for r in results}
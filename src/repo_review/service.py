@@ -0,0 +1,478 @@
+"""
+An HTTP service that reviews repos, for running repo-review behind an
+internal endpoint:
+
+    python -m repo_review.service --port 8000 --workers 4
+
+``POST /review`` with a JSON body like ``{"target": "gh:org/repo@branch",
+"package_dir": "", "select": [], "ignore": []}`` reviews a GitHub repo. With a
+zip archive as the body (``Content-Type: application/zip``), the archive is
+reviewed instead, with the options in the query string, like
+``/review?package_dir=src&select=PP,PY``. The response is the same object as
+a line of ``--format jsonl``. Local paths on the server are never reviewed.
+
+Jobs are queued and run by a fixed number of workers. When the queue is full,
+the service answers ``503`` with a ``Retry-After`` header instead of queueing
+more, and identical jobs that are queued or running share one review.
+``GET /metrics`` reports the queue depth, the running jobs, counters, and the
+latency (from being queued to finishing) of recent jobs.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.__main__",
+    f"{__spec__.parent}.executors",
+    f"{__spec__.parent}.json_writer",
+    f"{__spec__.parent}.processor",
+    "argparse",
+    "collections",
+    "concurrent.futures",
+    "io",
+    "json",
+    "logging",
+    "pathlib",
+    "tempfile",
+    "urllib.error",
+    "urllib.parse",
+    "zipfile",
+]
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import io
+import json
+import logging
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from .executors import _open_target
+from .json_writer import JSONWriter
+from .processor import _status, process
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from typing import Any
+
+    from ._compat.importlib.resources.abc import Traversable
+    from ._compat.typing import Self
+
+__all__ = ["ReviewJob", "ReviewService", "main", "serve"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: The largest request body accepted, in bytes
+MAX_UPLOAD = 16 * 2**20
+
+#: The largest total size of the files in an uploaded archive, in bytes
+MAX_UNPACKED = 256 * 2**20
+
+#: The number of recent jobs the latency metrics are computed from
+LATENCY_WINDOW = 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Content Too Large",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+log = logging.getLogger(__name__)
+
+
+class ReviewJob(NamedTuple):
+    """
+    A review to run. Identical jobs that are in flight at the same time are
+    only run once.
+
+    .. versionadded:: 1.3
+    """
+
+    #: A ``gh:org/repo[@branch][:path]`` target, or a name for an archive
+    target: str
+    #: The path to the package inside the repo
+    package_dir: str = ""
+    #: Checks to select
+    select: tuple[str, ...] = ()
+    #: Checks to ignore
+    ignore: tuple[str, ...] = ()
+    #: The contents of a zip archive to review instead of ``target``
+    archive: bytes | None = None
+
+
+def _json(status: int, obj: object) -> tuple[int, bytes]:
+    return status, json.dumps(obj).encode()
+
+
+def _codes(value: object, name: str) -> tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+        msg = f"{name} must be a list of strings or a comma separated string"
+        raise ValueError(msg)
+    return tuple(sorted({x.strip() for x in value if x.strip()}))
+
+
+def _parse_job(content_type: str, query: str, body: bytes) -> ReviewJob:
+    media_type = content_type.partition(";")[0].strip().lower()
+    options: dict[str, Any]
+    if media_type in {"application/zip", "application/octet-stream"}:
+        options = {k: v[-1] for k, v in urllib.parse.parse_qs(query).items()}
+        target = options.get("name", "upload")
+        archive: bytes | None = body
+    else:
+        parsed = json.loads(body)
+        if not isinstance(parsed, dict):
+            msg = "The request body must be a JSON object"
+            raise ValueError(msg)
+        options = parsed
+        target = options.get("target", "")
+        if not isinstance(target, str) or not target.startswith("gh:"):
+            msg = "target must be gh:org/repo[@branch][:path]"
+            raise ValueError(msg)
+        archive = None
+
+    package_dir = options.get("package_dir", "")
+    if not isinstance(package_dir, str):
+        msg = "package_dir must be a string"
+        raise ValueError(msg)  # noqa: TRY004
+    return ReviewJob(
+        target=target,
+        package_dir=package_dir,
+        select=_codes(options.get("select", []), "select"),
+        ignore=_codes(options.get("ignore", []), "ignore"),
+        archive=archive,
+    )
+
+
+@contextlib.contextmanager
+def _unpacked(archive: bytes) -> Generator[Path, None, None]:
+    """
+    Extract an archive to a temporary directory. A :class:`zipfile.Path`
+    can't be used directly, as the fixtures are deep-copied. Archives with
+    a single top level directory, like GitHub makes, are reviewed from
+    inside it.
+    """
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        if sum(info.file_size for info in zf.infolist()) > MAX_UNPACKED:
+            msg = f"The archive unpacks to more than {MAX_UNPACKED} bytes"
+            raise ValueError(msg)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Members are kept inside tmp, see ZipFile.extract
+            zf.extractall(tmp)
+            root = Path(tmp)
+            match list(root.iterdir()):
+                case [top] if top.is_dir():
+                    yield top
+                case _:
+                    yield root
+
+
+def _open_job(job: ReviewJob) -> contextlib.AbstractContextManager[Traversable]:
+    if job.archive is not None:
+        return _unpacked(job.archive)
+    return contextlib.nullcontext(_open_target(job.target))
+
+
+def _run_job(job: ReviewJob) -> tuple[int, bytes]:
+    """
+    Run a review in a worker thread, returning the HTTP status and body.
+    """
+    try:
+        with _open_job(job) as root:
+            families, results = process(
+                root,
+                subdir=job.package_dir,
+                select=frozenset(job.select),
+                ignore=frozenset(job.ignore),
+            )
+    except urllib.error.HTTPError as e:
+        return _json(502, {"error": f"Error accessing {e.url}: {e}"})
+    except (ValueError, zipfile.BadZipFile) as e:
+        return _json(400, {"error": str(e)})
+    except Exception as e:
+        log.exception("Reviewing %s failed", job.target)
+        return _json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    out = io.StringIO()
+    writer = JSONWriter(out, lines=True)
+    writer.write_report(families, results, status=_status(results), header=job.target)
+    return 200, out.getvalue().encode()
+
+
+class ReviewService:
+    """
+    Queue review jobs and run them in a fixed number of worker threads. Use
+    as an async context manager to start and stop the workers, and pass
+    :meth:`handle` to :func:`asyncio.start_server` to serve it over HTTP.
+
+    :param workers: The number of reviews run at once.
+    :param queue_size: The number of jobs that can wait for a worker; more
+                       are rejected.
+    :param max_upload: The largest request body accepted, in bytes.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(
+        self, *, workers: int = 4, queue_size: int = 64, max_upload: int = MAX_UPLOAD
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_upload = max_upload
+        self._queue: asyncio.Queue[
+            tuple[ReviewJob, asyncio.Future[tuple[int, bytes]], float]
+        ] = asyncio.Queue(queue_size)
+        self._pending: dict[ReviewJob, asyncio.Future[tuple[int, bytes]]] = {}
+        self._latencies: collections.deque[float] = collections.deque(
+            maxlen=LATENCY_WINDOW
+        )
+        self._counts = dict.fromkeys(
+            ("submitted", "completed", "failed", "deduplicated", "rejected"), 0
+        )
+        self._running = 0
+        self._tasks: list[asyncio.Task[None]] = []
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> Self:
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.workers)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job, future, queued = await self._queue.get()
+            self._running += 1
+            try:
+                response = await loop.run_in_executor(self._executor, _run_job, job)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                # Such as the executor being shut down; don't leave the
+                # clients waiting
+                log.exception("Could not start reviewing %s", job.target)
+                self._counts["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            finally:
+                self._running -= 1
+                self._pending.pop(job, None)
+                self._queue.task_done()
+            self._latencies.append(time.perf_counter() - queued)
+            self._counts["completed" if response[0] == 200 else "failed"] += 1
+            if not future.done():
+                future.set_result(response)
+
+    async def review(self, job: ReviewJob) -> tuple[int, bytes]:
+        """
+        Queue a job, or join an identical one in flight, and wait for it.
+
+        :param job: The review to run.
+
+        :return: The HTTP status and the JSON body.
+
+        :raises asyncio.QueueFull: If the queue is full.
+        """
+        future = self._pending.get(job)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait((job, future, time.perf_counter()))
+            except asyncio.QueueFull:
+                self._counts["rejected"] += 1
+                raise
+            self._pending[job] = future
+            self._counts["submitted"] += 1
+        else:
+            self._counts["deduplicated"] += 1
+        # A client disconnecting must not cancel the review for the others
+        return await asyncio.shield(future)
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        The queue depth, running jobs, job counts, and the latency in seconds
+        of the last :data:`LATENCY_WINDOW` jobs.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "running": self._running,
+            "workers": self.workers,
+            **self._counts,
+            "latency": {
+                "count": len(latencies),
+                "mean": sum(latencies) / len(latencies),
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": latencies[-1],
+            }
+            if latencies
+            else {"count": 0},
+        }
+
+    async def _respond(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> tuple[int, bytes, dict[str, str]]:
+        request_line = await reader.readline()
+        method, target, _ = request_line.decode("latin-1").split()
+        headers = {}
+        while (line := await reader.readline()).strip():
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                msg = f"Malformed header: {line!r}"
+                raise ValueError(msg)
+            headers[name.strip().lower()] = value.strip()
+
+        url = urllib.parse.urlsplit(target)
+        allowed = {"/metrics": "GET", "/review": "POST"}.get(url.path)
+        if allowed is None:
+            return *_json(404, {"error": f"No such endpoint: {url.path}"}), {}
+        if method != allowed:
+            return *_json(405, {"error": f"Use {allowed}"}), {"Allow": allowed}
+        if url.path == "/metrics":
+            return *_json(200, self.metrics()), {}
+
+        length = int(headers.get("content-length", "0"))
+        if length > self.max_upload:
+            msg = f"The body is larger than {self.max_upload} bytes"
+            return *_json(413, {"error": msg}), {}
+        if headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        body = await reader.readexactly(length)
+        job = _parse_job(headers.get("content-type", ""), url.query, body)
+        try:
+            status, data = await self.review(job)
+        except asyncio.QueueFull:
+            msg = "Too many queued reviews, try again later"
+            return *_json(503, {"error": msg}), {"Retry-After": "1"}
+        except Exception as e:  # noqa: BLE001
+            return *_json(500, {"error": f"{type(e).__name__}: {e}"}), {}
+        return status, data, {}
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answer one HTTP request, then close the connection.
+        """
+        try:
+            status, body, headers = await self._respond(reader, writer)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, body = _json(400, {"error": str(e) or "Malformed request"})
+            headers = {}
+
+        head = [
+            f"HTTP/1.1 {status} {_REASONS[status]}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+            *(f"{k}: {v}" for k, v in headers.items()),
+        ]
+        writer.write("\r\n".join(head).encode("latin-1") + b"\r\n\r\n" + body)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    workers: int = 4,
+    queue_size: int = 64,
+    max_upload: int = MAX_UPLOAD,
+) -> None:
+    """
+    Serve reviews over HTTP until cancelled.
+
+    :param host: The address to listen on.
+    :param port: The port to listen on.
+    :param workers: See :class:`ReviewService`.
+    :param queue_size: See :class:`ReviewService`.
+    :param max_upload: See :class:`ReviewService`.
+    """
+    from .daemon import _cached_entry_points  # noqa: PLC0415
+
+    service = ReviewService(
+        workers=workers, queue_size=queue_size, max_upload=max_upload
+    )
+    with _cached_entry_points():
+        async with service:
+            server = await asyncio.start_server(service.handle, host, port)
+            async with server:
+                for sock in server.sockets:
+                    log.info("Serving reviews on %s", sock.getsockname())
+                await server.serve_forever()
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """
+    The ``python -m repo_review.service`` command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m repo_review.service", description="Serve reviews over HTTP."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=4, help="Reviews run at once")
+    parser.add_argument(
+        "--queue-size", type=int, default=64, help="Jobs that can wait for a worker"
+    )
+    parser.add_argument(
+        "--max-upload", type=int, default=MAX_UPLOAD, help="Largest body in bytes"
+    )
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            serve(
+                parsed.host,
+                parsed.port,
+                workers=parsed.workers,
+                queue_size=parsed.queue_size,
+                max_upload=parsed.max_upload,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
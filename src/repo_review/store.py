@@ -0,0 +1,330 @@
+"""
+A SQLite store for results, to track a fleet of repos over time without
+re-reading old JSON output. Each review is a run of one repo, at a ref and
+commit if known, with its families, results, and timings:
+
+.. code-block:: sql
+
+    runs (id, repo, ref, commit, status, created)
+    latest (repo, run, previous)  -- the last two runs of each repo
+    checks (id, name, family, description, url)
+    results (run, check, result, err_msg, skip_reason)
+    families (run, family, name, description, order)
+    timings (run, kind, name, wall, cpu)
+
+A result is 1 for passed, 0 for failed, and NULL for skipped. Check names are
+stored once in ``checks``, and ``latest`` is kept up to date on insert, so
+:meth:`ResultStore.pass_rates` and :meth:`ResultStore.regressions` only read
+the newest runs, however long the history is. Runs are written in batches,
+one transaction per batch.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "os",
+    "sqlite3",
+    "time",
+]
+
+import sqlite3
+import time
+from typing import NamedTuple
+
+from .summary import PassRate
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Mapping
+
+    from ._compat.typing import Self
+    from ._timer import Timing
+    from .families import Family
+    from .processor import Result
+
+__all__ = ["PassRate", "Regression", "ResultStore"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    ref TEXT,
+    "commit" TEXT,
+    status TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_repo ON runs (repo, id);
+CREATE TABLE IF NOT EXISTS latest (
+    repo TEXT PRIMARY KEY,
+    run INTEGER NOT NULL REFERENCES runs (id),
+    previous INTEGER REFERENCES runs (id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    family TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    "check" INTEGER NOT NULL REFERENCES checks (id),
+    result INTEGER,
+    err_msg TEXT NOT NULL,
+    skip_reason TEXT NOT NULL,
+    PRIMARY KEY (run, "check")
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_check ON results ("check", run);
+CREATE TABLE IF NOT EXISTS families (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    family TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    "order" INTEGER,
+    PRIMARY KEY (run, family)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS timings (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    wall REAL NOT NULL,
+    cpu REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_run ON timings (run);
+"""
+
+_PASS_RATES = """
+SELECT c.name, c.family,
+       total(r.result = 1), total(r.result = 0), total(r.result IS NULL)
+FROM latest AS l
+JOIN results AS r ON r.run = l.run
+JOIN checks AS c ON c.id = r."check"
+GROUP BY r."check"
+ORDER BY c.name
+"""
+
+_REGRESSIONS = """
+SELECT l.repo, c.name, runs.ref, runs."commit", cur.err_msg, l.run, l.previous
+FROM latest AS l
+JOIN runs ON runs.id = l.run
+JOIN results AS cur ON cur.run = l.run
+JOIN results AS prev ON prev.run = l.previous AND prev."check" = cur."check"
+JOIN checks AS c ON c.id = cur."check"
+WHERE cur.result = 0 AND prev.result = 1
+"""
+
+
+class Regression(NamedTuple):
+    """
+    A check that passed in the previous run of a repo and failed in the latest.
+
+    .. versionadded:: 1.3
+    """
+
+    repo: str  #: The repo
+    name: str  #: The check name
+    ref: str | None  #: The ref of the latest run
+    commit: str | None  #: The commit of the latest run
+    err_msg: str  #: The error message of the failure
+    run: int  #: The latest run id
+    previous: int  #: The previous run id
+
+
+class _Run(NamedTuple):
+    repo: str
+    ref: str | None
+    commit: str | None
+    status: str
+    created: float
+    families: list[tuple[str, str | None, str | None, int | None]]
+    results: list[Result]
+    timings: list[tuple[str, str, float, float]]
+
+
+class ResultStore:
+    """
+    Write reviews to a SQLite database and query them. Use as a context
+    manager, or call :meth:`close`, to write the last batch.
+
+    :param path: The database file, created if missing.
+    :param batch_size: The number of runs written in each transaction.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, batch_size: int = 100) -> None:
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if version > SCHEMA_VERSION:
+            self.connection.close()
+            msg = f"{path} has schema version {version}, newer than {SCHEMA_VERSION}"
+            raise RuntimeError(msg)
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._check_ids: dict[str, int] = dict(
+            self.connection.execute("SELECT name, id FROM checks")
+        )
+        self._pending: list[_Run] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def add(
+        self,
+        repo: str,
+        families: Mapping[str, Family],
+        results: Iterable[Result],
+        *,
+        status: str,
+        ref: str | None = None,
+        commit: str | None = None,
+        timings: Iterable[Timing] = (),
+    ) -> None:
+        """
+        Add a run of one repo. It is written with the next batch.
+
+        :param repo: The repo, the same string for every run of it.
+        :param families: The family mapping.
+        :param results: All the results, not just the failures.
+        :param status: The overall status.
+        :param ref: The branch or other ref reviewed.
+        :param commit: The commit reviewed.
+        :param timings: Timings to store.
+        """
+        run = _Run(
+            repo=repo,
+            ref=ref,
+            commit=commit,
+            status=status,
+            created=time.time(),
+            families=[
+                (k, v.get("name"), v.get("description"), v.get("order"))
+                for k, v in families.items()
+            ],
+            results=list(results),
+            timings=[
+                (t.kind, t.name, t.duration.wall, t.duration.cpu) for t in timings
+            ],
+        )
+        self._pending.append(run)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _check_id(self, result: Result, new_ids: dict[str, int]) -> int:
+        check_id = self._check_ids.get(result.name, new_ids.get(result.name))
+        if check_id is None:
+            self.connection.execute(
+                "INSERT INTO checks (name, family, description, url) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET family = excluded.family,"
+                " description = excluded.description, url = excluded.url",
+                (result.name, result.family, result.description, result.url),
+            )
+            (value,) = self.connection.execute(
+                "SELECT id FROM checks WHERE name = ?", (result.name,)
+            ).fetchone()
+            check_id = new_ids[result.name] = int(value)
+        return check_id
+
+    def flush(self) -> None:
+        """
+        Write the pending runs in one transaction.
+        """
+        if not self._pending:
+            return
+        # Only cached once committed, as a rollback removes the new checks
+        new_ids: dict[str, int] = {}
+        with self.connection as db:
+            for run in self._pending:
+                run_id = db.execute(
+                    'INSERT INTO runs (repo, ref, "commit", status, created)'
+                    " VALUES (?, ?, ?, ?, ?)",
+                    run[:5],
+                ).lastrowid
+                db.execute(
+                    "INSERT INTO latest (repo, run) VALUES (?, ?)"
+                    " ON CONFLICT (repo) DO UPDATE"
+                    " SET previous = latest.run, run = excluded.run",
+                    (run.repo, run_id),
+                )
+                db.executemany(
+                    'INSERT INTO families (run, family, name, description, "order")'
+                    " VALUES (?, ?, ?, ?, ?)",
+                    ((run_id, *family) for family in run.families),
+                )
+                rows = [
+                    (
+                        run_id,
+                        self._check_id(r, new_ids),
+                        r.result,
+                        r.err_msg,
+                        r.skip_reason,
+                    )
+                    for r in run.results
+                ]
+                db.executemany(
+                    'INSERT INTO results (run, "check", result, err_msg, skip_reason)'
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                db.executemany(
+                    "INSERT INTO timings (run, kind, name, wall, cpu)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    ((run_id, *timing) for timing in run.timings),
+                )
+        self._check_ids.update(new_ids)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """
+        Write the pending runs and close the database.
+        """
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def pass_rates(self) -> list[PassRate]:
+        """
+        How each check did in the latest run of every repo, sorted by name.
+        Pending runs are written first.
+        """
+        self.flush()
+        return [
+            PassRate(name, family, int(passed), int(failed), int(skipped))
+            for name, family, passed, failed, skipped in self.connection.execute(
+                _PASS_RATES
+            )
+        ]
+
+    def regressions(self, repo: str | None = None) -> list[Regression]:
+        """
+        Checks that passed in the previous run of a repo and failed in the
+        latest, sorted by repo and check. Pending runs are written first.
+
+        :param repo: Only look at this repo.
+        """
+        self.flush()
+        if repo is None:
+            rows = self.connection.execute(_REGRESSIONS + " ORDER BY l.repo, c.name")
+        else:
+            rows = self.connection.execute(
+                _REGRESSIONS + " AND l.repo = ? ORDER BY c.name", (repo,)
+            )
+        return [Regression(*row) for row in rows]
@@ -0,0 +1,539 @@
+"""
+A fleet summary: a matrix of repos and checks, with the pass rate of each check and
+each family, for reviewing hundreds of repos at once. Each repo is counted as
+it finishes and its matrix row is written right away, so memory use depends on
+the number of checks, not the number of repos.
+
+.. versionadded:: 1.3
+"""
+
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "collections",
+    "csv",
+    "html",
+    "itertools",
+    f"{__spec__.parent}.checks",
+]
+
+import collections
+import csv
+import dataclasses
+import html
+import itertools
+from typing import NamedTuple
+
+from .checks import get_check_description
+from .families import Family, get_family_name, sort_family_keys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+    from typing import Literal, TextIO
+
+    from rich.console import Console
+
+    from ._compat.typing import Self
+    from .checks import Check
+    from .processor import Result, Status
+
+    SummaryFormat = Literal["rich", "html", "csv"]
+
+__all__ = ["FamilyRate", "FleetSummary", "PassRate", "SummaryWriter"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+class PassRate(NamedTuple):
+    """
+    How a check did over many repos, in a fleet summary or in the latest run
+    of each repo in a :class:`~repo_review.store.ResultStore`.
+
+    .. versionadded:: 1.3
+    """
+
+    name: str  #: The check name
+    family: str  #: The family of the check
+    passed: int  #: Repos where it passed
+    failed: int  #: Repos where it failed
+    skipped: int  #: Repos where it was skipped
+
+    @property
+    def rate(self) -> float | None:
+        """
+        The fraction of passes among the repos where it ran, None if it never did.
+        """
+        ran = self.passed + self.failed
+        return self.passed / ran if ran else None
+
+
+class FamilyRate(NamedTuple):
+    """
+    How the checks of a family did over all repos.
+
+    .. versionadded:: 1.3
+    """
+
+    family: str  #: The family key
+    name: str  #: The family name
+    passed: int  #: Passing results
+    failed: int  #: Failing results
+    skipped: int  #: Skipped results
+    clean: int  #: Repos with no failures in this family
+    repos: int  #: Repos with results in this family
+
+    @property
+    def rate(self) -> float | None:
+        """
+        The fraction of passes among the results that ran, None if none did.
+        """
+        ran = self.passed + self.failed
+        return self.passed / ran if ran else None
+
+
+@dataclasses.dataclass(slots=True)
+class _Tally:
+    family: str
+    description: str
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class FleetSummary:
+    """
+    Running totals for each check and family, and the number of repos with
+    each status. Only counts are kept, so any number of repos can be added.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(self) -> None:
+        #: The number of repos added
+        self.repos = 0
+        #: The number of repos with each status
+        self.statuses: collections.Counter[str] = collections.Counter()
+        #: The families of all repos, as first seen
+        self.families: dict[str, Family] = {}
+        self._checks: dict[str, _Tally] = {}
+        #: Repos with no failures, and repos with results, by family
+        self._clean: collections.Counter[str] = collections.Counter()
+        self._seen: collections.Counter[str] = collections.Counter()
+
+    def add(
+        self,
+        families: Mapping[str, Family],
+        results: Iterable[Result],
+        status: Status,
+    ) -> None:
+        """
+        Count the results of one repo.
+
+        :param families: The family mapping.
+        :param results: All the results, not just the failures.
+        :param status: The overall status of the repo.
+        """
+        self.repos += 1
+        self.statuses[status] += 1
+        for family, info in families.items():
+            self.families.setdefault(family, info)
+        seen: set[str] = set()
+        failed: set[str] = set()
+        for result in results:
+            tally = self._checks.get(result.name)
+            if tally is None:
+                tally = self._checks[result.name] = _Tally(
+                    result.family, result.description
+                )
+            if result.result is None:
+                tally.skipped += 1
+            elif result.result:
+                tally.passed += 1
+            else:
+                tally.failed += 1
+                failed.add(result.family)
+            seen.add(result.family)
+        self._seen.update(seen)
+        self._clean.update(seen - failed)
+
+    def family(self, name: str) -> str:
+        """
+        The family of a check.
+        """
+        return self._checks[name].family
+
+    def description(self, name: str) -> str:
+        """
+        The description of a check, as first seen.
+        """
+        return self._checks[name].description
+
+    def pass_rates(self) -> list[PassRate]:
+        """
+        The totals for each check, in family order, then in the order first seen.
+        """
+        by_family: dict[str, list[PassRate]] = {}
+        for name, t in self._checks.items():
+            rate = PassRate(name, t.family, t.passed, t.failed, t.skipped)
+            by_family.setdefault(t.family, []).append(rate)
+        return [
+            rate
+            for family in sort_family_keys(
+                {f: self.families.get(f, Family()) for f in by_family}
+            )
+            for rate in by_family.get(family, [])
+        ]
+
+    def family_rates(self) -> list[FamilyRate]:
+        """
+        The totals for each family with results, in family order.
+        """
+        totals: dict[str, list[int]] = {}
+        for rate in self.pass_rates():
+            total = totals.setdefault(rate.family, [0, 0, 0])
+            total[0] += rate.passed
+            total[1] += rate.failed
+            total[2] += rate.skipped
+        return [
+            FamilyRate(
+                family,
+                get_family_name(self.families, family),
+                passed,
+                failed,
+                skipped,
+                clean=self._clean[family],
+                repos=self._seen[family],
+            )
+            for family, (passed, failed, skipped) in totals.items()
+        ]
+
+
+def _percent(rate: float | None) -> str:
+    return "" if rate is None else f"{rate:.0%}"
+
+
+def _rate(rates: Mapping[str, PassRate], name: str) -> float | None:
+    # A column can be a check no repo had
+    rate = rates.get(name)
+    return None if rate is None else rate.rate
+
+
+def _cell(result: Result | None) -> str:
+    if result is None:
+        return ""
+    return "skip" if result.result is None else "pass" if result.result else "fail"
+
+
+_RICH_CELLS = {
+    "": "[dim]·[/dim]",
+    "pass": "[green]✓[/green]",
+    "fail": "[red]✗[/red]",
+    "skip": "[yellow]-[/yellow]",
+}
+_RICH_STATUS = {
+    "passed": "green",
+    "skips": "yellow",
+    "errors": "red",
+    "empty": "dim",
+}
+_HTML_CELLS = {
+    "": "<td></td>",
+    "pass": '<td title="Passed">&#9989;</td>',
+    "fail": '<td title="Failed">&#10060;</td>',
+    "skip": '<td title="Skipped">&#9888;&#65039;</td>',
+}
+
+
+class SummaryWriter:
+    """
+    Write a fleet summary to a stream. Each repo given to :meth:`write_repo`
+    is counted in :attr:`summary` and written as a row of the matrix right
+    away; :meth:`close` (or leaving the ``with`` block) writes the pass rates.
+
+    The matrix columns are the ``checks`` given, usually all the selected
+    checks from :func:`~repo_review.processor.collect_all`, so a repo that
+    doesn't have a check (for example, because its config ignores it) just
+    gets an empty cell. Without ``checks``, the columns are the checks of the
+    first repo with results, in family order. Checks without a column are
+    still counted in the pass rates. The formats are:
+
+    ``"rich"``
+        A line of symbols per repo, then tables of the check and family pass
+        rates.
+    ``"html"``
+        A table with a row per repo and the check pass rates at the bottom,
+        then a table of the family pass rates.
+    ``"csv"``
+        A ``repo,status,<check>...`` header, then a row per repo with
+        ``pass``, ``fail``, ``skip``, or nothing for each check, then a
+        ``pass rate`` row with fractions.
+
+    :param stream: The text stream to write to.
+    :param fmt: The output format.
+    :param color: Use terminal colors for ``"rich"``, if supported.
+    :param checks: The checks to give columns, in family order.
+
+    .. versionadded:: 1.3
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        fmt: SummaryFormat,
+        *,
+        color: bool = True,
+        checks: Mapping[str, Check] | None = None,
+    ) -> None:
+        self.stream = stream
+        self.fmt = fmt
+        self.color = color
+        #: The totals so far
+        self.summary = FleetSummary()
+        #: The checks with a column, set once the header is written
+        self.columns: list[str] = []
+        self._checks = checks
+        #: The family and description of each column
+        self._info: dict[str, tuple[str, str]] = {}
+        self._breaks: set[int] = set()
+        #: Repos without results, held back until the columns are known
+        self._waiting: list[tuple[str, Status]] = []
+        self._started = False
+        self._console: Console | None = None
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _rich(self, *objects: object) -> None:
+        if self._console is None:
+            import rich.console  # noqa: PLC0415
+
+            self._console = rich.console.Console(
+                file=self.stream,
+                color_system="auto" if self.color else None,
+                highlight=False,
+            )
+        self._console.print(*objects)
+
+    def _write(self, *lines: str) -> None:
+        self.stream.write("".join(f"{line}\n" for line in lines))
+
+    def _groups(self) -> list[tuple[str, list[str]]]:
+        """
+        The columns, grouped by family.
+        """
+        groups: list[tuple[str, list[str]]] = []
+        for name in self.columns:
+            family = self._info[name][0]
+            if not groups or groups[-1][0] != family:
+                groups.append((family, []))
+            groups[-1][1].append(name)
+        return groups
+
+    def write_repo(
+        self,
+        header: str,
+        families: Mapping[str, Family],
+        results: Sequence[Result],
+        status: Status,
+    ) -> None:
+        """
+        Count one repo and write its row. The stream is flushed after each row.
+
+        :param header: The name of the repo.
+        :param families: The family mapping.
+        :param results: All the results, not just the failures.
+        :param status: The overall status of the repo.
+        """
+        self.summary.add(families, results, status)
+        if not self._started:
+            if self._checks is None and not results:
+                self._waiting.append((header, status))
+                return
+            self._start(results)
+        self._write_row(header, results, status)
+        self.stream.flush()
+
+    def _start(self, results: Sequence[Result]) -> None:
+        """
+        Pick the columns and write the header, then the rows held back.
+        """
+        self._started = True
+        if self._checks is not None:
+            self._info = {
+                name: (check.family, get_check_description(name, check))
+                for name, check in self._checks.items()
+            }
+        else:
+            self._info = {r.name: (r.family, r.description) for r in results}
+        self.columns = list(self._info)
+        groups = self._groups()
+        self._breaks = set(itertools.accumulate(len(names) for _, names in groups[:-1]))
+        self._write_header(groups)
+        for header, status in self._waiting:
+            self._write_row(header, (), status)
+        self._waiting.clear()
+
+    def _write_row(
+        self, header: str, results: Sequence[Result], status: Status
+    ) -> None:
+        by_name = {r.name: r for r in results}
+        cells = [_cell(by_name.get(name)) for name in self.columns]
+
+        if self.fmt == "rich":
+            import rich.markup  # noqa: PLC0415
+
+            row = "".join(
+                (" " if i in self._breaks else "") + _RICH_CELLS[cell]
+                for i, cell in enumerate(cells)
+            )
+            color = _RICH_STATUS[status]
+            self._rich(f"{row}  [{color}]{rich.markup.escape(header)}")
+        elif self.fmt == "html":
+            self._write(
+                f"<tr><th>{html.escape(header)}</th>"
+                + "".join(_HTML_CELLS[c] for c in cells)
+                + "</tr>"
+            )
+        else:
+            csv.writer(self.stream, lineterminator="\n").writerow(
+                [header, status, *cells]
+            )
+
+    def _write_header(self, groups: list[tuple[str, list[str]]]) -> None:
+        families = self.summary.families
+        if self.fmt == "rich":
+            for family, names in groups:
+                name = get_family_name(families, family)
+                self._rich(f"[bold]{name}:[/bold] [dim]{' '.join(names)}")
+            self._rich()
+        elif self.fmt == "html":
+            self._write(
+                "<table>",
+                "<thead>",
+                "<tr><th></th>"
+                + "".join(
+                    f'<th colspan="{len(names)}">'
+                    f"{html.escape(get_family_name(families, family))}</th>"
+                    for family, names in groups
+                )
+                + "</tr>",
+                "<tr><th>Repo</th>"
+                + "".join(
+                    f'<th title="{html.escape(self._info[name][1])}">'
+                    f"{html.escape(name)}</th>"
+                    for name in self.columns
+                )
+                + "</tr>",
+                "</thead>",
+                "<tbody>",
+            )
+        else:
+            csv.writer(self.stream, lineterminator="\n").writerow(
+                ["repo", "status", *self.columns]
+            )
+
+    def close(self) -> None:
+        """
+        Write the pass rates. Does nothing if already closed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not self._started:
+            self._start(())
+        rates = {r.name: r for r in self.summary.pass_rates()}
+        if self.fmt == "rich":
+            self._close_rich()
+        elif self.fmt == "html":
+            self._close_html(rates)
+        else:
+            csv.writer(self.stream, lineterminator="\n").writerow(
+                [
+                    "pass rate",
+                    "",
+                    *(
+                        "" if (rate := _rate(rates, name)) is None else f"{rate:.3f}"
+                        for name in self.columns
+                    ),
+                ]
+            )
+        self.stream.flush()
+
+    def _close_rich(self) -> None:
+        import rich.table  # noqa: PLC0415
+
+        checks = rich.table.Table(title="Checks", box=None, title_justify="left")
+        checks.add_column("Check")
+        checks.add_column("Family")
+        for column in ("Rate", "Passed", "Failed", "Skipped"):
+            checks.add_column(column, justify="right")
+        for rate in self.summary.pass_rates():
+            checks.add_row(
+                rate.name,
+                get_family_name(self.summary.families, rate.family),
+                _percent(rate.rate),
+                str(rate.passed),
+                str(rate.failed),
+                str(rate.skipped),
+            )
+
+        families = rich.table.Table(title="Families", box=None, title_justify="left")
+        families.add_column("Family")
+        for column in ("Rate", "Passed", "Failed", "Skipped", "Clean repos"):
+            families.add_column(column, justify="right")
+        for fam in self.summary.family_rates():
+            families.add_row(
+                fam.name,
+                _percent(fam.rate),
+                str(fam.passed),
+                str(fam.failed),
+                str(fam.skipped),
+                f"{fam.clean}/{fam.repos}",
+            )
+
+        statuses = ", ".join(
+            f"{count} {status}" for status, count in self.summary.statuses.items()
+        )
+        self._rich()
+        self._rich(checks)
+        self._rich()
+        self._rich(families)
+        self._rich()
+        self._rich(f"[bold]{self.summary.repos} repos[/bold]: {statuses or 'none'}")
+
+    def _close_html(self, rates: Mapping[str, PassRate]) -> None:
+        self._write(
+            "</tbody>",
+            "<tfoot>",
+            "<tr><th>Pass rate</th>"
+            + "".join(
+                f"<td>{_percent(_rate(rates, name))}</td>" for name in self.columns
+            )
+            + "</tr>",
+            "</tfoot>",
+            "</table>",
+        )
+        self._write(
+            "<h3>Families</h3>",
+            "<table>",
+            "<tr><th>Family</th><th>Rate</th><th>Passed</th><th>Failed</th>"
+            "<th>Skipped</th><th>Clean repos</th></tr>",
+        )
+        for fam in self.summary.family_rates():
+            self._write(
+                f"<tr><td>{html.escape(fam.name)}</td><td>{_percent(fam.rate)}</td>"
+                f"<td>{fam.passed}</td><td>{fam.failed}</td><td>{fam.skipped}</td>"
+                f"<td>{fam.clean}/{fam.repos}</td></tr>"
+            )
+        self._write("</table>")
+        statuses = ", ".join(
+            f"{count} {status}" for status, count in self.summary.statuses.items()
+        )
+        self._write(f"<p>{self.summary.repos} repos: {statuses or 'none'}</p>")
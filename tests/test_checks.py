@@ -1,15 +1,22 @@
 import dataclasses
 import importlib.metadata
+import io
+import json
+import pickle
 import sys
+import zipfile
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 from types import ModuleType
-from typing import ClassVar
+from typing import Any, ClassVar
 
 import pytest
 
 import repo_review.processor
 from repo_review._compat.importlib.resources.abc import Traversable
-from repo_review.checks import collect_checks
+from repo_review.checks import collect_checks, compile_selectors, name_matches
+from repo_review.families import sort_family_keys
+from repo_review.json_writer import JSONWriter
 
 
 class D100:
@@ -112,6 +119,30 @@ def test_ignore_filter_single(monkeypatch: pytest.MonkeyPatch) -> None:
     assert results[0].result
 
 
+class D300:
+    "Has literal {braces} in the description"
+
+    family = "pyproject"
+
+    @staticmethod
+    def check() -> bool:
+        return True
+
+
+def test_ignore_unformattable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"D200": D200, "D300": D300},
+    )
+    # Ignored checks aren't formatted
+    _, results = repo_review.processor.process(Path(), ignore={"D300"})
+    assert [r.name for r in results] == ["D200"]
+
+    with pytest.raises(KeyError, match="braces"):
+        repo_review.processor.process(Path())
+
+
 def test_ignore_filter_letter(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         repo_review.processor,
@@ -156,6 +187,41 @@ def test_select_filter_all(monkeypatch: pytest.MonkeyPatch) -> None:
     assert len(results) == 3
 
 
+def test_select_filter_glob(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"D100": D100(), "D200": D200(), "C100": C100(fail=True)},
+    )
+    _, results = repo_review.processor.process(
+        Path(), select={"D1*", "C1??"}, ignore={"C[0-4]00"}
+    )
+
+    assert [r.name for r in results] == ["D100"]
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("PY001", "PY001"),
+        ("PY002", "PY"),
+        ("GH100", "GH1??"),
+        ("GH1000", ""),
+        ("RF101", "RF*"),
+        ("PP002", ""),
+        ("PP101", "PP1*"),
+        ("PP1X", "*X"),
+    ],
+)
+def test_name_matches(name: str, expected: str) -> None:
+    selectors = {"PY001", "PY", "PY0*", "GH1??", "RF*", "*X", "PP1*"}
+    compiled = compile_selectors(selectors)
+
+    assert compiled is compile_selectors(frozenset(selectors))
+    assert compiled.match(name) == expected
+    assert name_matches(name, selectors) == expected
+
+
 def test_string_result(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         repo_review.processor,
@@ -175,3 +241,255 @@ def test_string_result(monkeypatch: pytest.MonkeyPatch) -> None:
     assert check_c101.name == "C101"
     assert check_c101.result is False
     assert check_c101.err_msg == "I'm a custom error message from C101"
+
+
+def test_durations(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"D100": D100, "D200": D200},
+    )
+    with repo_review.processor.record_durations() as timings:
+        _, results = repo_review.processor.process(Path())
+
+    assert all(r.duration is not None for r in results)
+    kinds = {(t.kind, t.name) for t in timings}
+    assert {("check", "D100"), ("check", "D200"), ("fixture", "pyproject")} <= kinds
+    assert all(t.duration.wall >= 0 and t.duration.cpu >= 0 for t in timings)
+
+    simple = repo_review.processor.as_simple_dict(results)
+    assert set(simple["D100"]["duration"] or {}) == {"wall", "cpu"}
+
+
+@dataclasses.dataclass(kw_only=True)
+class B100:
+    "All repos use the same build backend"
+
+    calls: list[int]
+    family: ClassVar[str] = "custom"
+    batch: ClassVar[bool] = True
+
+    def check(self, repos: Sequence[Mapping[str, Any]]) -> list[bool]:
+        """
+        Build backends differ: {name}
+        """
+        self.calls.append(len(repos))
+        backends = [
+            r["pyproject"].get("build-system", {}).get("build-backend") for r in repos
+        ]
+        common = max(set(backends), key=backends.count)
+        return [backend == common for backend in backends]
+
+
+class B200:
+    "Requires the batch check"
+
+    family = "custom"
+    requires: ClassVar[set[str]] = {"B100"}
+
+    @staticmethod
+    def check() -> bool:
+        return True
+
+
+def test_batch_check(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls: list[int] = []
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"B100": B100(calls=calls), "B200": B200()},
+    )
+    roots = []
+    for n, backend in enumerate(["hatchling.build", "hatchling.build", "flit_core"]):
+        root = tmp_path / f"repo{n}"
+        root.mkdir()
+        root.joinpath("pyproject.toml").write_text(
+            f'[build-system]\nbuild-backend = "{backend}"\n', encoding="utf-8"
+        )
+        roots.append(root)
+
+    processed = repo_review.processor.process_many(roots)
+
+    assert calls == [3]
+    assert [[r.result for r in p.results] for p in processed] == [
+        [True, True],
+        [True, True],
+        [False, None],
+    ]
+    assert processed[2].results[0].err_msg.strip() == "Build backends differ: B100"
+
+    _, results = repo_review.processor.process(roots[2])
+    assert calls == [3, 1]
+    assert [r.result for r in results] == [True, True]
+
+
+class B300:
+    "Modifies the fixtures"
+
+    family = "custom"
+    batch: ClassVar[bool] = True
+
+    @staticmethod
+    def check(repos: Sequence[dict[str, Any]]) -> list[bool]:
+        for repo in repos:
+            repo["pyproject"]["build-system"] = {}
+        return [True] * len(repos)
+
+
+class B400:
+    "Sees the original fixtures"
+
+    family = "custom"
+    requires: ClassVar[set[str]] = {"B300"}
+
+    @staticmethod
+    def check(pyproject: dict[str, Any]) -> bool:
+        return "build-backend" in pyproject["build-system"]
+
+
+def test_batch_check_copies_fixtures(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"B300": B300(), "B400": B400()},
+    )
+    roots = []
+    for n in range(2):
+        root = tmp_path / f"repo{n}"
+        root.mkdir()
+        root.joinpath("pyproject.toml").write_text(
+            '[build-system]\nbuild-backend = "flit_core"\n', encoding="utf-8"
+        )
+        roots.append(root)
+
+    with pytest.warns(UserWarning, match="B300 modified the input fixtures"):
+        processed = repo_review.processor.process_many(roots)
+
+    assert [[r.result for r in p.results] for p in processed] == [[True, True]] * 2
+    # Each repo gets its share of the batch time
+    durations = [p.results[0].duration for p in processed]
+    assert durations[0] == durations[1]
+
+
+def test_as_simple_dict(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"C100": C100(fail=False), "C101": C100(fail=True), "D200": D200()},
+    )
+    _, results = repo_review.processor.process(Path())
+
+    simple = repo_review.processor.as_simple_dict(results)
+
+    assert simple == {
+        r.name: {k: v for k, v in dataclasses.asdict(r).items() if k != "name"}
+        for r in results
+    }
+    assert pickle.loads(pickle.dumps(results)) == results
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_json_writer(monkeypatch: pytest.MonkeyPatch, *, compact: bool) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"C100": C100(fail=False), "C101": C100(fail=True), "D200": D200()},
+    )
+    families, results = repo_review.processor.process(Path())
+    report = {
+        "status": "errors",
+        "families": {k: families[k] for k in sort_family_keys(families)},
+        "checks": repo_review.processor.as_simple_dict(results),
+    }
+
+    single = io.StringIO()
+    JSONWriter(single, compact=compact).write_report(families, results, status="errors")
+    multi = io.StringIO()
+    with JSONWriter(multi, compact=compact, multi=True) as writer:
+        writer.write_report(families, results, status="errors", header="a")
+        writer.write_report(families, [], status="empty", header="b")
+
+    if compact:
+        assert single.getvalue() == json.dumps(report, separators=(",", ":")) + "\n"
+    else:
+        assert single.getvalue() == json.dumps(report, indent=2) + "\n"
+    assert json.loads(multi.getvalue()) == {
+        "a": report,
+        "b": {**report, "status": "empty", "checks": {}},
+    }
+
+
+class F100:
+    "Package modules have docstrings"
+
+    family = "custom"
+    glob = "**/__init__.py"
+
+    @staticmethod
+    def check(path: Traversable) -> bool | None:
+        """
+        {name}: Add a docstring.
+        """
+        text = path.read_text()
+        if text.startswith("# skip"):
+            return None
+        return text.startswith('"""')
+
+
+FILES = {
+    "pkg/__init__.py": '"""Docs"""\n',
+    "pkg/sub/__init__.py": "x = 1\n",
+    "pkg/other/__init__.py": "y = 2\n",
+    "pkg/other/module.py": "z = 3\n",
+}
+
+
+def test_per_file_check(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(
+        repo_review.processor, "collect_checks", lambda _: {"F100": F100()}
+    )
+    for name, text in FILES.items():
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).write_text(text, encoding="utf-8")
+
+    _, (result,) = repo_review.processor.process(tmp_path)
+
+    assert result.result is False
+    assert result.err_msg == (
+        "2 of 3 files failed:\n\n"
+        "`pkg/other/__init__.py`: F100: Add a docstring.\n\n"
+        "`pkg/sub/__init__.py`: F100: Add a docstring."
+    )
+
+
+def test_per_file_check_no_failures(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        repo_review.processor, "collect_checks", lambda _: {"F100": F100()}
+    )
+
+    _, (result,) = repo_review.processor.process(tmp_path)
+    assert result.result is True
+
+    tmp_path.joinpath("__init__.py").write_text("# skip\n", encoding="utf-8")
+    _, (result,) = repo_review.processor.process(tmp_path)
+    assert result.result is None
+
+
+def test_matching_files_without_glob(tmp_path: Path) -> None:
+    with zipfile.ZipFile(tmp_path / "repo.zip", "w") as zf:
+        for name, text in FILES.items():
+            zf.writestr(name, text)
+    root = zipfile.Path(tmp_path / "repo.zip")
+
+    files = repo_review.processor._matching_files(root, "**/__init__.py")
+
+    assert [rel for rel, _ in files] == [
+        "pkg/__init__.py",
+        "pkg/other/__init__.py",
+        "pkg/sub/__init__.py",
+    ]
+    assert files[0][1].read_text() == '"""Docs"""\n'
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import repo_review.daemon
+from repo_review.__main__ import main
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or sys.platform == "win32",
+    reason="Requires Unix sockets",
+)
+
+DIR = Path(__file__).parent.resolve()
+
+
+@pytest.fixture
+def sock() -> Iterator[Path]:
+    # Socket paths are limited to ~100 characters, so avoid tmp_path
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp) / "repo-review.sock"
+
+
+@contextlib.contextmanager
+def daemon(sock: Path, *, fork: bool = False) -> Iterator[threading.Thread]:
+    thread = threading.Thread(
+        target=repo_review.daemon.serve, args=(sock,), kwargs={"fork": fork}
+    )
+    thread.start()
+    for _ in range(500):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(sock))
+            except OSError:
+                time.sleep(0.01)
+            else:
+                break
+    try:
+        yield thread
+    finally:
+        repo_review.daemon.shutdown(sock)
+        thread.join()
+
+
+def run_direct(args: list[str]) -> tuple[str, int]:
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            main(args)
+    except SystemExit as e:
+        return out.getvalue(), int(e.code or 0)
+    return out.getvalue(), 0
+
+
+def without_durations(output: str) -> dict[str, object]:
+    data = json.loads(output)
+    for check in data["checks"].values():
+        del check["duration"]
+    return data  # type: ignore[no-any-return]
+
+
+@pytest.mark.usefixtures("local_entry_points")
+@pytest.mark.parametrize(
+    "fork",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=[
+                pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork"),
+                pytest.mark.filterwarnings("ignore:.*fork:DeprecationWarning"),
+            ],
+        ),
+    ],
+)
+def test_daemon_matches_cli(
+    sock: Path, monkeypatch: pytest.MonkeyPatch, *, fork: bool
+) -> None:
+    monkeypatch.chdir(DIR / "test_utilities")
+    expected, expected_code = run_direct(["--format", "json"])
+    err_expected, err_code = run_direct(["--format", "html", "--select", "PP"])
+
+    with daemon(sock, fork=fork):
+        monkeypatch.chdir(DIR)
+        out, err = io.StringIO(), io.StringIO()
+        code = repo_review.daemon.request(
+            ["test_utilities", "--format", "json"], path=sock, stdout=out, stderr=err
+        )
+        assert code == expected_code
+        assert without_durations(out.getvalue()) == without_durations(expected)
+
+        monkeypatch.chdir(DIR / "test_utilities")
+        out = io.StringIO()
+        code = repo_review.daemon.request(
+            ["--format", "html", "--select", "PP"], path=sock, stdout=out, stderr=err
+        )
+        assert code == err_code
+        assert out.getvalue() == err_expected
+
+        code = repo_review.daemon.request(
+            ["--format", "nope"], path=sock, stdout=out, stderr=err
+        )
+        assert code == 2
+        assert "invalid choice: 'nope'" in err.getvalue()
+
+    assert not sock.exists()
+    assert Path.cwd() == DIR / "test_utilities"
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_daemon_stale_socket(sock: Path) -> None:
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(sock))
+    stale.close()
+
+    with daemon(sock), pytest.raises(RuntimeError, match="already listening"):
+        repo_review.daemon.serve(sock)
+
+
+def test_client_no_daemon(
+    sock: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("REPO_REVIEW_SOCKET", str(sock))
+    assert repo_review.daemon.default_socket_path() == sock
+    with pytest.raises(SystemExit) as e:
+        repo_review.daemon.client_main(["."])
+    assert e.value.code == 1
+    assert "No repo-review daemon" in capsys.readouterr().err
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_daemon_private_socket(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("REPO_REVIEW_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(tempfile, "tempdir", tmp)
+        path = repo_review.daemon.default_socket_path()
+        assert path.parent == Path(tmp) / f"repo-review-{os.getuid()}"
+
+        with daemon(path):
+            assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+            assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+        # Another user could have made it
+        path.parent.chmod(0o755)
+        with pytest.raises(PermissionError, match="only the current user"):
+            repo_review.daemon.serve(path)
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_client_checks_owner(
+    sock: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("REPO_REVIEW_SOCKET", str(sock))
+    uid = os.getuid()
+    with daemon(sock), monkeypatch.context() as m:
+        m.setattr(os, "getuid", lambda: uid + 1)
+        with pytest.raises(SystemExit) as e:
+            repo_review.daemon.client_main(["."])
+    assert e.value.code == 1
+    assert "owned by another user" in capsys.readouterr().err
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_daemon_survives_bad_clients(
+    sock: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.chdir(DIR / "test_utilities")
+    expected, expected_code = run_direct(["--format", "json"])
+
+    caplog.set_level(logging.INFO, "repo_review.daemon")
+    with daemon(sock):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(sock))
+            client.sendall(b"not json\n")
+            assert client.recv(1) == b""
+
+        # Like Ctrl-C right after starting a run
+        message = {"argv": ["--format", "json"], "cwd": str(Path.cwd()), "env": {}}
+        for _ in range(3):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(sock))
+                client.sendall(json.dumps(message).encode() + b"\n")
+
+        out, err = io.StringIO(), io.StringIO()
+        code = repo_review.daemon.request(
+            ["--format", "json"], path=sock, stdout=out, stderr=err
+        )
+        assert code == expected_code
+        assert without_durations(out.getvalue()) == without_durations(expected)
+        assert err.getvalue() == ""
+
+    assert "Could not handle a request" in caplog.text
+    assert "went away" in caplog.text
+    assert not sock.exists()
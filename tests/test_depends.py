@@ -1,4 +1,9 @@
+import asyncio
+import threading
+import time
+from collections.abc import Generator
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -90,3 +95,335 @@ def test_requires_missing_check(monkeypatch: pytest.MonkeyPatch) -> None:
     # The missing dependency is treated as passed, so the check still runs.
     assert results[1].name == "E300"
     assert results[1].result
+
+
+class E400:
+    "Fails"
+
+    family = "example"
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Always fails.
+        """
+
+        return False
+
+
+class E500:
+    "Depends on a failing check"
+
+    family = "example"
+    requires = frozenset(["E400"])
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Can't be false.
+        """
+
+        return True
+
+
+def test_iter_process_dependency_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E500": E500, "E400": E400, "E200": E200, "E100": E100},
+    )
+    results = list(repo_review.processor.iter_process(Path()))
+
+    names = [r.name for r in results]
+    assert names.index("E100") < names.index("E200")
+    assert names.index("E400") < names.index("E500")
+    assert {r.name: r.result for r in results} == {
+        "E100": True,
+        "E200": True,
+        "E400": False,
+        "E500": None,
+    }
+
+
+def test_async_iter_process_matches_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E100": E100, "E200": E200, "E400": E400, "E500": E500},
+    )
+
+    async def collect() -> list[repo_review.processor.Result]:
+        return [r async for r in repo_review.processor.async_iter_process(Path())]
+
+    families, expected = repo_review.processor.process(Path())
+    results = asyncio.run(collect())
+
+    assert repo_review.processor.sort_results(families, results) == expected
+
+
+_release = threading.Event()
+
+
+class E600:
+    "Hangs"
+
+    family = "example"
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Never finishes in time.
+        """
+
+        _release.wait(5)
+        return True
+
+
+class E700:
+    "Depends on a hanging check"
+
+    family = "example"
+    requires = frozenset(["E600"])
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Can't be false.
+        """
+
+        return True
+
+
+@pytest.fixture
+def hanging_checks(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E100": E100, "E600": E600, "E700": E700},
+    )
+    _release.clear()
+    yield
+    _release.set()
+
+
+@pytest.mark.usefixtures("hanging_checks")
+def test_check_timeout() -> None:
+    _, results = repo_review.processor.process(Path(), check_timeout=0.05)
+
+    res = {r.name: r for r in results}
+    assert res["E100"].result
+    assert res["E600"].result is None
+    assert res["E600"].skip_reason == "Timed out after 0.05s"
+    assert res["E700"].result is None
+    assert not res["E700"].skip_reason
+
+
+@pytest.mark.usefixtures("hanging_checks")
+def test_check_timeout_async() -> None:
+    async def collect() -> list[repo_review.processor.Result]:
+        return [
+            r
+            async for r in repo_review.processor.async_iter_process(
+                Path(), check_timeout=0.05
+            )
+        ]
+
+    res = {r.name: r for r in asyncio.run(collect())}
+    assert res["E100"].result
+    assert res["E600"].result is None
+    assert res["E600"].skip_reason == "Timed out after 0.05s"
+    assert res["E700"].result is None
+
+
+_go = threading.Event()
+_mutated = threading.Event()
+
+
+class E1000:
+    "Modifies a fixture after timing out"
+
+    family = "example"
+
+    @staticmethod
+    def check(pyproject: dict[str, Any]) -> bool:
+        """
+        Never finishes in time.
+        """
+
+        _go.wait(5)
+        pyproject["mutated"] = True
+        _mutated.set()
+        return True
+
+
+class E1100:
+    "Takes a while"
+
+    family = "example"
+
+    def __init__(self, requires: frozenset[str] = frozenset()) -> None:
+        self.requires = requires
+
+    def check(self) -> bool:
+        """
+        Can't be false.
+        """
+
+        time.sleep(0.2)
+        return True
+
+
+class E1200:
+    "Runs after E1000 timed out"
+
+    family = "example"
+    requires = frozenset(["E1102"])
+
+    @staticmethod
+    def check(pyproject: dict[str, Any]) -> bool:
+        """
+        Sees a modified fixture.
+        """
+
+        _go.set()
+        _mutated.wait(1)
+        return "mutated" not in pyproject
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_timed_out_check_gets_own_fixtures(
+    monkeypatch: pytest.MonkeyPatch, *, use_async: bool
+) -> None:
+    # E1200 starts after two E1100s, which take longer than the timeout together
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {
+            "E1000": E1000,
+            "E1101": E1100(),
+            "E1102": E1100(frozenset(["E1101"])),
+            "E1200": E1200,
+        },
+    )
+    _go.clear()
+    _mutated.clear()
+
+    async def collect() -> list[repo_review.processor.Result]:
+        return [
+            r
+            async for r in repo_review.processor.async_iter_process(
+                Path(), check_timeout=0.3
+            )
+        ]
+
+    try:
+        if use_async:
+            results = asyncio.run(collect())
+        else:
+            _, results = repo_review.processor.process(Path(), check_timeout=0.3)
+    finally:
+        _go.set()
+
+    res = {r.name: r for r in results}
+    assert res["E1000"].skip_reason == "Timed out after 0.3s"
+    assert res["E1200"].result
+
+
+@pytest.mark.usefixtures("hanging_checks")
+def test_repo_timeout_from_config(tmp_path: Path) -> None:
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.repo-review]\ntimeout = 0.05\n", encoding="utf-8"
+    )
+    _, results = repo_review.processor.process(tmp_path)
+
+    res = {r.name: r for r in results}
+    assert res["E600"].result is None
+    assert res["E600"].skip_reason == "Repo time budget of 0.05s exceeded"
+    assert res["E700"].result is None
+
+
+class E800:
+    "Cheap failure"
+
+    family = "example"
+    cost = 0.1
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Always fails.
+        """
+
+        return False
+
+
+class E900:
+    "Expensive"
+
+    family = "example"
+    cost = 10.0
+
+    @staticmethod
+    def check() -> bool:
+        """
+        Can't be false.
+        """
+
+        return True
+
+
+def test_cost_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E900": E900, "E800": E800, "E400": E400},
+    )
+    names = [r.name for r in repo_review.processor.iter_process(Path())]
+    assert names == ["E400", "E800", "E900"]
+
+    costs = {"E400": 20.0, "E800": 30.0}
+    names = [r.name for r in repo_review.processor.iter_process(Path(), costs=costs)]
+    assert names == ["E900", "E400", "E800"]
+
+
+def test_max_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E900": E900, "E800": E800, "E400": E400, "E500": E500},
+    )
+    _, results = repo_review.processor.process(Path(), max_failures=1)
+
+    res = {r.name: r for r in results}
+    # E400 has no cost hint, so it is treated as free and runs first
+    assert res["E400"].result is False
+    assert res["E800"].result is None
+    assert res["E800"].skip_reason == "Not run, stopped after 1 failure"
+    assert res["E900"].result is None
+    assert res["E500"].result is None
+
+    _, results = repo_review.processor.process(Path(), max_failures=2)
+    res = {r.name: r for r in results}
+    assert res["E800"].result is False
+    assert res["E900"].skip_reason == "Not run, stopped after 2 failures"
+
+
+def test_max_failures_async(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_checks",
+        lambda _: {"E800": E800, "E500": E500, "E400": E400},
+    )
+
+    async def collect() -> list[repo_review.processor.Result]:
+        return [
+            r
+            async for r in repo_review.processor.async_iter_process(
+                Path(), max_failures=1, costs={"E400": 1.0}
+            )
+        ]
+
+    res = {r.name: r for r in asyncio.run(collect())}
+    assert res["E800"].result is False
+    assert sum(r.result is False for r in res.values()) >= 1
+    assert res["E500"].result is None
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import repo_review.__main__
+import repo_review.gittree
+from repo_review.diff import diff, main
+from repo_review.ghpath import GHPath
+from repo_review.gittree import git_tree, github_tree
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+GOOD = '[build-system]\nrequires = []\nbuild-backend = "backend"\n'
+BAD = "[build-system]\nrequires = []\n"
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=A", "-c", "user.email=a@b.c", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "tests").mkdir(parents=True)
+    (repo / "tests/test_it.py").write_text("", encoding="utf-8")
+    (repo / "README.md").write_text("# Repo\n", encoding="utf-8")
+    (repo / "pyproject.toml").write_text(GOOD, encoding="utf-8")
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "base")
+    (repo / "pyproject.toml").write_text(BAD, encoding="utf-8")
+    git(repo, "commit", "-qam", "head")
+    return repo
+
+
+def test_git_tree(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    orig = repo_review.gittree._git
+
+    def counting_git(path: Path, *args: str) -> bytes:
+        calls.append(args[0])
+        return orig(path, *args)
+
+    monkeypatch.setattr(repo_review.gittree, "_git", counting_git)
+
+    cache: dict[str, bytes] = {}
+    base = git_tree("main~1", repo, cache=cache)
+    head = git_tree("main", repo, cache=cache)
+    assert str(base / "tests") == "main~1:tests"
+    assert [p.name for p in base.iterdir()] == ["README.md", "pyproject.toml", "tests"]
+    assert (base / "tests").is_dir()
+    assert not (base / "tests").is_file()
+    assert (base / "./tests/test_it.py").is_file()
+    assert base.joinpath("pyproject.toml").read_text() == GOOD
+    assert head.joinpath("pyproject.toml").read_text() == BAD
+    with pytest.raises(FileNotFoundError):
+        head.joinpath("missing.txt").read_text()
+
+    # The README blob is the same in both refs, so it's only read once
+    assert base.joinpath("README.md").read_text() == "# Repo\n"
+    assert head.joinpath("README.md").read_text() == "# Repo\n"
+    assert calls.count("cat-file") == 3
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_diff(repo: Path) -> None:
+    base = git_tree("main~1", repo)
+    head = git_tree("main", repo)
+    families, changes, rerun = diff(base, head)
+
+    assert "pyproject" in families
+    assert [
+        (c.name, c.base and c.base.result, c.head and c.head.result) for c in changes
+    ] == [("PP002", True, False)]
+    # Only the checks that use the pyproject fixture ran again
+    assert set(rerun) == {"PP002", "PP003", "PP301"}
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_diff_cli(repo: Path) -> None:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), pytest.raises(SystemExit) as e:
+        main(["main~1..main", str(repo), "--format", "json"])
+    assert e.value.code == 3
+
+    out = json.loads(output.getvalue())
+    assert out["base"] == "main~1:."
+    assert list(out["changes"]) == ["PP002"]
+    assert out["changes"]["PP002"]["base"]["result"] is True
+    assert out["changes"]["PP002"]["head"]["result"] is False
+
+    # Nothing changed, so nothing is run again
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        main(["main..main", str(repo), "--format", "json"])
+    assert json.loads(output.getvalue())["changes"] == {}
+    assert json.loads(output.getvalue())["rerun"] == []
+
+
+def test_diff_cli_errors(repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as e:
+        main(["main", str(repo)])
+    assert e.value.code == 2
+
+    with pytest.raises(SystemExit) as e:
+        main(["main..nope", str(repo)])
+    assert e.value.code == 1
+    assert "Error:" in capsys.readouterr().err
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_directory_named_diff(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "diff").mkdir()
+    (tmp_path / "diff/pyproject.toml").write_text(GOOD, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        repo_review.__main__.main(["diff", "--format", "json", "--select", "PP002"])
+    assert json.loads(output.getvalue())["checks"]["PP002"]["result"] is True
+
+
+def test_github_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    logo = b"\x89PNG\r\n\x1a\n\xff"
+    files = {
+        "v1": {"logo.png": logo, "pyproject.toml": GOOD.encode()},
+        "v2": {"pyproject.toml": BAD.encode()},
+    }
+    urls = []
+
+    def open_url(url: str) -> str:
+        urls.append(url)
+        ref = url.rpartition("/")[2].partition("?")[0]
+        tree = [{"path": "src", "type": "tree", "sha": "0"}] + [
+            {"path": f"src/{name}", "type": "blob", "sha": f"{ref}-{name}"}
+            for name in files.get(ref, {})
+        ]
+        return json.dumps({"tree": tree, "truncated": ref == "big"})
+
+    def open_url_bytes(url: str) -> bytes:
+        urls.append(url)
+        ref, _, path = url.removeprefix(
+            "https://raw.githubusercontent.com/org/repo/"
+        ).partition("/")
+        return files[ref][path.removeprefix("src/")]
+
+    monkeypatch.setattr(GHPath, "open_url", staticmethod(open_url))
+    monkeypatch.setattr(GHPath, "open_url_bytes", staticmethod(open_url_bytes))
+
+    base = github_tree("org/repo", "v1").joinpath("src")
+    assert base.name == "src"
+    assert str(base) == "gh:org/repo@v1:src"
+    assert [p.name for p in base.iterdir()] == ["logo.png", "pyproject.toml"]
+    assert base.joinpath("pyproject.toml").read_text() == GOOD
+    assert base.joinpath("pyproject.toml").read_text() == GOOD
+    assert (
+        urls[-1] == "https://raw.githubusercontent.com/org/repo/v1/src/pyproject.toml"
+    )
+    assert len(urls) == 2
+    # Files that aren't text are kept as they are
+    assert base.joinpath("logo.png").read_bytes() == logo
+
+    with pytest.raises(RuntimeError, match="truncated"):
+        github_tree("org/repo", "big")
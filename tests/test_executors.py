@@ -0,0 +1,81 @@
+import concurrent.futures
+import functools
+import sys
+from pathlib import Path
+
+import pytest
+
+import repo_review.processor
+from repo_review.executors import get_executor, interpreters_available, review
+from repo_review.ghpath import _parse_remote
+from repo_review.processor import ResultDict
+
+
+@pytest.fixture(autouse=True)
+def patch_entry_points(local_entry_points: object) -> None:
+    pass
+
+
+def _without_durations(report: dict[str, ResultDict]) -> dict[str, object]:
+    return {
+        name: {k: v for k, v in result.items() if k != "duration"}
+        for name, result in report.items()
+    }
+
+
+def test_review_threads() -> None:
+    _, expected = repo_review.processor.process(Path(), subdir="tests")
+    targets = ["."] * 4
+
+    with get_executor(2, backend="threads") as pool:
+        assert isinstance(pool, concurrent.futures.ThreadPoolExecutor)
+        reports = list(pool.map(functools.partial(review, subdir="tests"), targets))
+
+    assert [_without_durations(r) for r in reports] == [
+        _without_durations(repo_review.processor.as_simple_dict(expected))
+    ] * 4
+
+
+def test_review_select() -> None:
+    report = review(".", select=["PY"], ignore=["PY002"])
+
+    assert "PY001" in report
+    assert "PY002" not in report
+    assert all(name.startswith("PY") for name in report)
+
+
+def test_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delattr(concurrent.futures, "InterpreterPoolExecutor", raising=False)
+
+    assert not interpreters_available()
+    with get_executor(1) as pool:
+        assert isinstance(pool, concurrent.futures.ThreadPoolExecutor)
+    with pytest.raises(RuntimeError, match="subinterpreters"):
+        get_executor(1, backend="interpreters")
+
+
+def test_no_interpreters_on_webassembly(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        concurrent.futures, "InterpreterPoolExecutor", object, raising=False
+    )
+    monkeypatch.setattr(sys, "platform", "emscripten")
+
+    assert not interpreters_available()
+
+
+def test_parse_remote() -> None:
+    assert _parse_remote("gh:org/repo@v1:src/pkg") == ("org/repo", "v1", "src/pkg")
+    assert _parse_remote("gh:org/repo") == ("org/repo", "HEAD", "")
+    assert _parse_remote("some/path") is None
+
+
+@pytest.mark.skipif(not interpreters_available(), reason="Requires Python 3.14+")
+def test_interpreters_backend() -> None:
+    with get_executor(2) as pool:
+        assert not isinstance(pool, concurrent.futures.ThreadPoolExecutor)
+        # Subinterpreters load the installed plugins, not the patched ones
+        reports = list(pool.map(review, [".", "."]))
+
+    assert reports[0].keys() == reports[1].keys()
+    assert reports[0]["PY001"]["result"] is True
+    assert reports[0]["PY001"]["family"] == "general"
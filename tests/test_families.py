@@ -7,6 +7,7 @@ from repo_review.families import (
     sort_family_keys,
 )
 from repo_review.html import to_html
+from repo_review.processor import Result, _render_markdown, md_as_html
 
 
 def test_getters():
@@ -68,3 +69,27 @@ def test_sort_family_keys():
         "github",
         "validate-pyproject",
     ]
+
+
+def test_md_as_html_cached():
+    _render_markdown.cache_clear()
+    assert md_as_html("") == ""
+    assert _render_markdown.cache_info().misses == 0
+
+    results = [
+        Result(
+            family="general",
+            name=f"G{i}",
+            description="Desc",
+            result=False,
+            err_msg="Needs *this*",
+        )
+        for i in range(3)
+    ]
+    results.append(Result(family="general", name="G9", description="Ok", result=True))
+    html = to_html({"general": Family()}, results)
+
+    assert html.count("Needs <em>this</em>") == 3
+    info = _render_markdown.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
@@ -1,13 +1,29 @@
 import importlib.metadata
 import sys
+import threading
+import time
+from collections.abc import Iterator
 from pathlib import Path
 from types import ModuleType
+from typing import Any
 
 import pytest
 
+import repo_review.fixtures
+import repo_review.processor
 from repo_review._compat.importlib.resources.abc import Traversable
 from repo_review.checks import collect_checks
-from repo_review.fixtures import apply_fixtures, compute_fixtures
+from repo_review.fixtures import (
+    apply_fixtures,
+    clear_session_fixtures,
+    compute_fixtures,
+    pyproject,
+)
+from repo_review.processor import process
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 class D100:
@@ -91,6 +107,208 @@ def test_unknown_fixture_error() -> None:
         compute_fixtures(Path(), Path(), {"bad_fixture": bad_fixture})
 
 
+@pytest.fixture
+def fresh_session() -> Iterator[None]:
+    clear_session_fixtures()
+    yield
+    clear_session_fixtures()
+
+
+@pytest.mark.usefixtures("fresh_session")
+def test_session_fixture() -> None:
+    calls: list[str] = []
+
+    def table() -> dict[str, int]:
+        calls.append("table")
+        return {"answer": 42}
+
+    def answer(table: dict[str, int]) -> int:
+        return table["answer"]
+
+    table.scope = "session"  # type: ignore[attr-defined]
+    answer.scope = "session"  # type: ignore[attr-defined]
+
+    fixtures: dict[str, Callable[..., Any]] = {
+        "table": table,
+        "answer": answer,
+        "simple": simple,
+    }
+    first = compute_fixtures(Path("a"), Path("a"), fixtures)
+    second = compute_fixtures(Path("b"), Path("b"), fixtures)
+
+    assert calls == ["table"]
+    assert first["table"] is second["table"]
+    assert second["answer"] == 42
+    assert second["simple"] == "b"
+
+
+@pytest.mark.usefixtures("fresh_session")
+def test_session_fixtures_concurrent() -> None:
+    # Unrelated session fixtures don't wait for each other
+    barrier = threading.Barrier(2, timeout=10)
+
+    def first() -> str:
+        barrier.wait()
+        return "first"
+
+    def second() -> str:
+        barrier.wait()
+        return "second"
+
+    first.scope = "session"  # type: ignore[attr-defined]
+    second.scope = "session"  # type: ignore[attr-defined]
+
+    fixtures = compute_fixtures(
+        Path(), Path(), {"first": first, "second": second}, workers=2
+    )
+    assert fixtures["first"] == "first"
+    assert fixtures["second"] == "second"
+
+
+@pytest.mark.usefixtures("fresh_session", "local_entry_points")
+def test_session_fixture_not_copied(monkeypatch: pytest.MonkeyPatch) -> None:
+    def policy() -> dict[str, list[str]]:
+        return {"allowed": ["MIT"]}
+
+    policy.scope = "session"  # type: ignore[attr-defined]
+    seen: list[dict[str, list[str]]] = []
+
+    class S100:
+        "Reads the policy"
+
+        family = "general"
+
+        @staticmethod
+        def check(policy: dict[str, list[str]]) -> bool:
+            seen.append(policy)
+            return True
+
+    class S200:
+        "Modifies the policy"
+
+        family = "general"
+
+        @staticmethod
+        def check(policy: dict[str, list[str]]) -> bool:
+            policy["allowed"].append("GPL")
+            return True
+
+    monkeypatch.setattr(
+        repo_review.processor,
+        "collect_fixtures",
+        lambda: {"pyproject": pyproject, "policy": policy},
+    )
+    monkeypatch.setattr(
+        repo_review.processor, "collect_checks", lambda _: {"S100": S100}
+    )
+    process(Path())
+    process(Path())
+    assert seen[0] is seen[1]
+
+    monkeypatch.setattr(
+        repo_review.processor, "collect_checks", lambda _: {"S200": S200}
+    )
+    with pytest.warns(UserWarning, match="S200 modified the input fixtures"):
+        process(Path())
+
+    # Later repos get an unmodified copy
+    monkeypatch.setattr(
+        repo_review.processor, "collect_checks", lambda _: {"S100": S100}
+    )
+    process(Path())
+    assert seen[-1] == {"allowed": ["MIT"]}
+
+
+def test_session_fixture_requires_session() -> None:
+    def bad_fixture(package: Traversable) -> str:
+        return str(package)
+
+    bad_fixture.scope = "session"  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError, match="can't request repo fixture 'package'"):
+        compute_fixtures(Path(), Path(), {"bad_fixture": bad_fixture})
+
+
+def test_concurrent_fixtures() -> None:
+    barrier = threading.Barrier(2, timeout=10)
+
+    def first() -> str:
+        barrier.wait()
+        return "first"
+
+    def second() -> str:
+        barrier.wait()
+        return "second"
+
+    def both(first: str, second: str, not_simple: str) -> str:
+        return f"{first} {second} {not_simple}"
+
+    fixtures = compute_fixtures(
+        Path(),
+        Path(),
+        {
+            "first": first,
+            "second": second,
+            "both": both,
+            "simple": simple,
+            "not_simple": not_simple,
+        },
+        workers=4,
+    )
+
+    assert fixtures["both"] == "first second . ."
+
+
+def test_concurrent_fixtures_error() -> None:
+    def fails() -> str:
+        msg = "first failure"
+        raise RuntimeError(msg)
+
+    def also_fails(fails: str) -> str:
+        return fails
+
+    def later(simple: str) -> str:
+        time.sleep(0.01)
+        msg = f"second failure after {simple}"
+        raise RuntimeError(msg)
+
+    unevaluated: dict[str, Callable[..., Any]] = {
+        "simple": simple,
+        "later": later,
+        "fails": fails,
+        "also_fails": also_fails,
+    }
+    with pytest.raises(RuntimeError) as serial:
+        compute_fixtures(Path(), Path(), unevaluated)
+    with pytest.raises(RuntimeError) as concurrent:
+        compute_fixtures(Path(), Path(), unevaluated, workers=4)
+
+    assert str(concurrent.value) == str(serial.value)
+
+
+class Methods:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def method(self, simple: str) -> str:
+        return f"{self.value} {simple}"
+
+    @classmethod
+    def cls_method(cls, package: Traversable) -> str:
+        return f"{cls.__name__} {package}"
+
+
+def test_apply_fixtures_methods() -> None:
+    fixtures = {"simple": "s", "package": Path()}
+
+    assert apply_fixtures(fixtures, Methods("a").method) == "a s"
+    assert apply_fixtures(fixtures, Methods("b").method) == "b s"
+    assert apply_fixtures(fixtures, Methods.cls_method) == "Methods ."
+    assert (
+        apply_fixtures(fixtures, lambda package, simple: f"{package}{simple}") == ".s"
+    )
+
+
 @pytest.mark.parametrize("some_bool", [True, False])
 def test_process_checks(monkeypatch: pytest.MonkeyPatch, some_bool: bool) -> None:
     ep = importlib.metadata.EntryPoint(name="x", group="y", value="test_module:f")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+DIR = Path(__file__).parent.resolve()
+
+# Self time of all repo_review modules when importing the CLI, in microseconds.
+# Typically around 10-15 ms; the budget leaves room for slow CI machines.
+IMPORT_BUDGET_US = 30_000
+
+# Only needed for some output formats, async use, --daemon, --store, or the
+# HTTP service
+LAZY_MODULES = {
+    "asyncio",
+    "markdown_it",
+    "repo_review.daemon",
+    "repo_review.service",
+    "repo_review.store",
+    "rich",
+    "sqlite3",
+}
+
+# Not imported by repo_review itself either, but other modules import them
+# (importlib.metadata imports socket through email, and plugins use subprocess)
+INDIRECT_MODULES = {"socket", "subprocess"}
+
+ENTRY_POINTS = """\
+import importlib.metadata
+
+orig_ep = importlib.metadata.entry_points
+
+def new_ep(*, group):
+    if group in {"repo_review.checks", "repo_review.families"}:
+        name = group.rsplit(".", 1)[-1]
+        value = f"pyproject:repo_review_{name}"
+        return [importlib.metadata.EntryPoint(name="pyproject", group=group, value=value)]
+    if group == "repo_review.fixtures":
+        return [e for e in orig_ep(group=group) if e.module.startswith("repo_review.")]
+    return orig_ep(group=group)
+
+importlib.metadata.entry_points = new_ep
+"""
+
+pytestmark = pytest.mark.skipif(
+    sys.implementation.name != "cpython", reason="-X importtime is CPython only"
+)
+
+
+@pytest.fixture(scope="module")
+def pycache(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("pycache")
+
+
+def _run(code: str, pycache: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(DIR / "test_utilities"), env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, "-X", f"pycache_prefix={pycache}", *args, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def _imported(args: list[str], pycache: Path) -> set[str]:
+    code = textwrap.dedent(
+        f"""\
+        from repo_review.__main__ import main
+        try:
+            main({args!r})
+        except SystemExit:
+            pass
+        import sys
+        print("\\n", *sorted(sys.modules), file=sys.stderr)
+        """
+    )
+    result = _run(ENTRY_POINTS + code, pycache)
+    return set(result.stderr.splitlines()[-1].split())
+
+
+def _lazy(modules: set[str]) -> set[str]:
+    return {m for m in modules if m in LAZY_MODULES or m.split(".")[0] in LAZY_MODULES}
+
+
+def _importers(stderr: str) -> dict[str, str]:
+    """
+    Map each module in ``-X importtime`` output to the module that imported it.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        name = line.rpartition("|")[2]
+        modules.append((len(name) - len(name.lstrip()), name.strip()))
+    # Each module is listed after the ones it imports, which are indented more
+    return {
+        name: next((n for d, n in modules[i + 1 :] if d < depth), "")
+        for i, (depth, name) in enumerate(modules)
+    }
+
+
+def test_import_budget(pycache: Path) -> None:
+    # The first run fills the bytecode cache
+    _run("import repo_review.__main__", pycache, "-X", "importtime")
+    result = _run("import repo_review.__main__", pycache, "-X", "importtime")
+
+    self_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        self_times[name.strip()] = int(self_us)
+
+    assert _lazy(set(self_times)) == set()
+    imported_by_us = {
+        name
+        for name, importer in _importers(result.stderr).items()
+        if importer.startswith("repo_review")
+    }
+    assert imported_by_us & INDIRECT_MODULES == set()
+    self_times = {k: v for k, v in self_times.items() if k.startswith("repo_review")}
+    assert "repo_review.__main__" in self_times
+    assert sum(self_times.values()) < IMPORT_BUDGET_US, self_times
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--version"],
+        [".", "--format", "json"],
+        [".", "--format", "jsonl", "--select", "PY001"],
+        [".", "--format", "html"],
+        [".", "--summary", "csv"],
+    ],
+)
+def test_lazy_imports(pycache: Path, args: list[str]) -> None:
+    imported = _imported(args, pycache)
+
+    assert "repo_review" in imported
+    lazy = _lazy(imported)
+    if "html" in args:
+        # HTML output renders markdown
+        lazy = {m for m in lazy if m.split(".")[0] != "markdown_it"}
+    assert lazy == set()
+
+
+def test_rich_imported_for_rich(pycache: Path) -> None:
+    imported = _imported(["."], pycache)
+    assert "rich" in imported
+
+
+def test_service_skips_cli(pycache: Path) -> None:
+    code = (
+        "import sys, repo_review.service; print(*sorted(sys.modules), file=sys.stderr)"
+    )
+    result = _run(code, pycache)
+    assert "repo_review.service" in result.stderr.split()
+    assert "repo_review.__main__" not in result.stderr.split()
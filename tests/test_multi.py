@@ -1,14 +1,22 @@
+import asyncio
 import contextlib
+import importlib.util
 import io
 import json
+import sys
 import textwrap
+import time
 import xml.etree.ElementTree as ET
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+import repo_review.__main__
 from repo_review.__main__ import main
+from repo_review.ghpath import GHPath
+from repo_review.processor import Duration, Timing
 
 
 class _InvokeResult:
@@ -85,3 +93,280 @@ def test_multiple_packages_html(multiple_packages: Sequence[str]) -> None:
     assert tree[0][0][0].text == "package_1"
     assert tree[0][0][0].tail == ": (all passed)"
     assert tree[1][0][0].text == "package_2"
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_durations(
+    multiple_packages: Sequence[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    result = _invoke([*multiple_packages, "--format", "json", "--durations", "3"])
+    assert result.exit_code == 0
+    output = json.loads(result.output)
+    assert output["package_1"]["checks"]["PY001"]["duration"]["wall"] >= 0
+    assert any(d["kind"] == "fixture" for d in output["package_2"]["durations"])
+    err = capsys.readouterr().err
+    assert "slowest 3 durations" in err
+    assert len(err.strip().splitlines()) == 4
+
+
+def test_keep_slowest() -> None:
+    timings = [Timing("check", f"C{i % 5}", Duration(i % 5, 0)) for i in range(10)]
+    slowest: list[tuple[float, int, str, Timing]] = []
+    for package in ("a", "b"):
+        repo_review.__main__._keep_slowest(slowest, package, timings, 3)
+    assert len(slowest) == 3
+    assert {t.name for _, _, _, t in slowest} == {"C4"}
+
+    everything: list[tuple[float, int, str, Timing]] = []
+    repo_review.__main__._keep_slowest(everything, "a", timings, 0)
+    assert len(everything) == 10
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_timings_only_if_needed(multiple_packages: Sequence[str]) -> None:
+    package = Path(multiple_packages[0])
+    review = repo_review.__main__._review(package, "", "", "", "", "")
+    assert review.timings == []
+    review = repo_review.__main__._review(package, "", "", "", "", "", timings=True)
+    assert any(t.kind == "check" for t in review.timings)
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_fail_fast(multiple_packages: Sequence[str]) -> None:
+    Path(multiple_packages[0]).joinpath("README.md").unlink()
+    result = _invoke([*multiple_packages, "--format", "json", "--fail-fast"])
+    assert result.exit_code == 3
+    output = json.loads(result.output)
+    assert list(output) == ["package_1"]
+    checks = output["package_1"]["checks"]
+    assert sum(c["result"] is False for c in checks.values()) == 1
+    assert any(c["skip_reason"].startswith("Not run") for c in checks.values())
+
+
+def test_fail_fast_and_max_failures_conflict(
+    multiple_packages: Sequence[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    result = _invoke([*multiple_packages, "--fail-fast", "--max-failures", "2"])
+    assert result.exit_code == 2
+    assert "not allowed with argument" in capsys.readouterr().err
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_costs_from_previous_run(
+    multiple_packages: Sequence[str], tmp_path: Path
+) -> None:
+    result = _invoke([multiple_packages[0], "--format", "json"])
+    costs = tmp_path / "costs.json"
+    costs.write_text(result.output, encoding="utf-8")
+    result = _invoke([*multiple_packages, "--costs", str(costs)])
+    assert result.exit_code == 0
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_json_compact(multiple_packages: Sequence[str]) -> None:
+    pretty = _invoke([*multiple_packages, "--format", "json"])
+    result = _invoke([*multiple_packages, "--format", "json", "--compact"])
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 1
+    compact, expected = json.loads(result.output), json.loads(pretty.output)
+    for output in (compact, expected):
+        for report in output.values():
+            for check in report["checks"].values():
+                del check["duration"]
+    assert compact == expected
+
+
+@pytest.mark.parametrize("fmt", ["rich", "html"])
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_jobs(multiple_packages: Sequence[str], fmt: str) -> None:
+    packages = [*multiple_packages, *reversed(multiple_packages)]
+    serial = _invoke([*packages, "--format", fmt])
+    result = _invoke([*packages, "--format", fmt, "--jobs", "3"])
+    assert result.exit_code == serial.exit_code == 0
+    assert result.output == serial.output
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_jobs_fail_fast(multiple_packages: Sequence[str]) -> None:
+    Path(multiple_packages[0]).joinpath("README.md").unlink()
+    result = _invoke([*multiple_packages, "--format", "json", "-j2", "--fail-fast"])
+    assert result.exit_code == 3
+    output = json.loads(result.output)
+    assert list(output) == ["package_1"]
+    assert output["package_1"]["status"] == "errors"
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 11) or importlib.util.find_spec("httpx") is None,
+    reason="Requires httpx",
+)
+@pytest.mark.usefixtures("local_entry_points")
+def test_remote_packages_pipelined(
+    multiple_packages: Sequence[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[str] = []
+    files = {"pyproject.toml": '[build-system]\nbuild-backend = "somebackend"\n'}
+
+    async def open_url_async(url: str) -> str:
+        if "/git/trees/" in url:
+            repo = url.split("/")[5]
+            # The first repo's tree is slow, so the others are reviewed first
+            await asyncio.sleep(0.2 if repo == "slow" else 0)
+            events.append(f"tree {repo}")
+            return json.dumps({"tree": [{"path": p, "type": "blob"} for p in files]})
+        return files[url.rsplit("/", 1)[-1]]
+
+    def open_url(url: str) -> str:
+        msg = f"Synchronous fetch of {url}"
+        raise AssertionError(msg)
+
+    def review(package: Path | GHPath, **kwargs: Any) -> object:
+        events.append(f"review {package}")
+        return orig_review(package, **kwargs)
+
+    orig_review = repo_review.__main__._review
+    monkeypatch.setattr(GHPath, "open_url_async", staticmethod(open_url_async))
+    monkeypatch.setattr(GHPath, "open_url", staticmethod(open_url))
+    monkeypatch.setattr(repo_review.__main__, "_review", review)
+
+    args = ["gh:org/slow", multiple_packages[0], "gh:org/fast@v1", "--format", "json"]
+    result = _invoke([*args, "--jobs", "2"])
+
+    output = json.loads(result.output)
+    assert list(output) == ["org/slow", "package_1", "org/fast"]
+    assert output["org/fast"]["checks"]["PY001"]["result"] is True
+    assert output["org/fast"]["checks"]["PP002"]["result"] is False
+    assert events.index("review gh:org/fast@v1:.") < events.index("tree slow")
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 11) or importlib.util.find_spec("httpx") is None,
+    reason="Requires httpx",
+)
+def test_pipelined_downloads_while_consumer_busy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fetched: list[str] = []
+
+    async def open_url_async(url: str) -> str:
+        repo = url.split("/")[5]
+        if repo == "missing":
+            request = httpx.Request("GET", url)
+            response = httpx.Response(404, request=request)
+            msg = "Not found"
+            raise httpx.HTTPStatusError(msg, request=request, response=response)
+        await asyncio.sleep(0.1 if repo == "later" else 0)
+        fetched.append(repo)
+        return json.dumps({"tree": [{"path": "README.md", "type": "blob"}]})
+
+    def review(package: GHPath, **kwargs: str) -> repo_review.__main__._Review:  # noqa: ARG001
+        return repo_review.__main__._Review(package, "", {}, [], "empty", [])
+
+    httpx = pytest.importorskip("httpx")
+    monkeypatch.setattr(GHPath, "open_url_async", staticmethod(open_url_async))
+    targets = [
+        repo_review.__main__._Target(Path(f"gh:org/{name}@main"), "", "")
+        for name in ("first", "later", "missing")
+    ]
+
+    reviews = repo_review.__main__._review_pipelined(
+        targets, review, jobs=1, in_flight=2
+    )
+    assert str(next(reviews).package) == "gh:org/first@main:."
+    # The slow tree arrives while the caller is not waiting on the generator
+    time.sleep(0.3)
+    assert fetched == ["first", "later"]
+    assert str(next(reviews).package) == "gh:org/later@main:."
+    with pytest.raises(SystemExit):
+        next(reviews)
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_repos_from_file(multiple_packages: Sequence[str], tmp_path: Path) -> None:
+    package_1, package_2 = multiple_packages
+    Path(package_2).joinpath("sub").mkdir()
+    repos = tmp_path / "repos.txt"
+    repos.write_text(
+        textwrap.dedent(
+            f"""\
+            # A comment
+            {package_1} --select=PY001,PP002
+
+            '{package_2}' --package-dir=sub  # trailing comment
+            """
+        ),
+        encoding="utf-8",
+    )
+
+    result = _invoke([package_2, "--repos-from", str(repos), "--format", "json"])
+
+    output = json.loads(result.output)
+    assert list(output) == ["package_2", "package_1"]
+    assert list(output["package_1"]["checks"]) == ["PY001", "PP002"]
+    assert result.exit_code == 3
+    assert output["package_2"]["status"] == "errors"
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_repos_from_stdin(
+    multiple_packages: Sequence[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(multiple_packages)))
+    result = _invoke(["--repos-from", "-", "--format", "json", "-j2"])
+    assert result.exit_code == 0
+    assert list(json.loads(result.output)) == ["package_1", "package_2"]
+
+
+def test_repos_from_bad_option(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repos = tmp_path / "repos.txt"
+    repos.write_text(". --ignore=PY001\n", encoding="utf-8")
+    result = _invoke(["--repos-from", str(repos)])
+    assert result.exit_code == 1
+    assert "repos.txt:1: expected --package-dir=DIR" in capsys.readouterr().err
+
+
+def test_review_threaded_reads_ahead_lazily() -> None:
+    read: list[int] = []
+
+    def targets() -> Iterator[repo_review.__main__._Target]:
+        for i in range(100):
+            read.append(i)
+            yield repo_review.__main__._Target(Path(str(i)), "", "")
+
+    def review(package: Path, **kwargs: str) -> repo_review.__main__._Review:  # noqa: ARG001
+        return repo_review.__main__._Review(package, "", {}, [], "empty", [])
+
+    reviews = repo_review.__main__._review_threaded(
+        targets(), review, jobs=2, in_flight=4
+    )
+    assert next(reviews).package == Path("0")
+    assert len(read) == 5
+    reviews.close()
+    assert len(read) == 5
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_multiple_packages_jsonl(
+    multiple_packages: Sequence[str], tmp_path: Path
+) -> None:
+    result = _invoke([*multiple_packages, "--format", "jsonl", "--durations", "0"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 2
+    records = [json.loads(line) for line in lines]
+    assert [r["package"] for r in records] == ["package_1", "package_2"]
+    assert all(r["status"] == "passed" for r in records)
+    assert list(records[0])[:2] == ["package", "status"]
+
+    costs = tmp_path / "costs.jsonl"
+    costs.write_text(result.output, encoding="utf-8")
+    assert set(repo_review.__main__._load_costs(costs)) >= {"PY001", "PP002"}
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_single_package_jsonl(multiple_packages: Sequence[str]) -> None:
+    result = _invoke([multiple_packages[0], "--format", "jsonl"])
+    (line,) = result.output.splitlines()
+    assert json.loads(line)["package"] == "package_1"
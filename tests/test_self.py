@@ -1,3 +1,4 @@
+import pickle
 from pathlib import Path
 
 import pytest
@@ -80,3 +81,38 @@ def test_empty_pyproject() -> None:
     assert sum(1 for result in results if result.skip_reason) == 3
     assert sum(1 for result in results if result.skip_reason == "One skip") == 1
     assert sum(1 for result in results if result.skip_reason == "Group skip") == 2
+
+
+def test_execution_plan_reuse(tmp_path: Path) -> None:
+    collected = repo_review.processor.collect_all(Path())
+    plan = repo_review.processor.ExecutionPlan.compile(
+        collected, extend_ignore={"X", "PP303"}
+    )
+    assert plan.names == tuple(collected.checks)
+    assert plan.names.index("PY001") in plan.order
+    py001 = 1 << plan.index["PY001"]
+    assert plan.requires[plan.index["PP002"]] == py001
+
+    _, expected = repo_review.processor.process(Path(), extend_ignore={"X", "PP303"})
+    _, results = repo_review.processor.process(Path(), plan=plan)
+    assert results == expected
+
+    # The same plan works for another repo, and survives pickling
+    plan = pickle.loads(pickle.dumps(plan))
+    _, results = repo_review.processor.process(tmp_path, plan=plan)
+    assert [r.name for r in results] == [r.name for r in expected]
+    assert {r.name for r in results if r.result is False} == {
+        "PY001",
+        "PY002",
+        "PY004",
+        "PY005",
+        "PY006",
+    }
+
+
+def test_execution_plan_rejects_selection() -> None:
+    plan = repo_review.processor.ExecutionPlan.compile(
+        repo_review.processor.collect_all(Path())
+    )
+    with pytest.raises(ValueError, match="part of the plan"):
+        repo_review.processor.process(Path(), plan=plan, select={"PY"})
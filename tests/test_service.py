@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import repo_review.service
+from repo_review.ghpath import GHPath
+from repo_review.processor import as_simple_dict, process
+from repo_review.service import ReviewJob, ReviewService
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+DIR = Path(__file__).parent.resolve()
+
+
+async def http(
+    port: int,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    content_type: str = "application/json",
+) -> tuple[int, dict[str, str], Any]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode() + body)
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    head_bytes, _, data = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head_bytes.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), headers, json.loads(data)
+
+
+def run_service(
+    test: Callable[[ReviewService, int], Awaitable[None]], **kwargs: Any
+) -> None:
+    async def run() -> None:
+        async with ReviewService(**kwargs) as service:
+            server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+            async with server:
+                await test(service, server.sockets[0].getsockname()[1])
+
+    asyncio.run(run())
+
+
+def without_durations(report: dict[str, Any]) -> dict[str, Any]:
+    for check in report["checks"].values():
+        del check["duration"]
+    return report
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_review_remote(monkeypatch: pytest.MonkeyPatch) -> None:
+    files = {"pyproject.toml": '[build-system]\nbuild-backend = "somebackend"\n'}
+
+    def open_url(url: str) -> str:
+        if "/git/trees/" in url:
+            return json.dumps({"tree": [{"path": p, "type": "blob"} for p in files]})
+        return files[url.rsplit("/", 1)[-1]]
+
+    monkeypatch.setattr(GHPath, "open_url", staticmethod(open_url))
+
+    async def test(service: ReviewService, port: int) -> None:
+        request = {"target": "gh:org/repo@v1", "select": "PY001,PP002"}
+        status, _, report = await http(
+            port, "POST", "/review", json.dumps(request).encode()
+        )
+        assert status == 200
+        assert report["package"] == "gh:org/repo@v1"
+        assert report["status"] == "errors"
+        assert report["checks"]["PY001"]["result"] is True
+        assert report["checks"]["PP002"]["result"] is False
+        assert list(report["checks"]) == ["PY001", "PP002"]
+
+        metrics = service.metrics()
+        assert metrics["completed"] == 1
+        assert metrics["latency"]["count"] == 1
+
+    run_service(test)
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_review_archive() -> None:
+    package = DIR / "test_utilities"
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for path in package.rglob("*"):
+            if path.is_file() and "__pycache__" not in path.parts:
+                zf.write(path, f"repo-main/{path.relative_to(package)}")
+
+    _, results = process(package)
+    expected = json.loads(json.dumps(as_simple_dict(results)))
+
+    async def test(_service: ReviewService, port: int) -> None:
+        status, _, report = await http(
+            port, "POST", "/review?name=upload", buf.getvalue(), "application/zip"
+        )
+        assert status == 200
+        assert report["package"] == "upload"
+        assert (
+            without_durations(report)["checks"]
+            == without_durations({"checks": expected})["checks"]
+        )
+
+        status, _, report = await http(
+            port, "POST", "/review", b"not a zip", "application/zip"
+        )
+        assert status == 400
+        assert "zip" in report["error"]
+
+    run_service(test)
+
+
+def test_backpressure_and_dedupe(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    started: list[ReviewJob] = []
+
+    def run_job(job: ReviewJob) -> tuple[int, bytes]:
+        started.append(job)
+        release.wait()
+        return 200, json.dumps({"package": job.target}).encode()
+
+    monkeypatch.setattr(repo_review.service, "_run_job", run_job)
+
+    async def test(service: ReviewService, port: int) -> None:
+        async def post(target: str) -> tuple[int, dict[str, str], Any]:
+            body = json.dumps({"target": target}).encode()
+            return await http(port, "POST", "/review", body)
+
+        async def wait_for(key: str, value: int) -> None:
+            for _ in range(500):
+                if service.metrics()[key] >= value:
+                    return
+                await asyncio.sleep(0.01)
+
+        first = asyncio.create_task(post("gh:org/a"))
+        await wait_for("running", 1)
+        same = asyncio.create_task(post("gh:org/a"))
+        queued = asyncio.create_task(post("gh:org/b"))
+        await wait_for("queue_depth", 1)
+        await wait_for("deduplicated", 1)
+
+        status, headers, _ = await post("gh:org/c")
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+
+        metrics = service.metrics()
+        assert metrics["queue_depth"] == 1
+        assert metrics["running"] == 1
+        assert metrics["deduplicated"] == 1
+        assert metrics["rejected"] == 1
+
+        release.set()
+        results = await asyncio.gather(first, same, queued)
+        assert [(s, r["package"]) for s, _, r in results] == [
+            (200, "gh:org/a"),
+            (200, "gh:org/a"),
+            (200, "gh:org/b"),
+        ]
+        assert [job.target for job in started] == ["gh:org/a", "gh:org/b"]
+
+        status, _, metrics = await http(port, "GET", "/metrics")
+        assert status == 200
+        assert metrics["completed"] == 2
+        assert metrics["queue_depth"] == 0
+        assert metrics["latency"]["count"] == 2
+        assert metrics["latency"]["max"] >= metrics["latency"]["p50"] > 0
+
+    run_service(test, workers=1, queue_size=1)
+
+
+def test_worker_error() -> None:
+    async def test(service: ReviewService, port: int) -> None:
+        assert service._executor is not None
+        service._executor.shutdown()
+        body = json.dumps({"target": "gh:org/a"}).encode()
+        status, _, response = await asyncio.wait_for(
+            http(port, "POST", "/review", body), 10
+        )
+        assert status == 500
+        assert "after shutdown" in response["error"]
+        assert service.metrics()["failed"] == 1
+        assert not service._pending
+
+    run_service(test, workers=1)
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "status"),
+    [
+        ("GET", "/nope", b"", 404),
+        ("GET", "/review", b"", 405),
+        ("POST", "/metrics", b"", 405),
+        ("POST", "/review", b"{", 400),
+        ("POST", "/review", b'{"target": "/etc"}', 400),
+        ("POST", "/review", b'{"target": "gh:o/r", "select": 1}', 400),
+        ("POST", "/review", b"x" * 101, 413),
+    ],
+)
+def test_bad_requests(method: str, path: str, body: bytes, status: int) -> None:
+    async def test(_service: ReviewService, port: int) -> None:
+        code, _, report = await http(port, method, path, body)
+        assert code == status
+        assert report["error"]
+
+    run_service(test, max_upload=100)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import io
+import sqlite3
+
+import pytest
+
+from repo_review.__main__ import main
+from repo_review.families import Family
+from repo_review.processor import Result
+from repo_review.store import PassRate, Regression, ResultStore
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _results(**outcomes: bool | None) -> list[Result]:
+    return [
+        Result(
+            family="general",
+            name=name,
+            description=f"Check {name}",
+            result=result,
+            err_msg="" if result is not False else f"{name} failed",
+        )
+        for name, result in outcomes.items()
+    ]
+
+
+def test_store_queries(tmp_path: Path) -> None:
+    families = {"general": Family(name="General")}
+    with ResultStore(tmp_path / "results.db", batch_size=2) as store:
+        store.add("a", families, _results(X1=True, X2=True), status="passed")
+        # Not written until the batch is full
+        assert store.connection.execute("SELECT count(*) FROM runs").fetchone() == (0,)
+        store.add("b", families, _results(X1=False, X2=None), status="errors")
+        assert store.connection.execute("SELECT count(*) FROM runs").fetchone() == (2,)
+
+        store.add(
+            "a",
+            families,
+            _results(X1=False, X2=True),
+            status="errors",
+            ref="main",
+            commit="abc",
+        )
+
+        assert store.pass_rates() == [
+            PassRate("X1", "general", passed=0, failed=2, skipped=0),
+            PassRate("X2", "general", passed=1, failed=0, skipped=1),
+        ]
+        assert [r.rate for r in store.pass_rates()] == [0.0, 1.0]
+        assert store.regressions() == [
+            Regression("a", "X1", "main", "abc", "X1 failed", run=3, previous=1)
+        ]
+        assert store.regressions("b") == []
+
+    # Reopening keeps the history and the check ids
+    with ResultStore(tmp_path / "results.db") as store:
+        store.add("a", families, _results(X1=True, X2=False), status="errors")
+        assert [(r.repo, r.name, r.previous) for r in store.regressions()] == [
+            ("a", "X2", 3)
+        ]
+        assert store.connection.execute("SELECT count(*) FROM checks").fetchone() == (
+            2,
+        )
+
+
+def test_store_newer_schema(tmp_path: Path) -> None:
+    db = tmp_path / "results.db"
+    with contextlib.closing(sqlite3.connect(db)) as conn:
+        conn.execute("PRAGMA user_version = 99")
+    with pytest.raises(RuntimeError, match="schema version 99"):
+        ResultStore(db)
+
+
+def test_store_rollback(tmp_path: Path) -> None:
+    families = {"general": Family(name="General")}
+    with ResultStore(tmp_path / "results.db") as store:
+        # Not a type sqlite can store, so the transaction fails
+        bad = dataclasses.replace(_results(X1=True)[0], err_msg=object())  # type: ignore[arg-type]
+        store.add("a", families, [bad], status="passed")
+        with pytest.raises(sqlite3.Error):
+            store.flush()
+        assert store.connection.execute("SELECT count(*) FROM checks").fetchone() == (
+            0,
+        )
+
+        # The check inserted in the failed transaction is added again
+        store._pending.clear()
+        store.add("a", families, _results(X1=True), status="passed")
+        store.flush()
+        assert store.pass_rates() == [
+            PassRate("X1", "general", passed=1, failed=0, skipped=0)
+        ]
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_store_cli(tmp_path: Path) -> None:
+    package = tmp_path / "package"
+    package.mkdir()
+    pyproject = package / "pyproject.toml"
+    pyproject.write_text(
+        '[build-system]\nrequires = []\nbuild-backend = "backend"\n',
+        encoding="utf-8",
+    )
+    db = tmp_path / "results.db"
+
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):
+            main(
+                [str(package), "--store", str(db), "--show", "err", "--format", "json"]
+            )
+
+    run()
+    pyproject.write_text("[build-system]\n", encoding="utf-8")
+    run()
+
+    with ResultStore(db) as store:
+        # --show only changes the printed output
+        rates = {r.name: r for r in store.pass_rates()}
+        assert rates["PY001"] == PassRate("PY001", "general", 1, 0, 0)
+        assert rates["PP002"] == PassRate("PP002", "pyproject", 0, 1, 0)
+        regressions = store.regressions()
+        assert "PP002" in {r.name for r in regressions}
+        assert {r.repo for r in regressions} == {str(package.resolve())}
+        runs = store.connection.execute(
+            'SELECT status, ref, "commit" FROM runs ORDER BY id'
+        ).fetchall()
+        assert runs == [("errors", None, None)] * 2
+        (timings,) = store.connection.execute(
+            "SELECT count(*) FROM timings WHERE kind = 'check'"
+        ).fetchone()
+        assert timings > 0
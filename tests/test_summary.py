@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import contextlib
+import csv
+import io
+
+import pytest
+
+from repo_review.__main__ import main
+from repo_review.families import Family
+from repo_review.processor import Result
+from repo_review.summary import FamilyRate, FleetSummary, PassRate, SummaryWriter
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FAMILIES = {"general": Family(name="General"), "pyproject": Family(name="PyProject")}
+
+
+def _results(**outcomes: bool | None) -> list[Result]:
+    return [
+        Result(
+            family="pyproject" if name.startswith("PP") else "general",
+            name=name,
+            description=f"Check {name}",
+            result=result,
+        )
+        for name, result in outcomes.items()
+    ]
+
+
+def test_fleet_summary() -> None:
+    summary = FleetSummary()
+    summary.add(FAMILIES, _results(PY001=True, PP002=True), "passed")
+    summary.add(FAMILIES, _results(PY001=True, PP002=False), "errors")
+    summary.add(FAMILIES, _results(PY001=False, PP002=None, PP003=True), "errors")
+
+    assert summary.repos == 3
+    assert summary.statuses == {"passed": 1, "errors": 2}
+    assert summary.pass_rates() == [
+        PassRate("PY001", "general", passed=2, failed=1, skipped=0),
+        PassRate("PP002", "pyproject", passed=1, failed=1, skipped=1),
+        PassRate("PP003", "pyproject", passed=1, failed=0, skipped=0),
+    ]
+    assert summary.family_rates() == [
+        FamilyRate("general", "General", 2, 1, 0, clean=2, repos=3),
+        FamilyRate("pyproject", "PyProject", 2, 1, 1, clean=2, repos=3),
+    ]
+    assert summary.family_rates()[1].rate == pytest.approx(2 / 3)
+
+
+def test_summary_csv() -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, "csv") as writer:
+        writer.write_repo("a", FAMILIES, _results(PY001=True, PP002=True), "passed")
+        # Rows are written as soon as each repo is added
+        assert out.getvalue().splitlines()[-1] == "a,passed,pass,pass"
+        writer.write_repo(
+            "b", FAMILIES, _results(PY001=False, PP002=None, PP003=True), "errors"
+        )
+        writer.write_repo("c", FAMILIES, _results(PP002=False), "errors")
+
+    assert list(csv.reader(io.StringIO(out.getvalue()))) == [
+        ["repo", "status", "PY001", "PP002"],
+        ["a", "passed", "pass", "pass"],
+        ["b", "errors", "fail", "skip"],
+        ["c", "errors", "", "fail"],
+        ["pass rate", "", "0.500", "0.500"],
+    ]
+    # Checks without a column are still counted
+    assert writer.summary.pass_rates()[-1].name == "PP003"
+
+
+class PY001:
+    "Check PY001"
+
+    family = "general"
+
+
+class PP002:
+    "Check PP002"
+
+    family = "pyproject"
+
+
+CHECKS = {"PY001": PY001(), "PP002": PP002()}
+
+
+def test_summary_columns_from_checks() -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, "csv", checks=CHECKS) as writer:  # type: ignore[arg-type]
+        writer.write_repo("a", FAMILIES, [], "empty")
+        writer.write_repo("b", FAMILIES, _results(PP002=False), "errors")
+        writer.write_repo("c", FAMILIES, _results(PY001=True, PP003=True), "passed")
+
+    assert list(csv.reader(io.StringIO(out.getvalue()))) == [
+        ["repo", "status", "PY001", "PP002"],
+        ["a", "empty", "", ""],
+        ["b", "errors", "", "fail"],
+        ["c", "passed", "pass", ""],
+        ["pass rate", "", "1.000", "0.000"],
+    ]
+
+
+def test_summary_first_repo_empty() -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, "csv") as writer:
+        writer.write_repo("a", FAMILIES, [], "empty")
+        # Held back until a repo says what the columns are
+        assert out.getvalue() == ""
+        writer.write_repo("b", FAMILIES, _results(PY001=True), "passed")
+
+    assert out.getvalue().splitlines() == [
+        "repo,status,PY001",
+        "a,empty,",
+        "b,passed,pass",
+        "pass rate,,1.000",
+    ]
+
+
+@pytest.mark.parametrize("repos", [0, 1])
+def test_summary_html_closed(repos: int) -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, "html") as writer:
+        for _ in range(repos):
+            writer.write_repo("a", FAMILIES, [], "empty")
+    text = out.getvalue()
+
+    assert text.count("<table>") == text.count("</table>") == 2
+    assert text.count("<tbody>") == text.count("</tbody>") == 1
+    assert ("<tr><th>a</th></tr>" in text) == bool(repos)
+
+
+def test_summary_html_escapes_names() -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, "html") as writer:
+        writer.write_repo("a", FAMILIES, _results(**{"PY<1>": True}), "passed")
+    assert ">PY&lt;1&gt;</th>" in out.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["rich", "html"])
+def test_summary_formats(fmt: str) -> None:
+    out = io.StringIO()
+    with SummaryWriter(out, fmt, color=False) as writer:  # type: ignore[arg-type]
+        writer.write_repo("a<b", FAMILIES, _results(PY001=True, PP002=True), "passed")
+        writer.write_repo("c", FAMILIES, _results(PY001=False, PP002=None), "errors")
+    text = out.getvalue()
+
+    if fmt == "rich":
+        assert "General: PY001" in text
+        assert "✓ ✓  a<b" in text
+        assert "✗ -  c" in text
+        assert "2 repos: 1 passed, 1 errors" in text
+    else:
+        assert "<th>a&lt;b</th>" in text
+        assert '<th colspan="1">PyProject</th>' in text
+        assert "<tr><th>Pass rate</th><td>50%</td><td>100%</td></tr>" in text
+        assert "<td>PyProject</td><td>100%</td>" in text
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_summary_cli(tmp_path: Path) -> None:
+    for name, backend in [("a", '\nbuild-backend = "backend"'), ("b", "")]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(
+            f"[build-system]\nrequires = []{backend}\n", encoding="utf-8"
+        )
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), pytest.raises(SystemExit) as e:
+        main(
+            [
+                str(tmp_path / "a"),
+                str(tmp_path / "b"),
+                "--summary",
+                "csv",
+                "--select",
+                "PY001,PP002",
+                # Only applies to the normal reports
+                "--show",
+                "err",
+            ]
+        )
+    assert e.value.code == 3
+    assert output.getvalue().splitlines() == [
+        "repo,status,PY001,PP002",
+        "a,passed,pass,pass",
+        "b,errors,pass,fail",
+        "pass rate,,1.000,0.500",
+    ]
+
+
+@pytest.mark.usefixtures("local_entry_points")
+def test_summary_cli_narrow_first_repo(tmp_path: Path) -> None:
+    config = '\n[tool.repo-review]\nignore = ["PP002"]\n'
+    for name, extra in [("a", config), ("b", "")]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(
+            f'[build-system]\nrequires = []\nbuild-backend = "backend"\n{extra}',
+            encoding="utf-8",
+        )
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        main(
+            [
+                str(tmp_path / "a"),
+                str(tmp_path / "b"),
+                "--summary",
+                "csv",
+                "--select",
+                "PY001,PP002",
+            ]
+        )
+    assert output.getvalue().splitlines() == [
+        "repo,status,PY001,PP002",
+        "a,passed,pass,",
+        "b,passed,pass,pass",
+        "pass rate,,1.000,1.000",
+    ]
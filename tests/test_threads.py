@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import repo_review.processor
+from repo_review.ghpath import GHPath
+
+THREADS = 8
+
+
+@pytest.fixture(autouse=True)
+def patch_entry_points(local_entry_points: object) -> None:
+    pass
+
+
+def test_concurrent_process() -> None:
+    expected = [
+        repo_review.processor.process(Path(), subdir=subdir)
+        for subdir in ("", "tests", "tests/test_utilities")
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+        futures = [
+            pool.submit(
+                repo_review.processor.process,
+                Path(),
+                subdir=subdir,
+                fixture_workers=2,
+            )
+            for _ in range(THREADS)
+            for subdir in ("", "tests", "tests/test_utilities")
+        ]
+        results = [f.result() for f in futures]
+
+    assert results == expected * THREADS
+
+
+def test_concurrent_md_as_html() -> None:
+    texts = [f"Check `PY{i:03}` in **{i}**" for i in range(200)]
+    expected = [
+        f"Check <code>PY{i:03}</code> in <strong>{i}</strong>" for i in range(200)
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+        for _ in range(THREADS):
+            assert list(pool.map(repo_review.processor.md_as_html, texts)) == expected
+
+
+def test_concurrent_ghpath_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def open_url(url: str) -> str:
+        with lock:
+            calls.append(url)
+        time.sleep(0.01)
+        return f"[project]\nname = {url.rsplit('/', 1)[-1]!r}\n"
+
+    monkeypatch.setattr(GHPath, "open_url", staticmethod(open_url))
+    root = GHPath(
+        repo="org/repo",
+        branch="main",
+        _info=[
+            {"path": "a.toml", "type": "blob"},
+            {"path": "b.toml", "type": "blob"},
+        ],
+    )
+
+    def read(name: str) -> str:
+        return root.joinpath(name).read_text()
+
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(read, ["a.toml", "b.toml"] * THREADS))
+
+    assert (
+        results
+        == ["[project]\nname = 'a.toml'\n", "[project]\nname = 'b.toml'\n"] * THREADS
+    )
+    assert sorted(calls) == [
+        "https://raw.githubusercontent.com/org/repo/main/a.toml",
+        "https://raw.githubusercontent.com/org/repo/main/b.toml",
+    ]